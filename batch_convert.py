@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+
+from model.batch import (ArchiveSink, BatchPipeline, CheckpointManifest, JsonlConverter, PoseDedupCache, build_jobs,
+                         select_shard, shard_manifest_path, shard_of)
+from model.file_handler import ModelError
+from model.jsonl_reader import JSONL_SUFFIXES, is_jsonl_file
+
+
+def shard(value):
+    """
+    Parses a shard given as "INDEX/COUNT", e.g. "0/4" for the first of four shards.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 0 and {count - 1}, got '{value}'")
+    return index, count
+
+
+def jsonl_output_pattern(input_path, output_dir, output_extension):
+    """
+    Returns the output pattern for the frames of a JSON Lines file, e.g. "svgs/capture_{:06d}.svg".
+    """
+    name = os.path.basename(input_path)
+    stem = next(name[:-len(suffix)] for suffix in JSONL_SUFFIXES if name.lower().endswith(suffix))
+    return os.path.join(output_dir, stem.replace("{", "{{").replace("}", "}}") + "_{:06d}" + output_extension)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Convert many OpenPose JSON files to SVG.")
+    parser.add_argument("inputs", nargs="+",
+                        help="OpenPose JSON files (optionally .gz, .bz2 or .xz compressed) or directories containing them. "
+                             ".jsonl files with one frame per line are streamed, every line becomes its own SVG file")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--output-dir", help="Directory the SVG files are written to")
+    output.add_argument("--archive", help="Zip or tar archive (.zip, .tar, .tar.gz, .tar.bz2, .tar.xz) the SVG files are written to")
+    parser.add_argument("--compress", action="store_true", help="Deflate the members of a zip archive")
+    parser.add_argument("--svgz", action="store_true", help="Write gzip compressed .svgz files to the output directory")
+    parser.add_argument("--readers", type=int, default=2, help="Number of reader threads")
+    parser.add_argument("--renderers", type=int, default=None, help="Number of render processes (default: CPU count)")
+    parser.add_argument("--render-threads", action="store_true",
+                        help="Render on threads instead of processes; fastest on free-threaded Python builds")
+    parser.add_argument("--writers", type=int, default=2, help="Number of writer threads")
+    parser.add_argument("--chunk-lines", type=int, default=256, help="Lines of a .jsonl input handed to a render process at once")
+    parser.add_argument("--queue-size", type=int, default=8, help="Capacity of the queues between stages")
+    parser.add_argument("--dedup-tolerance", type=float, default=None,
+                        help="Reuse the output of earlier frames whose keypoints match within this tolerance, in canvas pixels")
+    parser.add_argument("--dedup-mode", choices=["link", "reference"], default="link",
+                        help="How a reused output is recorded outside archives: hard link or result reference only")
+    crop = parser.add_mutually_exclusive_group()
+    crop.add_argument("--roi", type=float, nargs=4, metavar=("X", "Y", "WIDTH", "HEIGHT"),
+                      help="Only render people inside this canvas region and crop the output to it")
+    crop.add_argument("--tight-crop", action="store_true", help="Crop every output to the people it contains")
+    parser.add_argument("--min-mean-score", type=float, default=None,
+                        help="Skip people whose visible body joints have a lower mean confidence")
+    parser.add_argument("--min-valid-joints", type=int, default=None, help="Skip people with fewer visible body joints")
+    parser.add_argument("--top-k", type=int, default=None, help="Render at most this many people per frame, the most confident first")
+    parser.add_argument("--shard", type=shard, default=None, metavar="INDEX/COUNT",
+                        help="Only convert the inputs of one shard, e.g. 0/4 to 3/4 on four machines")
+    parser.add_argument("--manifest", default=None,
+                        help="Append-only checkpoint file; inputs it records as converted are skipped when the batch "
+                             "is run again. With --shard, every shard uses its own file next to this path")
+    args = parser.parse_args(argv)
+    if args.svgz and args.archive:
+        parser.error("--svgz cannot be combined with --archive, use a compressed archive instead")
+    if args.archive and any(is_jsonl_file(input_path) for input_path in args.inputs):
+        parser.error(".jsonl inputs cannot be combined with --archive, use --output-dir")
+    if args.manifest and args.archive:
+        parser.error("--manifest cannot be combined with --archive, the archive is rewritten by every run")
+    return args
+
+
+def close_outputs(sink, manifest):
+    """
+    Closes the archive sink and the checkpoint manifest, if any, and returns the
+    error that closing raised or None. Both are closed even if the first one fails.
+    """
+    error = None
+    for output in (sink, manifest):
+        if output is None:
+            continue
+        try:
+            output.close()
+        except (ModelError, OSError) as e:
+            error = error or e
+    return error
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jsonl_inputs = [input_path for input_path in args.inputs if is_jsonl_file(input_path)]
+    inputs = [input_path for input_path in args.inputs if not is_jsonl_file(input_path)]
+    output_extension = ".svgz" if args.svgz else ".svg"
+    sink = None
+    try:
+        # In an archive, output paths become member names relative to its root
+        jobs = build_jobs(inputs, "" if args.archive else args.output_dir, output_extension)
+    except ValueError as e:
+        print(f"[Batch] {e}", file=sys.stderr)
+        return 2
+    if args.archive:
+        sink = ArchiveSink(args.archive, compress=args.compress, queue_size=args.queue_size)
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.shard:
+        jobs = select_shard(jobs, *args.shard)
+        jsonl_inputs = [input_path for input_path in jsonl_inputs if shard_of(input_path, args.shard[1]) == args.shard[0]]
+
+    render_options = {}
+    if args.roi:
+        render_options["roi"] = tuple(args.roi)
+    if args.tight_crop:
+        render_options["tight_crop"] = True
+    for option in ("min_mean_score", "min_valid_joints", "top_k"):
+        if getattr(args, option) is not None:
+            render_options[option] = getattr(args, option)
+
+    dedup_cache = None
+    if args.dedup_tolerance is not None:
+        # The render options change the output, so they are part of the cache key
+        dedup_cache = PoseDedupCache(tolerance=args.dedup_tolerance, style=tuple(sorted(render_options.items())))
+
+    failed = False
+    if jsonl_inputs:
+        converter = JsonlConverter(workers=args.renderers, chunk_lines=args.chunk_lines, render_options=render_options)
+        for input_path in jsonl_inputs:
+            try:
+                jsonl_report = converter.convert(input_path, jsonl_output_pattern(input_path, args.output_dir, output_extension))
+            except (ModelError, OSError) as e:
+                print(f"[Batch] {input_path}: {e}", file=sys.stderr)
+                failed = True
+                continue
+            for line_number, error in jsonl_report.errors:
+                print(f"[Batch] {input_path}:{line_number}: {error}", file=sys.stderr)
+            print(jsonl_report.summary())
+            failed = failed or bool(jsonl_report.errors)
+        if not inputs:
+            return 1 if failed else 0
+
+    manifest = None
+    if args.manifest:
+        manifest_path = shard_manifest_path(args.manifest, *args.shard) if args.shard else args.manifest
+        manifest = CheckpointManifest(manifest_path)
+
+    pipeline = BatchPipeline(
+        readers=args.readers,
+        renderers=args.renderers,
+        writers=args.writers,
+        queue_size=args.queue_size,
+        sink=sink,
+        dedup_cache=dedup_cache,
+        dedup_mode=args.dedup_mode,
+        render_options=render_options,
+        render_pool="thread" if args.render_threads else "process",
+        manifest=manifest,
+    )
+    try:
+        report = pipeline.run(jobs)
+    finally:
+        close_error = close_outputs(sink, manifest)
+
+    for result in report.errors:
+        print(f"[Batch] {result.input_path}: {result.error}", file=sys.stderr)
+    print(report.summary())
+    if close_error is not None:
+        print(f"[Batch] {close_error}", file=sys.stderr)
+    return 1 if report.errors or failed or close_error is not None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
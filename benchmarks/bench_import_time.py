@@ -0,0 +1,84 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# (name, code) of the start-up paths to time, each in a fresh interpreter
+TARGETS = [
+    ("import model", "import model"),
+    ("render_pose", "from model import render_pose; render_pose([{'people': [{'pose_keypoints_2d': [10, 10, 1, 20, 20, 1]}]}])"),
+    ("import viewmodel", "import viewmodel"),
+    ("MainViewModel", "from viewmodel import get_main_viewmodel; get_main_viewmodel()"),
+    ("window shown", "from view import get_main_window; window = get_main_window(); window.show(); window.app.processEvents()"),
+]
+
+# Runs the code of a target and reports its duration and which heavy packages it loaded
+PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - started
+print(elapsed, 'PyQt6' in sys.modules, 'numpy' in sys.modules)
+"""
+
+
+def run_target(code, env):
+    """
+    Returns (seconds, loaded PyQt6, loaded NumPy) of one run in a fresh interpreter.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=PROJECT_ROOT, code=code)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    # The window logs to the standard output; the probe's result is the last line
+    seconds, qt, numpy = output[-3:]
+    return float(seconds), qt == "True", numpy == "True"
+
+
+def slowest_imports(code, env, count):
+    """
+    Returns the count slowest modules (cumulative microseconds, name) of a target, from -X importtime.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(root=PROJECT_ROOT, code=code)],
+        env=env, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules.append((int(cumulative), name.rstrip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measures the cold-start import time of the model, viewmodel and GUI.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target; the median is reported")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="Also list the N slowest imports of every target")
+    parser.add_argument("--platform", default="offscreen",
+                        help="QT_QPA_PLATFORM for the window target, 'offscreen' runs without a display")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, QT_QPA_PLATFORM=args.platform)
+    # The first run of a target also compiles the bytecode; it is not counted
+    print(f"Python {sys.version.split()[0]}, median of {args.repeat} runs")
+    print(f"{'target':<18} {'median':>9} {'min':>9}  loads")
+    for name, code in TARGETS:
+        run_target(code, env)
+        runs = [run_target(code, env) for _ in range(args.repeat)]
+        seconds = [run[0] for run in runs]
+        loads = [package for package, loaded in zip(("PyQt6", "NumPy"), runs[-1][1:]) if loaded]
+        print(f"{name:<18} {statistics.median(seconds) * 1000:>7.1f}ms {min(seconds) * 1000:>7.1f}ms  {', '.join(loads) or '-'}")
+        if args.profile:
+            for cumulative, module in slowest_imports(code, env, args.profile):
+                print(f"    {cumulative / 1000:>7.1f}ms {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.json_backends import available_json_backends
+from model.json_parser import PoseJsonParser
+
+KEYPOINT_COUNTS = {
+    'pose_keypoints_2d': 18,
+    'face_keypoints_2d': 70,
+    'hand_left_keypoints_2d': 21,
+    'hand_right_keypoints_2d': 21,
+}
+
+
+def make_pose_json(people, seed=0):
+    """
+    Builds an OpenPose JSON document with the given number of fully detected people.
+    """
+    rng = random.Random(seed)
+    persons = []
+    for _ in range(people):
+        person = {}
+        for key, count in KEYPOINT_COUNTS.items():
+            values = []
+            for _ in range(count):
+                values.extend([rng.uniform(0, 1920), rng.uniform(0, 1080), rng.random()])
+            person[key] = values
+        persons.append(person)
+    return json.dumps([{'canvas_width': 1920, 'canvas_height': 1080, 'people': persons}])
+
+
+def best_of(repeats, function):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the JSON decode backends on large pose files.")
+    parser.add_argument("--people", type=int, nargs="+", default=[10, 100, 1000], help="People per document")
+    parser.add_argument("--repeats", type=int, default=5, help="Repetitions, the best one is reported")
+    args = parser.parse_args(argv)
+
+    backends = available_json_backends()
+    print(f"Backends: {', '.join(backend.name for backend in backends)}")
+    print(f"{'people':>7} {'size':>9} {'backend':>8} {'decode':>10} {'decode+preview':>15} {'typed decode':>13}")
+    for people in args.people:
+        json_string = make_pose_json(people)
+        size_mb = len(json_string) / (1024 * 1024)
+        for backend in backends:
+            plain = PoseJsonParser(backend)
+            typed = PoseJsonParser(backend, typed_keypoints=True)
+            decode = best_of(args.repeats, lambda: plain.parse_pose_data(json_string))
+            preview = best_of(args.repeats, lambda: plain.parse_pose_json(json_string))
+            typed_decode = best_of(args.repeats, lambda: typed.parse_pose_data(json_string))
+            print(f"{people:>7} {size_mb:>7.2f}MB {backend.name:>8} "
+                  f"{decode * 1000:>8.1f}ms {preview * 1000:>13.1f}ms {typed_decode * 1000:>11.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import SharedSequenceRenderer
+from model.file_handler import FileHandler
+from model.pose_array_loader import PoseSequence
+from model.svg_renderer import render_pose_bytes
+
+
+def make_sequence(frames, people, seed=0):
+    """
+    Builds a random walk sequence of fully detected people with body, face and hands.
+    """
+    rng = np.random.default_rng(seed)
+    joints = 18 + 70 + 21 + 21
+    start = rng.uniform(100, 900, (1, people, joints, 2))
+    steps = rng.normal(0, 2, (frames, people, joints, 2)).cumsum(axis=0)
+    keypoints = np.empty((frames, people, joints, 3))
+    keypoints[..., :2] = start + steps
+    keypoints[..., 2] = rng.uniform(0.3, 1.0, (frames, people, joints))
+    return PoseSequence(keypoints, canvas_width=1920, canvas_height=1080)
+
+
+def _render_pickled_frame(pose_json_data, output_path):
+    # Baseline: every frame travels to the worker as nested lists
+    FileHandler().save_bytes_file(output_path, render_pose_bytes(pose_json_data))
+
+
+def render_pickled(sequence, output_pattern, processes):
+    """
+    The straightforward way: one task per frame carrying the frame's OpenPose JSON structure.
+    """
+    with ProcessPoolExecutor(processes) as executor:
+        futures = []
+        for index in range(len(sequence)):
+            frame = sequence.frame(index)
+            pose_json_data = [{
+                'canvas_width': frame['canvas_width'],
+                'canvas_height': frame['canvas_height'],
+                'people': [{name: keypoints.ravel().tolist() for name, keypoints in person.items()}
+                           for person in frame['people']],
+            }]
+            futures.append(executor.submit(_render_pickled_frame, pose_json_data, output_pattern.format(index)))
+        for future in futures:
+            future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shows how shared memory sequence rendering scales across cores.")
+    parser.add_argument("--frames", type=int, default=2000, help="Frames in the sequence")
+    parser.add_argument("--people", type=int, default=3, help="People per frame")
+    parser.add_argument("--processes", type=int, nargs="+", default=None,
+                        help="Process counts to compare, defaults to 1, 2, 4, ... up to the CPU count")
+    args = parser.parse_args(argv)
+
+    cpu_count = os.cpu_count() or 1
+    processes = args.processes or sorted({2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count} | {cpu_count})
+    sequence = make_sequence(args.frames, args.people)
+
+    print(f"{args.frames} frames, {args.people} people, {cpu_count} CPUs")
+    print(f"{'processes':>9} {'pickled':>10} {'shared':>10} {'frames/s':>10} {'speedup':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        output_pattern = os.path.join(directory, "frame_{:06d}.svg")
+        for count in processes:
+            started = time.perf_counter()
+            render_pickled(sequence, output_pattern, count)
+            pickled = time.perf_counter() - started
+
+            report = SharedSequenceRenderer(processes=count).render(sequence, output_pattern)
+            shared = report.wall_seconds
+            baseline = baseline or shared
+            print(f"{count:>9} {pickled:>9.2f}s {shared:>9.2f}s {args.frames / shared:>10.1f} "
+                  f"{baseline / shared:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import RenderConfig, render_pose_bytes, render_poses_threaded
+from bench_json_backends import make_pose_json
+
+
+def gil_status():
+    """
+    Describes the interpreter: free-threaded builds report whether the GIL is actually off.
+    """
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return "standard build (GIL)"
+    enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return "free-threaded build, GIL " + ("re-enabled" if enabled else "disabled")
+
+
+def render_processes(documents, workers):
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(render_pose_bytes, documents, chunksize=8))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares thread and process pools for rendering many documents.")
+    parser.add_argument("--documents", type=int, default=400, help="Number of documents to render")
+    parser.add_argument("--people", type=int, default=5, help="People per document")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to compare, defaults to 1, 2, 4, ... up to the CPU count")
+    args = parser.parse_args(argv)
+
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or sorted({2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count} | {cpu_count})
+    documents = [json.loads(make_pose_json(args.people, seed=i)) for i in range(args.documents)]
+    config = RenderConfig()
+
+    print(f"Python {sys.version.split()[0]}, {gil_status()}, {cpu_count} CPUs")
+    print(f"{args.documents} documents with {args.people} people each")
+    print(f"{'workers':>7} {'threads':>10} {'speedup':>8} {'processes':>10} {'speedup':>8}")
+    thread_baseline = process_baseline = None
+    for count in workers:
+        started = time.perf_counter()
+        render_poses_threaded(documents, config, workers=count)
+        threads = time.perf_counter() - started
+
+        started = time.perf_counter()
+        render_processes(documents, count)
+        processes = time.perf_counter() - started
+
+        thread_baseline = thread_baseline or threads
+        process_baseline = process_baseline or processes
+        print(f"{count:>7} {threads:>9.2f}s {thread_baseline / threads:>7.2f}x "
+              f"{processes:>9.2f}s {process_baseline / processes:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import os
+import sys
+from typing import Callable, NamedTuple
+
+from model.batch import expand_inputs
+from model.batch.heatmap_aggregate import ARRAY_SUFFIXES, HEATMAP_INPUT_SUFFIXES
+from model.file_handler import FileHandler
+from model.frame_index import IndexedPoseFile
+from model.json_parser import PoseJsonParser
+from model.jsonl_reader import JsonlPoseReader, decode_lines, is_jsonl_file
+from model.pose_array_loader import PoseArrayLoader
+from model.svg_renderer import ContactSheetRenderer
+
+
+class FrameSource(NamedTuple):
+    """
+    The frames one input contributes to the sheet. frames(indices) yields the parsed
+    OpenPose JSON data of the given ascending frame indices. close() releases the files
+    the source keeps open, it may be called more than once.
+    """
+    label: str
+    count: int
+    frames: Callable
+    close: Callable = lambda: None
+
+
+def open_source(input_path, file_handler, parser):
+    """
+    Opens an input without decoding its frames. Regular JSON files contribute their first
+    entry like in the batch converter; large multi-frame files, .jsonl captures and pose
+    arrays contribute every frame.
+    """
+    label = os.path.basename(input_path)
+    if is_jsonl_file(input_path):
+        reader = JsonlPoseReader(input_path, file_handler)
+        count = reader.count_frames()
+
+        def jsonl_frames(indices):
+            # Only the wanted lines are decoded, and reading stops after the last one
+            wanted = set(indices)
+            last = max(indices)
+            for chunk in reader.iter_chunks():
+                for record in decode_lines([line for line in chunk if line[0] in wanted]):
+                    # Broken lines come through as None and end up as an error cell
+                    yield record.pose_json_data
+                if chunk[-1][0] >= last:
+                    return
+
+        return FrameSource(label, count, jsonl_frames)
+
+    if input_path.lower().endswith(ARRAY_SUFFIXES):
+        sequence = PoseArrayLoader().load(input_path)
+        return FrameSource(label, len(sequence), lambda indices: ([sequence.frame(i)] for i in indices))
+
+    if file_handler.is_indexable_large_file(input_path):
+        indexed_file = IndexedPoseFile(input_path, parser)
+        return FrameSource(label, len(indexed_file), lambda indices: (indexed_file.frame(i) for i in indices),
+                           indexed_file.close)
+
+    def json_frames(indices):
+        for _ in indices:
+            yield parser.parse_pose_data(file_handler.load_text_file(input_path))
+
+    return FrameSource(label, 1, json_frames)
+
+
+def iter_selected(sources, selected):
+    """
+    Yields (label, pose_json_data) for the selected positions of the frames of all sources.
+    A source that fails while frames are read yields None for the rest of its frames.
+    Every source is closed once its frames have been yielded.
+    """
+    selected = iter(selected)
+    position = next(selected, None)
+    start = 0
+    for source in sources:
+        indices = []
+        while position is not None and position < start + source.count:
+            indices.append(position - start)
+            position = next(selected, None)
+        start += source.count
+        try:
+            yield from _iter_source_frames(source, indices)
+        finally:
+            source.close()
+
+
+def _iter_source_frames(source, indices):
+    if not indices:
+        return
+    frames = source.frames(indices)
+    try:
+        for index in indices:
+            label = source.label if source.count == 1 else f"{source.label} #{index}"
+            try:
+                pose_json_data = next(frames)
+            except StopIteration:
+                pose_json_data = None
+            except Exception as e:
+                print(f"[ContactSheet] {label}: {e}", file=sys.stderr)
+                frames = iter(())
+                pose_json_data = None
+            yield label, pose_json_data
+    finally:
+        # A generator that has yielded every wanted frame may still hold its file open
+        close = getattr(frames, 'close', None)
+        if close is not None:
+            close()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Tile many poses into one SVG contact sheet.")
+    parser.add_argument("inputs", nargs="+",
+                        help="OpenPose JSON files, .jsonl captures, .npy/.npz pose arrays, or directories containing them")
+    parser.add_argument("-o", "--output", required=True, help="Contact sheet file, .svg or .svgz")
+    parser.add_argument("--columns", type=int, default=8, help="Cells per row")
+    parser.add_argument("--cell-size", type=int, nargs=2, default=(240, 240), metavar=("WIDTH", "HEIGHT"),
+                        help="Size of a cell including its label")
+    parser.add_argument("--every", type=int, default=1, help="Only use every n-th frame")
+    parser.add_argument("--max-frames", type=int, default=None, help="Stop after this many cells")
+    parser.add_argument("--tight-crop", action="store_true", help="Zoom every cell to the people it contains")
+    parser.add_argument("--top-k", type=int, default=None, help="Render at most this many people per frame, the most confident first")
+    args = parser.parse_args(argv)
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    file_handler = FileHandler()
+    parser = PoseJsonParser()
+
+    with contextlib.ExitStack() as open_sources:
+        # Sources are closed as the sheet moves past them, and here if it is cut short
+        sources = []
+        for input_path in expand_inputs(args.inputs, HEATMAP_INPUT_SUFFIXES):
+            try:
+                source = open_source(input_path, file_handler, parser)
+            except Exception as e:
+                print(f"[ContactSheet] {input_path}: {e}", file=sys.stderr)
+                continue
+            open_sources.callback(source.close)
+            sources.append(source)
+
+        selected = range(0, sum(source.count for source in sources), args.every)[:args.max_frames]
+        render_options = {'tight_crop': args.tight_crop}
+        if args.top_k is not None:
+            render_options['top_k'] = args.top_k
+        sheet = ContactSheetRenderer(args.columns, *args.cell_size, **render_options)
+
+        file_handler.save_text_file(args.output, sheet.iter_render_cells(iter_selected(sources, selected), len(selected)))
+    print(f"Wrote {len(selected)} cells to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
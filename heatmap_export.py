@@ -0,0 +1,47 @@
+import argparse
+import sys
+
+from model.batch import HeatmapAggregator
+from model.file_handler import FileHandler
+from model.svg_renderer import joint_indices
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Accumulate where joints appear across many pose files into one heatmap.")
+    parser.add_argument("inputs", nargs="+",
+                        help="OpenPose JSON files, .jsonl captures, .npy/.npz pose arrays, or directories containing them")
+    parser.add_argument("-o", "--output", required=True, help="Heatmap file, .svg (or .svgz) or .png")
+    parser.add_argument("--joints", nargs="+", default=["all"],
+                        help="Joints to include: body joint names (left_wrist), groups (pose, face, hand_left, hand_right), "
+                             "a joint of a group (hand_left:8) or all")
+    parser.add_argument("--bins", type=int, nargs=2, default=(128, 128), metavar=("COLUMNS", "ROWS"),
+                        help="Cells of the heatmap grid")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-files", type=int, default=64, help="Input files handed to a worker process at once")
+    args = parser.parse_args(argv)
+    try:
+        args.joint_indices = sorted({index for selector in args.joints for index in joint_indices(selector)})
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    aggregator = HeatmapAggregator(bins=tuple(args.bins), processes=args.processes, chunk_files=args.chunk_files)
+    report = aggregator.aggregate(args.inputs)
+
+    file_handler = FileHandler()
+    if args.output.lower().endswith(".png"):
+        file_handler.save_bytes_file(args.output, report.heatmap.to_png(args.joint_indices))
+    else:
+        file_handler.save_text_file(args.output, report.heatmap.to_svg(args.joint_indices))
+
+    for input_path, error in report.errors:
+        print(f"[Heatmap] {input_path}: {error}", file=sys.stderr)
+    print(report.summary())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
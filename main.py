@@ -1,7 +1,8 @@
 import sys
-from view import main_window
+from view import get_main_window
 
 def main():
+    main_window = get_main_window()
     main_window.show()
     sys.exit(main_window.app.exec())
 
@@ -1,6 +1,49 @@
-from .file_handler import FileHandler
-from .json_parser import PoseJsonParser
-from .svg_renderer import SVGRenderer, render_pose
+import importlib
 
-file_handler = FileHandler()
-json_parser = PoseJsonParser()
+# The model imports without PyQt6. Its exports are imported on first access, so tools that
+# only render (e.g. `from model import render_pose`) do not load the file and JSON handling
+_LAZY_EXPORTS = {
+    'FileHandler': '.file_handler',
+    'PoseJsonParser': '.json_parser',
+    'SVGRenderer': '.svg_renderer',
+    'render_pose': '.svg_renderer',
+    'render_pose_bytes': '.svg_renderer',
+}
+
+# Shared handler instances, created on first use
+_file_handler = None
+_json_parser = None
+
+
+def get_file_handler():
+    """
+    Returns the FileHandler shared by the application.
+    """
+    global _file_handler
+    if _file_handler is None:
+        from .file_handler import FileHandler
+        _file_handler = FileHandler()
+    return _file_handler
+
+
+def get_json_parser():
+    """
+    Returns the PoseJsonParser shared by the application.
+    """
+    global _json_parser
+    if _json_parser is None:
+        from .json_parser import PoseJsonParser
+        _json_parser = PoseJsonParser()
+    return _json_parser
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
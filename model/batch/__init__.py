@@ -0,0 +1,7 @@
+from .pipeline import BatchPipeline, BatchJob, BatchItemResult, BatchReport, StageStats, build_jobs, expand_inputs
+from .archive_sink import ArchiveSink
+from .dedup_cache import PoseDedupCache
+from .shared_sequence import SharedSequenceRenderer, SequenceRenderReport
+from .checkpoint import CheckpointManifest, ManifestRecord, select_shard, shard_manifest_path, shard_of
+from .jsonl_convert import JsonlConverter, JsonlConvertReport
+from .heatmap_aggregate import HeatmapAggregator, HeatmapReport
@@ -0,0 +1,196 @@
+import io
+import json
+import queue
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+
+from ..file_handler import ModelError
+
+MANIFEST_NAME = "manifest.json"
+
+# Tar variants by file name suffix, mapped to the tarfile write mode
+TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+# Marks the end of the member queue for the writer thread
+_CLOSE = object()
+
+
+class ArchiveSink:
+    """
+    Writes rendered SVG documents as members of a single zip or tar archive.
+
+    Documents are handed over with add() and written by a dedicated writer thread,
+    so rendering never waits on archive compression. The member queue is bounded
+    and add() blocks while it is full. A manifest listing every member is
+    appended as the last entry when the sink is closed. Aliases for repeated documents
+    are only recorded in the manifest.
+
+    add() and add_alias() return a Future that resolves once the member is written, so
+    callers can tell which documents made it into the archive. After a write fails,
+    every later member fails as well.
+
+    The archive format follows the file name: .zip, .tar, .tar.gz/.tgz, .tar.bz2 or .tar.xz.
+    For zip archives, compress selects deflate instead of storing the members as is.
+    """
+
+    def __init__(self, archive_path, compress=False, queue_size=16):
+        self.archive_path = archive_path
+        self.compress = compress
+        self.manifest = []
+        self.__queue = queue.Queue(queue_size)
+        self.__error = None
+        self.__closed = False
+        self.__archive = self.__open_archive()
+        self.__writer_thread = threading.Thread(target=self.__write_members, name="ArchiveSinkWriter", daemon=True)
+        self.__writer_thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def add(self, member_name, fragments, source=None):
+        """
+        Queues one document for writing.
+
+        Args:
+            member_name: Path of the document inside the archive.
+            fragments: The document as a string, as UTF-8 bytes (e.g. from SVGRenderer.render_bytes())
+                or as an iterable of string fragments (e.g. from SVGRenderer.iter_render()).
+                Iterables are consumed on the writer thread.
+            source: Optional input path recorded in the manifest.
+
+        Returns:
+            Future: Resolves to the member size once written, or raises ModelError.
+        """
+        self.__raise_writer_error()
+        if self.__closed:
+            raise ModelError("Archive sink is already closed")
+        if isinstance(fragments, str):
+            fragments = (fragments,)
+        elif isinstance(fragments, (bytes, bytearray, memoryview)):
+            fragments = (memoryview(fragments),)
+        future = Future()
+        self.__queue.put((future, member_name, fragments, source, None))
+        return future
+
+    def add_alias(self, member_name, target_name, source=None):
+        """
+        Records a document that is identical to an already added member.
+        No data is written; the manifest maps member_name to target_name.
+        Returns a Future like add(), which resolves to None.
+        """
+        self.__raise_writer_error()
+        if self.__closed:
+            raise ModelError("Archive sink is already closed")
+        future = Future()
+        self.__queue.put((future, member_name, None, source, target_name))
+        return future
+
+    def close(self):
+        """
+        Waits for all queued documents, writes the manifest and closes the archive.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put(_CLOSE)
+        self.__writer_thread.join()
+        self.__raise_writer_error()
+
+    def __open_archive(self):
+        try:
+            lower_path = self.archive_path.lower()
+            if lower_path.endswith(".zip"):
+                compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+                return zipfile.ZipFile(self.archive_path, "w", compression=compression)
+            for suffix, mode in TAR_MODES.items():
+                if lower_path.endswith(suffix):
+                    return tarfile.open(self.archive_path, mode)
+        except Exception as e:
+            raise ModelError(f"Failed to create archive: {str(e)}")
+        raise ModelError(f"Unsupported archive type: {self.archive_path}")
+
+    def __write_members(self):
+        try:
+            while True:
+                item = self.__queue.get()
+                if item is _CLOSE:
+                    break
+                future, *member = item
+                # After a failure, keep draining so that add() never blocks forever
+                if self.__error is None:
+                    self.__write_member(future, *member)
+                else:
+                    future.set_exception(self.__writer_error())
+
+            if self.__error is None:
+                manifest = json.dumps({"members": self.manifest}, indent=4).encode("utf-8")
+                self.__write_member_bytes(MANIFEST_NAME, [manifest])
+        except Exception as e:
+            self.__error = e
+        finally:
+            try:
+                self.__archive.close()
+            except Exception as e:
+                self.__error = self.__error or e
+
+    def __write_member(self, future, member_name, fragments, source, alias_of):
+        size = None
+        if alias_of is not None:
+            entry = {"name": member_name, "alias_of": alias_of}
+        else:
+            try:
+                chunks = (fragment if isinstance(fragment, memoryview) else fragment.encode("utf-8") for fragment in fragments)
+                size = self.__write_member_bytes(member_name, chunks)
+            except Exception as e:
+                self.__error = e
+                future.set_exception(self.__writer_error())
+                return
+            entry = {"name": member_name, "size": size}
+        if source is not None:
+            entry["source"] = source
+        self.manifest.append(entry)
+        future.set_result(size)
+
+    def __write_member_bytes(self, member_name, chunks):
+        """
+        Writes one member from an iterable of byte chunks and returns its size.
+        Zip members are streamed; tar headers need the size up front, so tar
+        members are collected in memory first.
+        """
+        if isinstance(self.__archive, zipfile.ZipFile):
+            size = 0
+            with self.__archive.open(member_name, "w", force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    size += len(chunk)
+            return size
+
+        buffer = io.BytesIO()
+        for chunk in chunks:
+            buffer.write(chunk)
+        info = tarfile.TarInfo(member_name)
+        info.size = buffer.tell()
+        info.mtime = time.time()
+        buffer.seek(0)
+        self.__archive.addfile(info, buffer)
+        return info.size
+
+    def __writer_error(self):
+        return ModelError(f"Failed to write archive: {str(self.__error)}")
+
+    def __raise_writer_error(self):
+        if self.__error is not None:
+            raise self.__writer_error()
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import threading
+from typing import NamedTuple, Optional
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class ManifestRecord(NamedTuple):
+    """
+    One line of a checkpoint manifest. input_hash is a digest of the decoded input text,
+    input_size and input_mtime_ns are the size and modification time of the input file.
+    """
+    input_path: str
+    input_hash: Optional[str]
+    output_path: str
+    status: str
+    error: Optional[str] = None
+    input_size: Optional[int] = None
+    input_mtime_ns: Optional[int] = None
+
+
+def input_hash(json_string):
+    """
+    Returns the digest recorded for an input, computed from its decoded text.
+    """
+    return hashlib.blake2b(json_string.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def input_stat(input_path):
+    """
+    Returns the size and modification time in nanoseconds of an input file,
+    or None if it cannot be read.
+    """
+    try:
+        stat = os.stat(input_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class CheckpointManifest:
+    """
+    Append-only record of the finished jobs of a batch, used to resume it after a crash.
+
+    Every finished job appends one JSON line with its input path, input hash, output path
+    and status, and the line is flushed right away. Opening an existing manifest reads it
+    once into an index by input path, where the last record of an input wins. A restarted
+    run then skips a job with one dictionary lookup and a stat of its input instead of
+    checking its output file. Failed jobs are not skipped, so they are retried.
+
+    An input whose size or modification time changed since it was recorded is read again.
+    If its hash still matches (e.g. the dataset was copied or touched), it is not rendered
+    again; otherwise it is converted anew.
+
+    A line cut short by a crash is ignored when the manifest is read. Several processes
+    must not append to the same manifest; give every shard of a batch its own file.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.__index = {}
+        self.__lock = threading.Lock()
+        if os.path.exists(manifest_path):
+            self.__load()
+        manifest_dir = os.path.dirname(manifest_path)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        self.__file = open(manifest_path, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.__index)
+
+    def lookup(self, input_path):
+        """
+        Returns the latest ManifestRecord of an input, or None if it was never recorded.
+        """
+        return self.__index.get(input_path)
+
+    def is_done(self, job):
+        """
+        Returns True if the job was converted to the same output path before and
+        its input file still has the recorded size and modification time.
+        """
+        record = self.__done_record(job)
+        return (record is not None and record.input_size is not None
+                and (record.input_size, record.input_mtime_ns) == input_stat(job.input_path))
+
+    def is_unchanged(self, job, input_hash):
+        """
+        Returns True if the job was converted to the same output path before from
+        an input with the same hash.
+        """
+        record = self.__done_record(job)
+        return record is not None and record.input_hash is not None and record.input_hash == input_hash
+
+    def record(self, input_path, output_path, input_hash=None, error=None, stat=None):
+        """
+        Appends the outcome of one job and makes it the current record of its input.
+        stat is the (size, mtime_ns) of the input as returned by input_stat().
+        """
+        input_size, input_mtime_ns = stat or (None, None)
+        record = ManifestRecord(input_path, input_hash, output_path,
+                                STATUS_DONE if error is None else STATUS_FAILED, error, input_size, input_mtime_ns)
+        line = {'input': input_path, 'input_hash': input_hash, 'output': output_path, 'status': record.status}
+        if stat is not None:
+            line['input_size'] = input_size
+            line['input_mtime_ns'] = input_mtime_ns
+        if error is not None:
+            line['error'] = error
+        with self.__lock:
+            self.__file.write(json.dumps(line) + "\n")
+            self.__file.flush()
+            self.__index[input_path] = record
+        return record
+
+    def __done_record(self, job):
+        record = self.__index.get(job.input_path)
+        if record is None or record.status != STATUS_DONE or record.output_path != job.output_path:
+            return None
+        return record
+
+    def close(self):
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.close()
+
+    def __load(self):
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+                record = ManifestRecord(entry['input'], entry.get('input_hash'), entry['output'],
+                                        entry['status'], entry.get('error'), entry.get('input_size'),
+                                        entry.get('input_mtime_ns'))
+            except (ValueError, KeyError, TypeError):
+                # Only the last line can be incomplete, after a crash while it was written
+                continue
+            self.__index[record.input_path] = record
+
+        if content and not content.endswith("\n"):
+            # Start the next record on a fresh line after a cut off one
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write("\n")
+
+
+def shard_of(input_path, shard_count):
+    """
+    Returns the shard an input belongs to, in the range [0, shard_count).
+
+    The shard follows from a hash of the file name alone, so it does not change between
+    runs or Python processes (unlike hash()) and does not depend on where a node mounts
+    the shared file system.
+    """
+    digest = hashlib.blake2b(os.path.basename(input_path).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+
+def select_shard(jobs, shard_index, shard_count):
+    """
+    Returns the jobs of one shard. Running every shard from 0 to shard_count - 1
+    (e.g. on several machines) covers every job exactly once.
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index}/{shard_count}")
+    return [job for job in jobs if shard_of(job.input_path, shard_count) == shard_index]
+
+
+def shard_manifest_path(manifest_path, shard_index, shard_count):
+    """
+    Derives the manifest file of one shard, e.g. "run.jsonl" -> "run.shard-2-of-8.jsonl".
+    """
+    root, extension = os.path.splitext(manifest_path)
+    return f"{root}.shard-{shard_index}-of-{shard_count}{extension}"
@@ -0,0 +1,97 @@
+import hashlib
+
+import numpy as np
+
+from ..svg_renderer.person_stats import KEYPOINT_KEYS, drawable_mask, keypoint_rows, pose_bone_segments, scaled_points
+from ..svg_renderer.renderer import DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT
+
+
+class PoseDedupCache:
+    """
+    Remembers which output a pose was first rendered to, so that frames showing the
+    same pose can reuse it instead of being rendered and written again.
+
+    Poses are compared by a hash of what the renderer draws: the end points of every
+    drawn pose bone and the positions of the drawn face and hand keypoints, in canvas
+    pixels and quantised to the given tolerance, together with the canvas size and the
+    render style. Coordinates are scaled to the canvas by the renderer's rules (see
+    pose_bone_segments), so normalised and pixel inputs use the same tolerance.
+    Keypoint scores and hidden keypoints only matter as far as they decide what is drawn.
+
+    The quantisation divides every coordinate axis into bins of the tolerance width.
+    Two poses match when all their keypoints fall into the same bins. Poses that differ
+    by less than the tolerance can still miss when a keypoint lies on either side of a
+    bin edge, e.g. 100.4 and 100.6 with a tolerance of 1.
+    """
+
+    def __init__(self, tolerance=0.5, style=None):
+        if tolerance <= 0:
+            raise ValueError("Tolerance must be positive")
+        self.tolerance = tolerance
+        self.style = style
+        self.hits = 0
+        self.misses = 0
+        self.__outputs = {}
+
+    def key_for(self, pose_json_data):
+        """
+        Returns the cache key for parsed OpenPose JSON data.
+        Like the renderer, only the first entry of the list is considered.
+        """
+        pose_data = pose_json_data[0] if pose_json_data else {}
+        digest = hashlib.blake2b(digest_size=16)
+
+        canvas_width = pose_data.get('canvas_width', DEFAULT_CANVAS_WIDTH)
+        canvas_height = pose_data.get('canvas_height', DEFAULT_CANVAS_HEIGHT)
+        digest.update(repr((canvas_width, canvas_height, self.style)).encode('utf-8'))
+
+        for person in pose_data.get('people', []):
+            digest.update(b'|person')
+            drawn, segments = pose_bone_segments(keypoint_rows(person.get(KEYPOINT_KEYS[0])), canvas_width, canvas_height)
+            self.__update(digest, KEYPOINT_KEYS[0], drawn, segments)
+            for group in KEYPOINT_KEYS[1:]:
+                keypoints = keypoint_rows(person.get(group))
+                self.__update(digest, group, drawable_mask(keypoints), scaled_points(keypoints, canvas_width, canvas_height))
+        return digest.digest()
+
+    def lookup(self, key):
+        """
+        Returns the output stored for the key, or None. Updates the hit statistics.
+        """
+        output = self.__outputs.get(key)
+        if output is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return output
+
+    def count_as_miss(self):
+        """
+        Turns the last hit into a miss, for a hit whose original failed and has to be rendered again.
+        """
+        self.hits -= 1
+        self.misses += 1
+
+    def remember(self, key, output):
+        self.__outputs[key] = output
+
+    def forget(self, key):
+        self.__outputs.pop(key, None)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"Dedup cache: {self.hits} hits, {self.misses} misses, "
+                f"hit rate {self.hit_rate:.1%}, {len(self.__outputs)} unique poses")
+
+    def __update(self, digest, group, drawn, coordinates):
+        coordinates = np.round(coordinates / self.tolerance).astype(np.int64)
+        # What is not drawn must not split the key
+        coordinates[~drawn] = 0
+        digest.update(group.encode('utf-8'))
+        digest.update(len(drawn).to_bytes(4, 'little'))
+        digest.update(drawn.tobytes())
+        digest.update(coordinates.tobytes())
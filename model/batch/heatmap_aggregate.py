@@ -0,0 +1,113 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from ..file_handler import FileHandler
+from ..frame_index import IndexedPoseFile
+from ..json_parser import PoseJsonParser
+from ..jsonl_reader import JSONL_SUFFIXES, JsonlPoseReader, is_jsonl_file
+from ..pose_array_loader import PoseArrayLoader
+from ..svg_renderer.heatmap import JointHeatmap
+from .pipeline import JSON_INPUT_SUFFIXES, expand_inputs
+
+ARRAY_SUFFIXES = (".npy", ".npz")
+
+# Everything a directory contributes to a heatmap
+HEATMAP_INPUT_SUFFIXES = JSON_INPUT_SUFFIXES + JSONL_SUFFIXES + ARRAY_SUFFIXES
+
+
+class HeatmapReport(NamedTuple):
+    """
+    Outcome of a HeatmapAggregator run. errors holds (input, message) pairs; for
+    JSON Lines files the input is given as path:line.
+    """
+    heatmap: JointHeatmap
+    inputs: int
+    errors: list
+    wall_seconds: float
+
+    def summary(self):
+        keypoints = int(self.heatmap.counts.sum())
+        keypoints_per_second = keypoints / self.wall_seconds if self.wall_seconds > 0 else 0.0
+        return (f"Aggregated {keypoints} keypoints from {self.heatmap.frames} frames of {self.inputs} inputs "
+                f"in {self.wall_seconds:.2f}s ({keypoints_per_second:,.0f} keypoints/s)")
+
+
+def _aggregate_inputs(input_paths, bins):
+    """
+    Builds a partial heatmap of some inputs. Runs in a worker process; only the paths go in
+    and the counts come back.
+    """
+    heatmap = JointHeatmap(bins)
+    file_handler = FileHandler()
+    parser = PoseJsonParser()
+    errors = []
+    for input_path in input_paths:
+        try:
+            if is_jsonl_file(input_path):
+                for record in JsonlPoseReader(input_path, file_handler):
+                    if record.error is not None:
+                        errors.append((f"{input_path}:{record.line_number}", record.error))
+                    else:
+                        heatmap.add_pose_json(record.pose_json_data)
+            elif input_path.lower().endswith(ARRAY_SUFFIXES):
+                heatmap.add_sequence(PoseArrayLoader().load(input_path))
+            elif file_handler.is_indexable_large_file(input_path):
+                with IndexedPoseFile(input_path, parser) as frames:
+                    for index in range(len(frames)):
+                        heatmap.add_pose_json(frames.frame(index))
+            else:
+                heatmap.add_pose_json(parser.parse_pose_data(file_handler.load_text_file(input_path)))
+        except Exception as e:
+            errors.append((input_path, str(e)))
+    return heatmap, errors
+
+
+class HeatmapAggregator:
+    """
+    Accumulates a JointHeatmap over many inputs: OpenPose JSON files (large ones are read
+    frame by frame through a frame index), JSON Lines captures and NumPy pose arrays.
+
+    The inputs are split into chunks, every worker process builds the heatmap of its chunk,
+    and the partial heatmaps are merged in input order as they come back.
+    """
+
+    def __init__(self, bins=128, processes=None, chunk_files=64):
+        """
+        Args:
+            bins: Cells of the heatmap along both axes, or a (columns, rows) pair.
+            processes: Number of worker processes, defaults to the number of CPUs.
+                With 1, everything runs in the calling process.
+            chunk_files: Inputs per task.
+        """
+        self.bins = bins
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_files = chunk_files
+
+    def aggregate(self, input_paths):
+        """
+        Args:
+            input_paths: Files, and directories whose pose files are all used.
+
+        Returns:
+            HeatmapReport: The merged heatmap, errors and timing of the run.
+        """
+        started = time.perf_counter()
+        file_paths = expand_inputs(input_paths, HEATMAP_INPUT_SUFFIXES)
+        chunks = [file_paths[start:start + self.chunk_files] for start in range(0, len(file_paths), self.chunk_files)]
+
+        heatmap = JointHeatmap(self.bins)
+        errors = []
+        if self.processes == 1:
+            partials = (_aggregate_inputs(chunk, self.bins) for chunk in chunks)
+            self.__merge(heatmap, errors, partials)
+        else:
+            with ProcessPoolExecutor(self.processes) as executor:
+                self.__merge(heatmap, errors, executor.map(_aggregate_inputs, chunks, [self.bins] * len(chunks)))
+        return HeatmapReport(heatmap, len(file_paths), errors, time.perf_counter() - started)
+
+    def __merge(self, heatmap, errors, partials):
+        for partial, partial_errors in partials:
+            heatmap.merge(partial)
+            errors.extend(partial_errors)
@@ -0,0 +1,101 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from ..file_handler import FileHandler
+from ..jsonl_reader import JsonlPoseReader, decode_lines, map_chunks_bounded
+from ..svg_renderer import render_pose_bytes
+
+
+class JsonlConvertReport(NamedTuple):
+    """
+    Outcome of a JsonlConverter run. errors holds (line number, message) pairs.
+    """
+    input_path: str
+    frames: int
+    errors: list
+    wall_seconds: float
+
+    def summary(self):
+        converted = self.frames - len(self.errors)
+        frames_per_second = self.frames / self.wall_seconds if self.wall_seconds > 0 else 0.0
+        return (f"Converted {converted} of {self.frames} frames of {self.input_path} "
+                f"in {self.wall_seconds:.2f}s ({frames_per_second:.1f} frames/s)")
+
+
+def _convert_chunk(lines, output_pattern, render_options):
+    """
+    Decodes, renders and writes one chunk of lines. Runs in a worker process, so only
+    the lines go in and the error messages come back; the documents never leave the worker.
+    """
+    file_handler = FileHandler()
+    errors = []
+    for record in decode_lines(lines):
+        if record.error is not None:
+            errors.append((record.line_number, record.error))
+            continue
+        try:
+            svg_content = render_pose_bytes(record.pose_json_data, **render_options)
+            file_handler.save_bytes_file(output_pattern.format(record.frame_index), svg_content)
+        except Exception as e:
+            errors.append((record.line_number, str(e)))
+    return len(lines), errors
+
+
+class JsonlConverter:
+    """
+    Converts every line of a JSON Lines file to its own SVG file.
+
+    The file is streamed in chunks of lines (see JsonlPoseReader). With more than one
+    worker, each chunk is decoded, rendered and written by a worker process, and only
+    a few chunks per worker are read ahead, so memory stays flat for files of any size.
+    A broken line is recorded with its line number and the conversion continues.
+    """
+
+    def __init__(self, workers=None, chunk_lines=256, render_options=None, file_handler=None):
+        """
+        Args:
+            workers: Number of worker processes, defaults to the number of CPUs.
+                With 1, everything runs in the calling process.
+            chunk_lines: Lines per task.
+            render_options: Passed to the renderer for every frame, e.g. {"top_k": 5}.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_lines = chunk_lines
+        self.render_options = render_options or {}
+        self.file_handler = file_handler or FileHandler()
+
+    def convert(self, input_path, output_pattern):
+        """
+        Args:
+            input_path: A .jsonl file, optionally .gz, .bz2 or .xz compressed.
+            output_pattern: Output path with a str.format placeholder for the frame index,
+                e.g. "out/capture_{:06d}.svg". The index counts the non-empty lines from 0.
+
+        Returns:
+            JsonlConvertReport: Frame count, errors by line number and timing of the run.
+        """
+        if output_pattern.format(0) == output_pattern.format(1):
+            raise ValueError("output_pattern needs a placeholder for the frame index, e.g. 'frame_{:06d}.svg'")
+        output_dir = os.path.dirname(output_pattern.format(0))
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        started = time.perf_counter()
+        chunks = JsonlPoseReader(input_path, self.file_handler, self.chunk_lines).iter_chunks()
+        if self.workers == 1:
+            frames, errors = self.__collect(_convert_chunk(chunk, output_pattern, self.render_options) for chunk in chunks)
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                frames, errors = self.__collect(map_chunks_bounded(
+                    executor, _convert_chunk, chunks, self.workers * 2, output_pattern, self.render_options))
+        return JsonlConvertReport(input_path, frames, errors, time.perf_counter() - started)
+
+    def __collect(self, outcomes):
+        frames = 0
+        errors = []
+        for chunk_frames, chunk_errors in outcomes:
+            frames += chunk_frames
+            errors.extend(chunk_errors)
+        return frames, errors
@@ -0,0 +1,439 @@
+import asyncio
+import functools
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from ..file_handler import FileHandler
+from ..json_parser import PoseJsonParser
+from ..svg_renderer import render_pose_bytes
+from .checkpoint import input_hash, input_stat
+
+# Marker placed on a stage queue once per worker to tell it to stop
+_STOP = object()
+
+# Returned by a stage route to drop an item that needs no further processing
+_SKIP = object()
+
+# Returned by the read stage for an input the checkpoint manifest already records as converted
+_UNCHANGED = object()
+
+DEDUP_MODES = ("link", "reference")
+
+# Pools the render stage can run on: worker processes, or threads sharing the process
+RENDER_POOLS = ("process", "thread")
+
+JSON_INPUT_SUFFIXES = (".json", ".json.gz", ".json.bz2", ".json.xz")
+
+
+class BatchJob(NamedTuple):
+    """A single conversion from an OpenPose JSON file to an SVG file."""
+    input_path: str
+    output_path: str
+
+
+class BatchItemResult(NamedTuple):
+    """
+    Outcome of one batch job. error is None on success.
+    alias_of is set when the job reused the output of an identical earlier pose.
+    """
+    input_path: str
+    output_path: str
+    error: Optional[str] = None
+    alias_of: Optional[str] = None
+
+
+class StageStats:
+    """
+    Accumulates the work done by all workers of one pipeline stage.
+    """
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+
+    def utilisation(self, wall_seconds):
+        """
+        Returns the fraction of the available worker time this stage spent working.
+        A value close to 1.0 marks the stage as the bottleneck of the pipeline.
+        """
+        if wall_seconds <= 0 or self.workers <= 0:
+            return 0.0
+        return self.busy_seconds / (wall_seconds * self.workers)
+
+    def __repr__(self):
+        return f"StageStats(name={self.name}, workers={self.workers}, items={self.items}, busy={self.busy_seconds:.3f}s)"
+
+
+class BatchReport:
+    """
+    Results and per-stage statistics of a finished pipeline run.
+    """
+    def __init__(self, results, stages, wall_seconds, dedup_cache=None, skipped=0):
+        self.results = results
+        self.stages = stages
+        self.wall_seconds = wall_seconds
+        self.dedup_cache = dedup_cache
+        self.skipped = skipped
+
+    @property
+    def errors(self):
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def bottleneck(self):
+        """Returns the stage with the highest utilisation."""
+        return max(self.stages, key=lambda stage: stage.utilisation(self.wall_seconds))
+
+    def summary(self):
+        """
+        Returns a human readable multi-line summary of the run.
+        """
+        converted = len(self.results) - len(self.errors)
+        lines = [f"Converted {converted} of {len(self.results)} files in {self.wall_seconds:.2f}s"]
+        if self.skipped:
+            lines.append(f"  Skipped {self.skipped} files converted by an earlier run")
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<8} workers={stage.workers:<3} items={stage.items:<7} "
+                f"busy={stage.busy_seconds:8.2f}s utilisation={stage.utilisation(self.wall_seconds):6.1%}"
+            )
+        if self.stages:
+            lines.append(f"  Slowest stage: {self.bottleneck.name}")
+        if self.dedup_cache is not None:
+            lines.append(f"  {self.dedup_cache.summary()}")
+        return "\n".join(lines)
+
+
+def _parse_and_render(job, document, render_options=None):
+    """
+    CPU bound stage. Runs in a worker process, so it must stay a module level function.
+    Receives the raw text instead of decoded data to keep the pickled payload small,
+    and encodes the result here so the writer threads only copy bytes.
+    On a thread pool, nothing is pickled and the document may already be decoded.
+    """
+    pose_data = PoseJsonParser().parse_pose_data(document) if isinstance(document, str) else document
+    return render_pose_bytes(pose_data, **(render_options or {}))
+
+
+class BatchPipeline:
+    """
+    Converts many OpenPose JSON files to SVG with overlapping stages.
+
+    Reading and writing run on a thread pool, parsing and rendering run on a
+    process pool. The stages are connected by bounded queues so a fast stage
+    blocks instead of piling up documents in memory while a slower stage catches up.
+
+    If a sink such as ArchiveSink is given, the write stage hands the documents to it
+    instead of creating one file per job; job output paths become the member names.
+
+    If a PoseDedupCache is given, the readers decode every file and look up its
+    quantised pose. A repeated pose skips rendering and writing and reuses the first
+    output instead: as a manifest alias in a sink, as a hard link (dedup_mode "link")
+    or only as a reference in the results (dedup_mode "reference").
+
+    render_options are passed to the renderer for every file, e.g. {"tight_crop": True}.
+
+    With render_pool "thread", parsing and rendering run on threads instead of processes.
+    The documents then stay in the process and nothing is pickled. This pays off on a
+    free-threaded Python build, where the render threads run in parallel.
+
+    If a CheckpointManifest is given, jobs it records as done from the same input are
+    skipped and every finished job is appended to it, so an interrupted batch can be resumed.
+    """
+
+    def __init__(self, file_handler=None, readers=2, renderers=None, writers=2, queue_size=8, sink=None,
+                 dedup_cache=None, dedup_mode="link", render_options=None, render_pool="process", manifest=None):
+        if dedup_mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode: {dedup_mode}")
+        if render_pool not in RENDER_POOLS:
+            raise ValueError(f"Unknown render pool: {render_pool}")
+        if manifest is not None and sink is not None:
+            # An archive is written from scratch, so the members of an earlier run would be lost
+            raise ValueError("A checkpoint manifest cannot be combined with an archive sink")
+        self.file_handler = file_handler or FileHandler()
+        self.json_parser = PoseJsonParser()
+        self.sink = sink
+        self.dedup_cache = dedup_cache
+        self.dedup_mode = dedup_mode
+        self.render_options = render_options or {}
+        self.readers = readers
+        self.renderers = renderers or os.cpu_count() or 1
+        self.writers = writers
+        self.queue_size = queue_size
+        self.render_pool = render_pool
+        self.manifest = manifest
+
+    def run(self, jobs):
+        """
+        Runs all jobs and blocks until they are finished.
+
+        Returns:
+            BatchReport: The per-file results and per-stage statistics.
+        """
+        return asyncio.run(self.run_async(jobs))
+
+    async def run_async(self, jobs):
+        read_stats = StageStats("read", self.readers)
+        render_stats = StageStats("render", self.renderers)
+        write_stats = StageStats("write", self.writers)
+        results = []
+        self.__pending = {}
+        self.__inputs = {}
+        self.__skipped = 0
+
+        job_queue = asyncio.Queue(self.queue_size)
+        render_queue = asyncio.Queue(self.queue_size)
+        write_queue = asyncio.Queue(self.queue_size)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.readers + self.writers) as io_pool, \
+                self.__create_render_pool() as cpu_pool:
+            feeder = asyncio.create_task(self.__feed(jobs, job_queue))
+            route = None
+            if self.dedup_cache is not None:
+                route = functools.partial(self.__deduplicate, io_pool, results)
+            readers = [
+                asyncio.create_task(self.__run_stage(self.__read, io_pool, job_queue, render_queue, read_stats, results, route))
+                for _ in range(self.readers)
+            ]
+            render = functools.partial(_parse_and_render, render_options=self.render_options)
+            renderers = [
+                asyncio.create_task(self.__run_stage(render, cpu_pool, render_queue, write_queue, render_stats, results))
+                for _ in range(self.renderers)
+            ]
+            writers = [
+                asyncio.create_task(self.__run_stage(self.__write, io_pool, write_queue, None, write_stats, results))
+                for _ in range(self.writers)
+            ]
+
+            await feeder
+            await self.__drain(readers, render_queue, self.renderers)
+            await self.__drain(renderers, write_queue, self.writers)
+            await asyncio.gather(*writers)
+
+        wall_seconds = time.perf_counter() - started
+        return BatchReport(results, [read_stats, render_stats, write_stats], wall_seconds, self.dedup_cache,
+                           self.__skipped)
+
+    def __create_render_pool(self):
+        if self.render_pool == "thread":
+            return ThreadPoolExecutor(self.renderers)
+        return ProcessPoolExecutor(self.renderers)
+
+    async def __feed(self, jobs, job_queue):
+        for job in jobs:
+            if self.manifest is not None and self.manifest.is_done(job):
+                self.__skipped += 1
+                continue
+            await job_queue.put((job, None))
+        for _ in range(self.readers):
+            await job_queue.put(_STOP)
+
+    async def __drain(self, tasks, next_queue, next_workers):
+        """
+        Waits for all workers of a stage and then stops the workers of the next stage.
+        """
+        await asyncio.gather(*tasks)
+        for _ in range(next_workers):
+            await next_queue.put(_STOP)
+
+    async def __run_stage(self, work, executor, inbox, outbox, stats, results, route=None):
+        """
+        Worker loop shared by all stages. A failing item is recorded and dropped
+        so that a single broken file does not abort the whole batch.
+        An optional route coroutine may replace the payload or drop the item with _SKIP.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await inbox.get()
+            if item is _STOP:
+                return
+
+            job, payload = item
+            try:
+                stage_started = time.perf_counter()
+                try:
+                    payload = await loop.run_in_executor(executor, work, job, payload)
+                finally:
+                    stats.busy_seconds += time.perf_counter() - stage_started
+                if payload is _UNCHANGED:
+                    stats.items += 1
+                    self.__skipped += 1
+                    continue
+                # Time a route spends waiting for other jobs is not counted as busy
+                if route is not None:
+                    payload = await route(job, payload)
+            except Exception as e:
+                stats.failures += 1
+                self.__finish(results, job, error=f"{stats.name}: {str(e)}")
+                continue
+
+            stats.items += 1
+            if payload is _SKIP:
+                continue
+            if outbox is None:
+                self.__finish(results, job)
+            else:
+                await outbox.put((job, payload))
+
+    async def __deduplicate(self, io_pool, results, job, payload):
+        """
+        Read stage route. The first job with a pose continues to the renderer and
+        registers a future that resolves to its output once it is written. Later jobs
+        with the same pose wait for that future and reuse the output.
+        """
+        document, key = payload
+        original = self.dedup_cache.lookup(key)
+        if original is None:
+            future = asyncio.get_running_loop().create_future()
+            self.dedup_cache.remember(key, future)
+            self.__pending[job] = (key, future)
+            return document
+
+        original_output = await original
+        if original_output is None:
+            # The first job failed; render this one on its own
+            self.dedup_cache.count_as_miss()
+            return document
+
+        await asyncio.get_running_loop().run_in_executor(io_pool, self.__alias, job, original_output)
+        self.__finish(results, job, alias_of=original_output)
+        return _SKIP
+
+    def __finish(self, results, job, error=None, alias_of=None):
+        results.append(BatchItemResult(job.input_path, job.output_path, error, alias_of))
+        if self.manifest is not None:
+            digest, stat = self.__inputs.pop(job, (None, None))
+            self.manifest.record(job.input_path, job.output_path, digest, error, stat)
+
+        pending = self.__pending.pop(job, None)
+        if pending is not None:
+            key, future = pending
+            if error is not None:
+                # Let a later job with the same pose try again
+                self.dedup_cache.forget(key)
+            future.set_result(job.output_path if error is None else None)
+
+    def __read(self, job, _):
+        stat = input_stat(job.input_path) if self.manifest is not None else None
+        json_string = self.file_handler.load_text_file(job.input_path)
+        if self.manifest is not None:
+            digest = input_hash(json_string)
+            if self.manifest.is_unchanged(job, digest):
+                # Only the file's time changed; record it so the next run skips it by its stat
+                self.manifest.record(job.input_path, job.output_path, digest, stat=stat)
+                return _UNCHANGED
+            self.__inputs[job] = (digest, stat)
+        if self.dedup_cache is None:
+            return json_string
+        pose_data = self.json_parser.parse_pose_data(json_string)
+        key = self.dedup_cache.key_for(pose_data)
+        # Render threads reuse the decoded data. Worker processes decode the text again,
+        # which is cheaper than pickling the decoded data
+        return (pose_data if self.render_pool == "thread" else json_string), key
+
+    def __alias(self, job, original_output):
+        if self.sink is not None:
+            self.sink.add_alias(job.output_path, original_output, source=job.input_path).result()
+        elif self.dedup_mode == "link":
+            _create_output_dir(job.output_path)
+            if os.path.lexists(job.output_path):
+                os.remove(job.output_path)
+            try:
+                os.link(original_output, job.output_path)
+            except OSError:
+                # Hard links are not available everywhere (e.g. across devices)
+                shutil.copyfile(original_output, job.output_path)
+
+    def __write(self, job, svg_bytes):
+        if self.sink is not None:
+            # Waits until the sink wrote the member, so a job only counts as converted once
+            # it is in the archive and the stage time includes the archive writing
+            self.sink.add(job.output_path, svg_bytes, source=job.input_path).result()
+        else:
+            _create_output_dir(job.output_path)
+            self.file_handler.save_bytes_file(job.output_path, svg_bytes)
+
+
+def build_jobs(input_paths, output_dir, output_extension=".svg"):
+    """
+    Expands the given files and directories into batch jobs.
+    Directories contribute all *.json files they contain (not recursive), including
+    compressed ones ending in .json.gz, .json.bz2 or .json.xz. A file given twice is converted once.
+    Every output is written to output_dir with the input name and the output extension,
+    e.g. ".svgz" for compressed SVG files. Inputs with the same name from different
+    directories are written to subdirectories that mirror their directories.
+
+    Raises:
+        ValueError: If two inputs would still be written to the same output,
+            e.g. pose.json and pose.json.gz from the same directory.
+    """
+    file_paths = list(dict.fromkeys(expand_inputs(input_paths)))
+    return [
+        BatchJob(file_path, os.path.join(output_dir, output_name))
+        for file_path, output_name in zip(file_paths, _output_names(file_paths, output_extension))
+    ]
+
+
+def expand_inputs(input_paths, suffixes=JSON_INPUT_SUFFIXES):
+    """
+    Replaces every directory among the given paths by the files in it that end in one of
+    the suffixes (not recursive, sorted by name). Files are passed through as given.
+    """
+    file_paths = []
+    for input_path in input_paths:
+        if os.path.isdir(input_path):
+            file_paths.extend(sorted(
+                os.path.join(input_path, name) for name in os.listdir(input_path)
+                if name.lower().endswith(suffixes)
+            ))
+        else:
+            file_paths.append(input_path)
+    return file_paths
+
+
+def _input_stem(file_path):
+    name = os.path.basename(file_path)
+    for suffix in JSON_INPUT_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def _output_names(file_paths, output_extension):
+    """
+    Returns the output name of every input. Names that several inputs share are prefixed
+    with the directory of each input relative to the directory all of them are in.
+    """
+    names = [_input_stem(file_path) + output_extension for file_path in file_paths]
+    by_name = {}
+    for position, name in enumerate(names):
+        by_name.setdefault(os.path.normcase(name), []).append(position)
+
+    for positions in by_name.values():
+        if len(positions) < 2:
+            continue
+        directories = [os.path.dirname(os.path.abspath(file_paths[position])) for position in positions]
+        common = os.path.commonpath(directories)
+        for position, directory in zip(positions, directories):
+            names[position] = os.path.join(os.path.relpath(directory, common), names[position])
+
+    seen = {}
+    for file_path, name in zip(file_paths, names):
+        key = os.path.normcase(os.path.normpath(name))
+        if key in seen:
+            raise ValueError(f"{seen[key]} and {file_path} would both be converted to {os.path.normpath(name)}")
+        seen[key] = file_path
+    return [os.path.normpath(name) for name in names]
+
+
+def _create_output_dir(output_path):
+    # Inputs with the same name are written to subdirectories, see build_jobs()
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
@@ -0,0 +1,153 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from ..file_handler import FileHandler
+from ..pose_array_loader import PoseSequence
+from ..svg_renderer import render_pose_bytes
+
+# Set once per worker process by _attach_sequence and used by every range it renders
+_worker_state = {}
+
+# Frames copied into the shared block at a time, so a memory-mapped sequence is never
+# loaded as a whole
+COPY_CHUNK_FRAMES = 4096
+
+
+class SequenceRenderReport(NamedTuple):
+    """
+    Outcome of a SharedSequenceRenderer run. errors holds (frame index, message) pairs.
+    """
+    output_paths: list
+    errors: list
+    wall_seconds: float
+    processes: int
+
+    def summary(self):
+        converted = len(self.output_paths) - len(self.errors)
+        frames_per_second = len(self.output_paths) / self.wall_seconds if self.wall_seconds > 0 else 0.0
+        return (f"Rendered {converted} of {len(self.output_paths)} frames in {self.wall_seconds:.2f}s "
+                f"with {self.processes} processes ({frames_per_second:.1f} frames/s)")
+
+
+def _attach_sequence(block_name, shape, dtype, canvas_width, canvas_height, joint_counts, render_options):
+    """
+    Worker initializer. Maps the shared keypoint block instead of receiving a copy.
+    """
+    block = shared_memory.SharedMemory(name=block_name)
+    keypoints = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    _worker_state['block'] = block
+    _worker_state['sequence'] = PoseSequence(keypoints, canvas_width, canvas_height, joint_counts)
+    _worker_state['render_options'] = render_options
+    _worker_state['file_handler'] = FileHandler()
+
+
+def _render_range(start, stop, output_pattern):
+    """
+    Renders the frames [start, stop) of the shared sequence and writes each one straight
+    to its output file. Only the range and the error messages cross the process boundary.
+    """
+    sequence = _worker_state['sequence']
+    render_options = _worker_state['render_options']
+    file_handler = _worker_state['file_handler']
+
+    errors = []
+    for index in range(start, stop):
+        try:
+            svg_content = render_pose_bytes([sequence.frame(index)], **render_options)
+            file_handler.save_bytes_file(output_pattern.format(index), svg_content)
+        except Exception as e:
+            errors.append((index, str(e)))
+    return errors
+
+
+class SharedSequenceRenderer:
+    """
+    Renders every frame of a PoseSequence to its own SVG file on a process pool.
+
+    The keypoints are copied once into a multiprocessing.shared_memory block, which every
+    worker maps when it starts. Tasks are only (start, stop) frame ranges, so no pose data
+    is pickled per frame, and workers write their documents to the output files themselves.
+    """
+
+    def __init__(self, processes=None, chunk_size=32, render_options=None, smoothing=None):
+        """
+        Args:
+            processes: Number of worker processes, defaults to the number of CPUs.
+            chunk_size: Frames per task. Larger chunks mean fewer tasks, smaller chunks
+                balance the load better at the end of the run.
+            render_options: Passed to the renderer for every frame, e.g. {"top_k": 5}.
+            smoothing: Options of PoseSequence.smoothed, e.g. {"window_length": 7}, to smooth
+                the keypoints over time before rendering. None renders them as they are.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.render_options = render_options or {}
+        self.smoothing = smoothing
+
+    def render(self, sequence, output_pattern):
+        """
+        Renders all frames of the sequence.
+
+        Args:
+            sequence: A PoseSequence, e.g. from PoseArrayLoader or PoseSequence.from_pose_json.
+            output_pattern: Output path with a str.format placeholder for the frame index,
+                e.g. "out/frame_{:06d}.svg". Compressed extensions such as .svgz work as well.
+
+        Returns:
+            SequenceRenderReport: Output paths, errors and timing of the run.
+        """
+        if output_pattern.format(0) == output_pattern.format(1):
+            raise ValueError("output_pattern needs a placeholder for the frame index, e.g. 'frame_{:06d}.svg'")
+
+        started = time.perf_counter()
+        if self.smoothing is not None:
+            # The filter needs whole trajectories, so a memory-mapped sequence is read in full here
+            sequence = sequence.smoothed(**self.smoothing)
+        # Not converted here: for a memory-mapped sequence that would load a full copy into memory
+        keypoints = sequence.keypoints
+        output_paths = [output_pattern.format(index) for index in range(len(keypoints))]
+        errors = []
+
+        if len(keypoints):
+            output_dir = os.path.dirname(output_paths[0])
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            errors = self.__render_shared(sequence, keypoints, output_pattern)
+
+        return SequenceRenderReport(output_paths, errors, time.perf_counter() - started, self.processes)
+
+    def __render_shared(self, sequence, keypoints, output_pattern):
+        dtype = np.dtype(np.float64)
+        # A block cannot be empty, e.g. for a sequence without people
+        block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(keypoints.shape)) * dtype.itemsize))
+        try:
+            self.__fill_block(block, keypoints, dtype)
+            joint_counts = [stop - start for _, start, stop in sequence.parts]
+            initargs = (block.name, keypoints.shape, dtype.str, sequence.canvas_width,
+                        sequence.canvas_height, joint_counts, self.render_options)
+
+            with ProcessPoolExecutor(self.processes, initializer=_attach_sequence, initargs=initargs) as executor:
+                futures = [
+                    executor.submit(_render_range, start, min(start + self.chunk_size, len(keypoints)), output_pattern)
+                    for start in range(0, len(keypoints), self.chunk_size)
+                ]
+                errors = []
+                for future in futures:
+                    errors.extend(future.result())
+            return errors
+        finally:
+            block.close()
+            block.unlink()
+
+    @staticmethod
+    def __fill_block(block, keypoints, dtype):
+        # Copy through a temporary view; a view that is still alive would keep the block from closing
+        view = np.ndarray(keypoints.shape, dtype=dtype, buffer=block.buf)
+        for start in range(0, len(keypoints), COPY_CHUNK_FRAMES):
+            view[start:start + COPY_CHUNK_FRAMES] = keypoints[start:start + COPY_CHUNK_FRAMES]
+        del view
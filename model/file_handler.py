@@ -1,6 +1,20 @@
+import bz2
+import codecs
+import gzip
+import lzma
 import os
 import time
 
+# Compressed files are recognised by their suffix and (de)compressed while streaming
+COMPRESSED_OPENERS = {
+    '.gz': gzip.open,
+    '.svgz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+READ_CHUNK_SIZE = 64 * 1024
+
 class ModelError(Exception):
     """Generic exception for the model layer."""
     pass
@@ -9,7 +23,19 @@ class FileHandler:
     MAX_FILE_SIZE = 100 * 1024  # 100 KB
 
     def load_text_file(self, file_path):
+        """
+        Loads a UTF-8 text file. Files ending in .gz, .bz2 or .xz are decompressed and
+        decoded chunk by chunk while reading, so neither the compressed nor the decompressed
+        bytes are held in memory next to the text. For those, the size limit applies to the
+        decompressed bytes.
+
+        The text is still returned whole: the JSON backends parse complete documents and
+        the preview shows the text, so the parser is not fed chunk by chunk.
+        """
         try:
+            if self.__compressed_opener(file_path) is not None:
+                return self.__load_compressed_text_file(file_path)
+
             # Check file size before opening
             if os.path.getsize(file_path) > self.MAX_FILE_SIZE:
                 raise ModelError(f"File is too large ({os.path.getsize(file_path)} bytes). Maximum size is {self.MAX_FILE_SIZE} bytes.")
@@ -24,9 +50,67 @@ class FileHandler:
     def save_text_file(self, file_path, content):
         """
         Saves the provided content to a file.
+        The content may be a string or an iterable of string fragments, e.g. from
+        SVGRenderer.iter_render(). Files ending in .svgz, .gz, .bz2 or .xz are
+        compressed fragment by fragment while writing.
         """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            opener = self.__compressed_opener(file_path) or open
+            with opener(file_path, 'wt', encoding='utf-8') as f:
+                if isinstance(content, str):
+                    f.write(content)
+                else:
+                    for fragment in content:
+                        f.write(fragment)
+        except Exception as e:
+            raise ModelError(f"Failed to save file: {str(e)}")
+
+    def save_bytes_file(self, file_path, content):
+        """
+        Saves already encoded content, e.g. a bytearray or QByteArray, to a file.
+        The buffer is written as is without another copy, compressed if the
+        extension asks for it.
+        """
+        try:
+            opener = self.__compressed_opener(file_path) or open
+            with opener(file_path, 'wb') as f:
                 f.write(content)
         except Exception as e:
             raise ModelError(f"Failed to save file: {str(e)}")
+
+    def is_indexable_large_file(self, file_path):
+        """
+        Returns True for uncompressed files that are over the size limit for load_text_file().
+        Such files can still be opened frame by frame through a FrameIndex.
+        """
+        try:
+            return self.__compressed_opener(file_path) is None and os.path.getsize(file_path) > self.MAX_FILE_SIZE
+        except OSError:
+            return False
+
+    def open_binary_stream(self, file_path):
+        """
+        Opens a file for reading bytes, decompressing it on the fly if needed.
+        """
+        opener = self.__compressed_opener(file_path) or open
+        return opener(file_path, 'rb')
+
+    def __load_compressed_text_file(self, file_path):
+        # Counts decompressed bytes, like the on-disk size of an uncompressed file
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = []
+        size = 0
+        with self.__compressed_opener(file_path)(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.MAX_FILE_SIZE:
+                    raise ModelError(f"File is too large (more than {self.MAX_FILE_SIZE} bytes after decompression). Maximum size is {self.MAX_FILE_SIZE} bytes.")
+                parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    def __compressed_opener(self, file_path):
+        return COMPRESSED_OPENERS.get(os.path.splitext(file_path)[1].lower())
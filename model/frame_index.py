@@ -0,0 +1,200 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+
+from .file_handler import COMPRESSED_OPENERS, ModelError
+from .json_parser import PoseJsonParser
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".frames.idx"
+
+# Sidecar layout: header, then the offsets and the lengths as two arrays of unsigned 64 bit integers
+INDEX_MAGIC = b"OPFIDX01"
+INDEX_HEADER = struct.Struct("<8sQqQ")  # magic, source size, source mtime in ns, entry count
+
+# Strings are matched as a whole, so brackets inside keys or values are skipped
+STRUCTURE_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+
+class FrameIndex:
+    """
+    Byte offsets and lengths of the top-level entries of a JSON array file.
+
+    The index is built in a single scan and stored in a '<file>.frames.idx' sidecar.
+    The sidecar records the size and modification time of the indexed file; when either
+    changes, the index is rebuilt on the next open().
+    """
+
+    def __init__(self, source_path, offsets, lengths, source_size, source_mtime_ns):
+        self.source_path = source_path
+        self.offsets = offsets
+        self.lengths = lengths
+        self.source_size = source_size
+        self.source_mtime_ns = source_mtime_ns
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @classmethod
+    def open(cls, source_path):
+        """
+        Loads the sidecar of a file if it is up to date, otherwise builds the index and
+        tries to store it. A sidecar that cannot be written only costs a rebuild next time.
+        """
+        index = cls.load(source_path)
+        if index is not None:
+            return index
+
+        index = cls.build(source_path)
+        try:
+            index.save()
+        except OSError as e:
+            logger.warning("Could not write frame index for %s: %s", source_path, e)
+        return index
+
+    @classmethod
+    def build(cls, source_path):
+        """
+        Scans a file once and records where each top-level entry starts and ends.
+        The file is memory mapped, so its size is not limited by the available memory.
+        """
+        if os.path.splitext(source_path)[1].lower() in COMPRESSED_OPENERS:
+            raise ModelError(f"Compressed files cannot be indexed, because they do not support seeking: {source_path}")
+
+        stat = os.stat(source_path)
+        if stat.st_size == 0:
+            raise ModelError(f"File is empty: {source_path}")
+
+        offsets = array('Q')
+        lengths = array('Q')
+
+        with open(source_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            depth = 0
+            for match in STRUCTURE_PATTERN.finditer(data):
+                token = match.group()
+                if token[0] == 0x22:  # A string; only allowed inside the entries
+                    if depth < 2:
+                        raise ModelError(f"Top-level entries must be JSON objects or arrays: {source_path}")
+                    continue
+
+                if token in b"[{":
+                    depth += 1
+                    if depth == 2:
+                        offsets.append(match.start())
+                    elif depth == 1 and token != b"[":
+                        raise ModelError(f"Not a JSON array of pose entries: {source_path}")
+                else:
+                    depth -= 1
+                    if depth == 1:
+                        lengths.append(match.end() - offsets[-1])
+                    elif depth < 0:
+                        raise ModelError(f"Unbalanced brackets in {source_path}")
+
+            if depth != 0:
+                raise ModelError(f"Unexpected end of file in {source_path}")
+
+        return cls(source_path, offsets, lengths, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, source_path):
+        """
+        Returns the index stored in the sidecar, or None if there is none or it is stale.
+        """
+        index_path = source_path + INDEX_SUFFIX
+        try:
+            stat = os.stat(source_path)
+            with open(index_path, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                if len(header) != INDEX_HEADER.size:
+                    return None
+                magic, size, mtime_ns, count = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return None
+
+                offsets = array('Q')
+                lengths = array('Q')
+                offsets.fromfile(f, count)
+                lengths.fromfile(f, count)
+        except (OSError, EOFError):
+            return None
+
+        return cls(source_path, offsets, lengths, size, mtime_ns)
+
+    def save(self):
+        """
+        Writes the sidecar next to the indexed file.
+        """
+        with open(self.source_path + INDEX_SUFFIX, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.source_size, self.source_mtime_ns, len(self)))
+            self.offsets.tofile(f)
+            self.lengths.tofile(f)
+
+    def read_entry(self, f, index):
+        """
+        Reads the raw bytes of one entry from an open binary file.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} out of range, the file has {len(self)} frames")
+        f.seek(self.offsets[index])
+        return f.read(self.lengths[index])
+
+
+class PoseFrameList:
+    """
+    The entries of already parsed OpenPose JSON data with the same interface as IndexedPoseFile.
+    """
+
+    def __init__(self, pose_json_data):
+        self.pose_json_data = pose_json_data
+
+    def __len__(self):
+        return len(self.pose_json_data)
+
+    def frame(self, index):
+        return [self.pose_json_data[index]]
+
+    def close(self):
+        pass
+
+
+class IndexedPoseFile:
+    """
+    Random access to the frames of a large multi-frame OpenPose JSON file.
+
+    Loading frame N seeks to the entry, decodes only its bytes and returns it in the
+    structure the renderer expects, i.e. as a list with a single entry.
+    Frames may be loaded from several threads at once.
+    """
+
+    def __init__(self, file_path, parser=None):
+        self.file_path = file_path
+        self.parser = parser or PoseJsonParser()
+        self.index = FrameIndex.open(file_path)
+        self.__file = open(file_path, 'rb')
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.index)
+
+    def frame(self, index):
+        """
+        Returns the parsed pose data of a single frame.
+        """
+        # Seeking and reading share the file position; decoding runs outside the lock
+        with self.__lock:
+            entry = self.index.read_entry(self.__file, index)
+        return self.parser.parse_pose_data(b"[" + entry + b"]")
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
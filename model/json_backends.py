@@ -0,0 +1,59 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibJsonBackend:
+    """JSON backend based on the json module of the standard library. Always available."""
+    name = "stdlib"
+
+    def loads(self, json_string):
+        return json.loads(json_string)
+
+    def dumps_pretty(self, data):
+        return json.dumps(data, indent=4)
+
+
+class OrjsonBackend(StdlibJsonBackend):
+    """
+    JSON backend based on orjson, which decodes number heavy documents several times
+    faster than the standard library.
+
+    It accepts the same documents as the standard library: orjson rejects NaN, Infinity
+    and integers beyond 64 bits, so those documents are decoded again with the json module.
+    The preview is written by the json module as well, to keep its indentation of 4.
+    """
+    name = "orjson"
+
+    def loads(self, json_string):
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            return json.loads(json_string)
+
+
+def available_json_backends():
+    """
+    Returns the installed backends, fastest first.
+    """
+    backends = []
+    if orjson is not None:
+        backends.append(OrjsonBackend())
+    backends.append(StdlibJsonBackend())
+    return backends
+
+
+def get_json_backend(name=None):
+    """
+    Returns the backend with the given name, or the fastest installed one if no name is given.
+    """
+    backends = available_json_backends()
+    if name is None:
+        return backends[0]
+    for backend in backends:
+        if backend.name == name:
+            return backend
+    raise ValueError(f"JSON backend '{name}' is not available. Installed: {[b.name for b in backends]}")
@@ -1,18 +1,59 @@
-import json
+from array import array
+
+from .json_backends import get_json_backend
+
+# Keys of the flat keypoint lists in an OpenPose person entry
+KEYPOINT_KEYS = ("pose_keypoints_2d", "face_keypoints_2d", "hand_left_keypoints_2d", "hand_right_keypoints_2d")
 
 class ParserError(Exception):
     """Generic exception for the parser layer."""
     pass
 
 class PoseJsonParser:
+    def __init__(self, backend=None, typed_keypoints=False):
+        """
+        Args:
+            backend: A backend from model.json_backends. Defaults to the fastest installed one.
+            typed_keypoints: Convert the keypoint lists of every person into array('d') buffers.
+                They take a fraction of the memory of lists of float objects, and NumPy can wrap them
+                without copying.
+        """
+        self.backend = backend or get_json_backend()
+        self.typed_keypoints = typed_keypoints
+
     def parse_pose_json(self, json_string):
         """
         Parses the input JSON string and returns a tuple (object, pretty_string).
+        The pretty string is produced from the same decoded object that is returned for rendering.
         Catches all exceptions and rethrows them as a ParserError.
         """
         try:
-            data = json.loads(json_string)
-            pretty_json = json.dumps(data, indent=4)
-            return data, pretty_json
+            data = self.backend.loads(json_string)
+            pretty_json = self.backend.dumps_pretty(data)
+            return self.__convert_keypoints(data), pretty_json
         except Exception as e:
             raise ParserError(f"Failed to parse JSON: {str(e)}")
+
+    def parse_pose_data(self, json_string):
+        """
+        Parses the input JSON string and returns only the decoded object.
+        Used by batch processing, where no pretty printed preview is needed.
+        """
+        try:
+            return self.__convert_keypoints(self.backend.loads(json_string))
+        except Exception as e:
+            raise ParserError(f"Failed to parse JSON: {str(e)}")
+
+    def __convert_keypoints(self, data):
+        if not self.typed_keypoints or not isinstance(data, list):
+            return data
+
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            for person in entry.get('people', []):
+                for key in KEYPOINT_KEYS:
+                    values = person.get(key)
+                    if isinstance(values, list):
+                        person[key] = array('d', values)
+        return data
@@ -0,0 +1,134 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from .file_handler import FileHandler
+from .json_parser import ParserError, PoseJsonParser
+
+# Suffixes of JSON Lines files, plain or compressed
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.bz2", ".jsonl.xz")
+
+
+class JsonlRecord(NamedTuple):
+    """
+    One frame of a JSON Lines file. pose_json_data is None and error is set if the line
+    could not be decoded. frame_index counts the non-empty lines, starting at 0.
+    """
+    frame_index: int
+    line_number: int
+    pose_json_data: Optional[list]
+    error: Optional[str] = None
+
+
+def is_jsonl_file(file_path):
+    return file_path.lower().endswith(JSONL_SUFFIXES)
+
+
+def decode_lines(lines, typed_keypoints=False):
+    """
+    Decodes a chunk of (frame index, line number, bytes) tuples into JsonlRecords.
+    A line that fails, invalid UTF-8 included, only produces a record with an error;
+    the rest of the chunk is decoded.
+    Module level, so chunks can be decoded in worker processes.
+    """
+    parser = PoseJsonParser(typed_keypoints=typed_keypoints)
+    records = []
+    for frame_index, line_number, line in lines:
+        try:
+            data = parser.parse_pose_data(line.decode('utf-8'))
+            if isinstance(data, dict):
+                # One frame object per line; the renderer expects a list of entries
+                data = [data]
+            elif not isinstance(data, list):
+                raise ParserError(f"Expected an OpenPose frame object, got {type(data).__name__}")
+            records.append(JsonlRecord(frame_index, line_number, data))
+        except UnicodeDecodeError as e:
+            records.append(JsonlRecord(frame_index, line_number, None, f"Line is not valid UTF-8: {e}"))
+        except ParserError as e:
+            records.append(JsonlRecord(frame_index, line_number, None, str(e)))
+    return records
+
+
+class JsonlPoseReader:
+    """
+    Streams the frames of a JSON Lines file (one OpenPose frame object per line).
+
+    The file is read in chunks of lines, so memory stays constant however large the file
+    is. Compressed files (.jsonl.gz, .jsonl.bz2, .jsonl.xz) are decompressed on the fly.
+    With workers, chunks are decoded on a process pool while the next ones are read;
+    at most two chunks per worker are in flight, and records are still yielded in order.
+    Broken lines are reported as records with an error and do not stop the stream.
+    """
+
+    def __init__(self, file_path, file_handler=None, chunk_lines=256, workers=0, typed_keypoints=False):
+        """
+        Args:
+            file_path: Path of the JSON Lines file.
+            chunk_lines: Lines decoded together, the unit of work for the process pool.
+            workers: Number of decoding processes. 0 decodes on the calling thread.
+            typed_keypoints: See PoseJsonParser.
+        """
+        if chunk_lines < 1:
+            raise ValueError("chunk_lines must be at least 1")
+        self.file_path = file_path
+        self.file_handler = file_handler or FileHandler()
+        self.chunk_lines = chunk_lines
+        self.workers = workers
+        self.typed_keypoints = typed_keypoints
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def iter_chunks(self):
+        """
+        Yields the non-empty lines of the file as lists of (frame index, line number, bytes) tuples.
+        Lines are decoded by decode_lines, so a line with invalid UTF-8 does not end the stream.
+        """
+        chunk = []
+        frame_index = 0
+        with self.file_handler.open_binary_stream(self.file_path) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                chunk.append((frame_index, line_number, line))
+                frame_index += 1
+                if len(chunk) == self.chunk_lines:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def count_frames(self):
+        """
+        Counts the non-empty lines of the file without decoding them.
+        """
+        with self.file_handler.open_binary_stream(self.file_path) as f:
+            return sum(1 for line in f if line.strip())
+
+    def iter_records(self):
+        """
+        Yields a JsonlRecord for every non-empty line, in file order.
+        """
+        if self.workers <= 0:
+            for chunk in self.iter_chunks():
+                yield from decode_lines(chunk, self.typed_keypoints)
+            return
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            for records in map_chunks_bounded(executor, decode_lines, self.iter_chunks(), self.workers * 2,
+                                              self.typed_keypoints):
+                yield from records
+
+
+def map_chunks_bounded(executor, work, chunks, max_in_flight, *args):
+    """
+    Like executor.map, but only reads ahead max_in_flight chunks, so a huge input is never
+    queued up in memory at once. Yields the results in the order of the chunks.
+    """
+    in_flight = collections.deque()
+    for chunk in chunks:
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+        in_flight.append(executor.submit(work, chunk, *args))
+    while in_flight:
+        yield in_flight.popleft().result()
@@ -0,0 +1,190 @@
+import json
+import os
+
+import numpy as np
+
+from .file_handler import ModelError
+from .smoothing import savgol_smooth
+
+# Order and size of the keypoint groups along the joint axis of a pose array.
+# Arrays may stop after any group, e.g. 18 joints hold the body pose only.
+DEFAULT_KEYPOINT_LAYOUT = (
+    ("pose_keypoints_2d", 18),
+    ("face_keypoints_2d", 70),
+    ("hand_left_keypoints_2d", 21),
+    ("hand_right_keypoints_2d", 21),
+)
+
+METADATA_SUFFIX = ".meta.json"
+
+
+class PoseSequence:
+    """
+    A sequence of poses stored as one array shaped (frames, people, joints, 3).
+
+    Frames are handed to the renderer as views into the array, so for memory mapped
+    .npy files only the pages of the frames that are actually rendered are read.
+    """
+
+    def __init__(self, keypoints, canvas_width=None, canvas_height=None, joint_counts=None):
+        if keypoints.ndim != 4 or keypoints.shape[3] != 3:
+            raise ModelError(f"Pose array must be shaped (frames, people, joints, 3), got {keypoints.shape}")
+
+        self.keypoints = keypoints
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.parts = self.__resolve_layout(keypoints.shape[2], joint_counts)
+
+    @classmethod
+    def from_pose_json(cls, pose_json_data):
+        """
+        Stacks all entries of parsed OpenPose JSON data into one sequence.
+        OpenPose does not track people, so person i of every frame is assumed to be the
+        same person; frames with fewer people are padded with zero scores.
+        The canvas size is taken from the first entry.
+        """
+        if not pose_json_data:
+            raise ModelError("No pose data found")
+
+        group_names = [name for name, _ in DEFAULT_KEYPOINT_LAYOUT]
+        people_count = max(len(entry.get('people', [])) for entry in pose_json_data)
+        joint_counts = [
+            max((len(person.get(name) or []) // 3 for entry in pose_json_data for person in entry.get('people', [])), default=0)
+            for name in group_names
+        ]
+
+        keypoints = np.zeros((len(pose_json_data), people_count, sum(joint_counts), 3), dtype=np.float64)
+        for frame_index, entry in enumerate(pose_json_data):
+            for person_index, person in enumerate(entry.get('people', [])):
+                start = 0
+                for name, count in zip(group_names, joint_counts):
+                    values = np.asarray(person.get(name) or [], dtype=np.float64)
+                    rows = values[:len(values) // 3 * 3].reshape(-1, 3)
+                    keypoints[frame_index, person_index, start:start + len(rows)] = rows
+                    start += count
+
+        first = pose_json_data[0]
+        return cls(keypoints, first.get('canvas_width'), first.get('canvas_height'), joint_counts)
+
+    def __len__(self):
+        return self.keypoints.shape[0]
+
+    def smoothed(self, window_length=7, polyorder=2):
+        """
+        Returns a copy of the sequence with temporally smoothed keypoints, see savgol_smooth.
+        Normalised keypoints are fitted in pixels of the canvas the renderer would use.
+        """
+        # Imported here: the renderer package imports this module
+        from .svg_renderer.renderer import DEFAULT_CANVAS_HEIGHT, DEFAULT_CANVAS_WIDTH
+
+        canvas_size = (self.canvas_width or DEFAULT_CANVAS_WIDTH, self.canvas_height or DEFAULT_CANVAS_HEIGHT)
+        return PoseSequence(
+            savgol_smooth(self.keypoints, window_length, polyorder, canvas_size),
+            self.canvas_width,
+            self.canvas_height,
+            [stop - start for _, start, stop in self.parts],
+        )
+
+    def frame(self, index):
+        """
+        Returns one frame in the structure SVGRenderer expects from a parsed OpenPose entry.
+        The keypoint groups are (n, 3) array views instead of flat JSON lists.
+        People whose scores are all zero are padding and are left out.
+        """
+        frame_keypoints = self.keypoints[index]
+        present = np.any(frame_keypoints[:, :, 2] > 0, axis=1)
+
+        people = []
+        for person_index in np.flatnonzero(present):
+            person_keypoints = frame_keypoints[person_index]
+            people.append({name: person_keypoints[start:stop] for name, start, stop in self.parts})
+
+        pose_data = {'people': people}
+        if self.canvas_width is not None:
+            pose_data['canvas_width'] = self.canvas_width
+        if self.canvas_height is not None:
+            pose_data['canvas_height'] = self.canvas_height
+        return pose_data
+
+    def iter_frames(self):
+        for index in range(len(self)):
+            yield self.frame(index)
+
+    def __resolve_layout(self, joint_count, joint_counts):
+        """
+        Maps the joint axis to keypoint groups as (name, start, stop) triples.
+        """
+        if joint_counts is None:
+            joint_counts = []
+            total = 0
+            for _, count in DEFAULT_KEYPOINT_LAYOUT:
+                if total >= joint_count:
+                    break
+                joint_counts.append(count)
+                total += count
+
+        if sum(joint_counts) != joint_count or len(joint_counts) > len(DEFAULT_KEYPOINT_LAYOUT):
+            raise ModelError(f"Cannot split {joint_count} joints into keypoint groups {list(joint_counts)}")
+
+        parts = []
+        start = 0
+        for (name, _), count in zip(DEFAULT_KEYPOINT_LAYOUT, joint_counts):
+            parts.append((name, start, start + int(count)))
+            start += int(count)
+        return parts
+
+
+class PoseArrayLoader:
+    """
+    Loads pose sequences from NumPy .npy and .npz files.
+
+    .npy files are memory mapped. Their canvas size and joint layout are read from an
+    optional '<name>.meta.json' sidecar with the keys canvas_width, canvas_height and layout.
+    .npz archives carry the same information as members next to the 'keypoints' array.
+    """
+
+    def load(self, file_path):
+        try:
+            extension = os.path.splitext(file_path)[1].lower()
+            if extension == ".npy":
+                return self.__load_npy(file_path)
+            if extension == ".npz":
+                return self.__load_npz(file_path)
+            raise ModelError(f"Unsupported pose array file: {file_path}")
+        except ModelError:
+            raise
+        except Exception as e:
+            raise ModelError(f"Failed to load pose array: {str(e)}")
+
+    def __load_npy(self, file_path):
+        keypoints = np.load(file_path, mmap_mode='r')
+        metadata = {}
+        metadata_path = os.path.splitext(file_path)[0] + METADATA_SUFFIX
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+
+        return PoseSequence(
+            keypoints,
+            canvas_width=metadata.get('canvas_width'),
+            canvas_height=metadata.get('canvas_height'),
+            joint_counts=metadata.get('layout'),
+        )
+
+    def __load_npz(self, file_path):
+        # Members of an .npz archive are decompressed on access and cannot be memory mapped
+        with np.load(file_path) as archive:
+            if 'keypoints' not in archive.files:
+                raise ModelError(f"No 'keypoints' array found in {file_path}")
+
+            return PoseSequence(
+                archive['keypoints'],
+                canvas_width=self.__scalar(archive, 'canvas_width'),
+                canvas_height=self.__scalar(archive, 'canvas_height'),
+                joint_counts=archive['layout'].tolist() if 'layout' in archive.files else None,
+            )
+
+    def __scalar(self, archive, name):
+        if name not in archive.files:
+            return None
+        return archive[name].item()
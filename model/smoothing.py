@@ -0,0 +1,90 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def savgol_smooth(keypoints, window_length=7, polyorder=2, canvas_size=None):
+    """
+    Smooths keypoint trajectories over time with a Savitzky-Golay filter.
+
+    The whole sequence is filtered at once: every keypoint of every frame gets a weighted
+    least squares polynomial fit over the window centred on it, computed for all frames,
+    people and joints in one set of array operations.
+
+    Missing keypoints (score <= 0 or negative coordinates) get a weight of zero, so they
+    neither pull their neighbours towards (0, 0) nor are moved themselves. Windows at the
+    start and end of the sequence or around gaps are fitted on the samples that exist.
+    Where fewer than polyorder + 1 samples exist, the keypoint is left unchanged.
+
+    Keypoints whose coordinates are both within [0, 1] are normalised to the canvas. With a
+    canvas_size they are fitted in canvas pixels, so a trajectory that mixes normalised and
+    pixel frames is filtered in one unit. Every smoothed keypoint is clipped back into the
+    range it was read in: normalised ones stay within [0, 1] and pixel ones non-negative,
+    so the renderer neither rescales nor hides them.
+
+    Args:
+        keypoints: Array shaped (frames, people, joints, 3) holding x, y and score.
+        window_length: Odd number of frames in each fit.
+        polyorder: Degree of the fitted polynomial, smaller than window_length.
+        canvas_size: (width, height) the normalised keypoints are scaled to, or None to fit
+            them as they are.
+
+    Returns:
+        np.ndarray: A new float array of the same shape. Scores are copied unchanged.
+    """
+    if window_length % 2 == 0 or window_length < 1:
+        raise ValueError("window_length must be a positive odd number")
+    if polyorder >= window_length:
+        raise ValueError("polyorder must be smaller than window_length")
+
+    keypoints = np.asarray(keypoints, dtype=np.float64)
+    result = keypoints.copy()
+    if keypoints.shape[0] == 0:
+        return result
+
+    half = window_length // 2
+    valid = (keypoints[..., 2] > 0) & (keypoints[..., :2] >= 0).all(axis=-1)
+    normalised = valid & (keypoints[..., :2] <= 1.0).all(axis=-1)
+    scale = 1.0
+    if canvas_size is not None:
+        scale = np.where(normalised[..., None], np.asarray(canvas_size, dtype=np.float64), 1.0)
+    coordinates = keypoints[..., :2] * scale
+
+    # Pad the time axis with missing samples, so every frame has a full window
+    padding = [(half, half)] + [(0, 0)] * (keypoints.ndim - 2)
+    weights = np.pad(valid.astype(np.float64), padding)
+    values = np.pad(np.where(valid[..., None], coordinates, 0.0), padding + [(0, 0)])
+
+    # Windows along time are moved to the last axis: (frames, people, joints, window)
+    weight_windows = sliding_window_view(weights, window_length, axis=0)
+    value_windows = sliding_window_view(values, window_length, axis=0)  # (frames, people, joints, 2, window)
+
+    offsets = np.arange(-half, half + 1, dtype=np.float64)
+    basis = offsets[:, None] ** np.arange(polyorder + 1)  # (window, order + 1)
+
+    sample_counts = weight_windows.sum(axis=-1)
+    complete = valid & (sample_counts == window_length)
+    partial = valid & ~complete & (sample_counts > polyorder)
+    smoothed = coordinates.copy()
+
+    # Windows without gaps share the classic Savitzky-Golay coefficients: one weighted sum
+    if complete.any():
+        coefficients = np.linalg.pinv(basis)[0]
+        filtered = np.zeros_like(coordinates)
+        for offset, coefficient in enumerate(coefficients):
+            filtered += coefficient * values[offset:offset + len(filtered)]
+        smoothed[complete] = filtered[complete]
+
+    # Windows with gaps need their own weighted fit, solved for all of them at once
+    if partial.any():
+        weight_rows = weight_windows[partial]  # (n, window)
+        normal_matrix = np.einsum('nw,wi,wj->nij', weight_rows, basis, basis)
+        right_hand_side = np.einsum('nw,wi,ncw->nci', weight_rows, basis, value_windows[partial])
+        solution = np.linalg.solve(normal_matrix[:, None], right_hand_side[..., None])
+        # The fitted polynomial evaluated at offset 0 is its constant coefficient
+        smoothed[partial] = solution[:, :, 0, 0]
+
+    # Back to the unit each keypoint was read in; keypoints that were not fitted keep their exact values
+    smoothed = np.where(normalised[..., None], np.clip(smoothed / scale, 0.0, 1.0), np.maximum(smoothed, 0.0))
+    fitted = complete | partial
+    result[..., :2][fitted] = smoothed[fitted]
+    return result
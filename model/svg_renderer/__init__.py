@@ -1,14 +1,107 @@
-from .renderer import SVGRenderer
+import importlib
 
-def render_pose(pose_json_data):
+from .render_config import RenderConfig, RenderStyle, Canvas, RenderedFrame, FrameGeometry
+from .renderer import PoseRenderer, SVGRenderer
+from .delta_renderer import DeltaSequenceRenderer, FrameDelta
+from .styled_frame import StyledFrame
+
+# Exported names whose modules are only imported on first access, because they load
+# NumPy or other slow modules that plain rendering does not need
+_LAZY_EXPORTS = {
+    'JointHeatmap': '.heatmap',
+    'joint_indices': '.heatmap',
+    'ContactSheetRenderer': '.contact_sheet',
+    'KeypointEditor': '.keypoint_editor',
+    'KeypointRef': '.keypoint_editor',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+def render_pose(pose_json_data, **options):
     """
-    Creates a renderer object for the given pose JSON and returns the rendered SVG string.
+    Renders the given pose JSON and returns the rendered SVG string.
     
     Args:
         pose_json_data: The parsed OpenPose JSON data.
+        **options: Render options, see RenderConfig, e.g. roi or tight_crop.
         
     Returns:
         str: The rendered SVG as a string.
     """
-    renderer = SVGRenderer(pose_json_data)
-    return renderer.render()
+    return PoseRenderer(RenderConfig(**options)).render(pose_json_data)
+
+
+def render_pose_bytes(pose_json_data, **options):
+    """
+    Renders the given pose JSON and returns the SVG as UTF-8 bytes.
+    
+    Args:
+        pose_json_data: The parsed OpenPose JSON data.
+        **options: Render options, see RenderConfig, e.g. roi or tight_crop.
+        
+    Returns:
+        bytearray: The rendered SVG, encoded as UTF-8.
+    """
+    return PoseRenderer(RenderConfig(**options)).render_bytes(pose_json_data)
+
+
+def render_pose_fragments(pose_json_data, **options):
+    """
+    Renders the given pose JSON and returns the SVG as fragments.
+    
+    Args:
+        pose_json_data: The parsed OpenPose JSON data.
+        **options: Render options, see RenderConfig, e.g. roi or tight_crop.
+        
+    Returns:
+        iterator of str: The fragments of the SVG document, in order.
+    """
+    return PoseRenderer(RenderConfig(**options)).iter_render(pose_json_data)
+
+
+def render_pose_deltas(pose_json_data, tolerance=0.5, **options):
+    """
+    Renders all entries of the pose JSON as a keyframe followed by per-frame deltas.
+    
+    Args:
+        pose_json_data: The parsed OpenPose JSON data, one entry per frame.
+        tolerance: Coordinate changes up to this many canvas pixels are not emitted.
+        **options: Render options, see RenderConfig, e.g. roi.
+        
+    Returns:
+        iterator of str: JSON lines, see DeltaSequenceRenderer.iter_stream.
+    """
+    renderer = DeltaSequenceRenderer(tolerance, **options)
+    return renderer.iter_stream(pose_json_data)
+
+
+def render_poses_threaded(frames, config=None, workers=None):
+    """
+    Renders many documents on a thread pool that shares a single PoseRenderer.
+    Nothing is pickled or copied between workers. With the GIL, threads mostly help when
+    rendering overlaps with I/O; on a free-threaded Python build they render in parallel.
+    
+    Args:
+        frames: Iterable of parsed OpenPose JSON data, one document per item.
+        config: The RenderConfig for all documents.
+        workers: Number of threads, defaults to the ThreadPoolExecutor default.
+        
+    Returns:
+        list of bytearray: The rendered SVG documents as UTF-8 bytes, in input order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    renderer = PoseRenderer(config)
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(renderer.render_bytes, frames))
@@ -0,0 +1,129 @@
+import math
+from xml.sax.saxutils import escape
+
+from .render_config import RenderConfig
+from .renderer import PoseRenderer
+
+LABEL_HEIGHT = 16
+LABEL_COLOR = "#cccccc"
+ERROR_COLOR = "#ff6060"
+
+
+class ContactSheetRenderer:
+    """
+    Tiles many frames into a grid inside a single SVG document, e.g. to skim a dataset.
+
+    The marker definitions are emitted once at the top. Every frame becomes a cell: a <g>
+    translated to its grid position, holding the label and a group that scales the frame
+    into the cell and clips it to its region. Cells are formatted one after the other while
+    the document is consumed, so iter_render() can be written to a file with constant memory
+    however many frames the sheet has. A frame that fails to render leaves an empty cell
+    with the error message instead of aborting the sheet.
+    """
+
+    def __init__(self, columns=8, cell_width=240, cell_height=240, gap=8, **options):
+        """
+        Args:
+            columns: Cells per row.
+            cell_width, cell_height: Size of a cell including its label, in sheet pixels.
+            gap: Space between cells and around the grid.
+            **options: Render options for every frame, see RenderConfig, e.g. tight_crop.
+        """
+        if columns < 1:
+            raise ValueError("A contact sheet needs at least one column")
+        self.columns = columns
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.gap = gap
+        self.renderer = PoseRenderer(RenderConfig(**options))
+
+    def size(self, frame_count):
+        """
+        Returns the (width, height) of a sheet with the given number of frames.
+        """
+        rows = max(1, math.ceil(frame_count / self.columns))
+        columns = min(self.columns, max(1, frame_count))
+        return (self.gap + columns * (self.cell_width + self.gap),
+                self.gap + rows * (self.cell_height + self.gap))
+
+    def render(self, frames, labels=None, count=None):
+        """
+        Renders the sheet into an SVG string. See iter_render().
+        """
+        return "".join(self.iter_render(frames, labels, count))
+
+    def iter_render(self, frames, labels=None, count=None):
+        """
+        Renders the sheet as a sequence of SVG fragments.
+
+        Args:
+            frames: Parsed OpenPose JSON data, one item per cell. May be a generator if count is given.
+            labels: Optional label per cell, defaults to the frame number.
+            count: Number of frames, needed up front for the size of the sheet. Defaults to len(frames).
+
+        Yields:
+            str: The next fragment of the SVG document.
+        """
+        if count is None:
+            if not hasattr(frames, '__len__'):
+                raise ValueError("The number of frames must be given when rendering a contact sheet from an iterator")
+            count = len(frames)
+        labels = iter(labels) if labels is not None else None
+        cells = ((next(labels, None) if labels is not None else None, pose_json_data) for pose_json_data in frames)
+        return self.iter_render_cells(cells, count)
+
+    def iter_render_cells(self, cells, count):
+        """
+        Like iter_render(), for (label, pose_json_data) pairs. A label of None shows the frame number.
+        """
+        width, height = self.size(count)
+        yield f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">\n{self.renderer.defs()}\n'
+        yield f'\t<rect id="sheet_background" width="{width}" height="{height}" fill="#202020" />\n'
+        for index, (label, pose_json_data) in enumerate(cells):
+            if index == count:
+                break
+            yield self.__render_cell(index, pose_json_data, str(index) if label is None else str(label))
+        yield "</svg>"
+
+    def __render_cell(self, index, pose_json_data, label):
+        x = self.gap + (index % self.columns) * (self.cell_width + self.gap)
+        y = self.gap + (index // self.columns) * (self.cell_height + self.gap)
+        parts = [f'\t<g id="cell_{index}" transform="translate({x} {y})">\n',
+                 f'\t\t<text x="0" y="{LABEL_HEIGHT - 4}" font-family="sans-serif" font-size="12" '
+                 f'fill="{LABEL_COLOR}">{escape(label)}</text>\n']
+        try:
+            parts.extend(self.__frame_parts(index, pose_json_data))
+        except Exception as e:
+            parts.append(f'\t\t<text x="0" y="{2 * LABEL_HEIGHT}" font-family="sans-serif" font-size="10" '
+                         f'fill="{ERROR_COLOR}">{escape(str(e))}</text>\n')
+        parts.append('\t</g>\n')
+        return "".join(parts)
+
+    def __frame_parts(self, index, pose_json_data):
+        """
+        Returns the clipped and scaled frame of a cell. The fragments are collected first,
+        so a failing frame never leaves half a cell behind.
+        """
+        frame = self.renderer.render_frame(pose_json_data, background=False)
+        fragments = list(frame.fragments)
+
+        region_x, region_y, region_width, region_height = frame.view_box or (0, 0, frame.canvas.width, frame.canvas.height)
+        if region_width <= 0 or region_height <= 0:
+            raise ValueError(f"Cannot fit a region of {region_width}x{region_height} into a cell")
+        available_height = self.cell_height - LABEL_HEIGHT
+        scale = min(self.cell_width / region_width, available_height / region_height)
+        # Centre the region in the space below the label
+        offset_x = (self.cell_width - region_width * scale) / 2
+        offset_y = LABEL_HEIGHT + (available_height - region_height * scale) / 2
+
+        # The frame's own background would cover the whole canvas, so the cell draws one for
+        # its region only. Renderers without clip path support (like QtSvg) still look right then.
+        region = f'x="{region_x}" y="{region_y}" width="{region_width}" height="{region_height}"'
+        return [
+            f'\t\t<defs><clipPath id="cell_{index}_clip"><rect {region} /></clipPath></defs>\n',
+            f'\t\t<g transform="translate({offset_x:.3f} {offset_y:.3f}) scale({scale:.6f}) '
+            f'translate({-region_x} {-region_y})" clip-path="url(#cell_{index}_clip)">\n',
+            f'\t\t\t<rect {region} fill="{self.renderer.config.style.background}" />\n',
+            *fragments,
+            '\t\t</g>\n',
+        ]
@@ -0,0 +1,96 @@
+import json
+from typing import NamedTuple
+
+from .render_config import RenderConfig
+from .renderer import PoseRenderer
+
+
+class FrameDelta(NamedTuple):
+    """
+    The changes of one frame relative to what was emitted before.
+    """
+    changed: dict    # element id -> markup, for elements that appeared or moved beyond the tolerance
+    removed: list    # Ids of elements that are no longer drawn
+
+
+class DeltaSequenceRenderer:
+    """
+    Renders a pose sequence as one full keyframe followed by per-frame deltas.
+
+    Every element of the keyframe carries a stable id (see SVGElement). For the following
+    frames, the geometry of every element is compared with the geometry last emitted for
+    its id, and markup is only formatted and emitted for elements that moved by more than
+    the tolerance. Comparing against the last emitted geometry instead of the previous
+    frame means slow drifts are still emitted once they add up.
+    """
+
+    def __init__(self, tolerance=0.5, **options):
+        """
+        Args:
+            tolerance: Largest coordinate change in canvas pixels that is not emitted.
+            **options: Render options, see RenderConfig. tight_crop is not supported,
+                because the viewBox of the keyframe is kept for the whole sequence.
+        """
+        if options.get('tight_crop'):
+            raise ValueError("tight_crop changes the viewBox per frame and cannot be used for delta rendering")
+        self.tolerance = tolerance
+        self.renderer = PoseRenderer(RenderConfig(**options))
+        self.__emitted = {}
+
+    def render_keyframe(self, pose_data):
+        """
+        Renders a full SVG document with element ids and makes it the reference for later deltas.
+
+        Args:
+            pose_data: One entry of parsed OpenPose JSON data.
+
+        Returns:
+            str: The rendered SVG as a string.
+        """
+        self.__emitted = {element.element_id: element.geometry for element in self.renderer.iter_elements([pose_data])}
+        return "".join(self.renderer.iter_render([pose_data], element_ids=True))
+
+    def render_delta(self, pose_data):
+        """
+        Computes the changes of a frame relative to the elements emitted so far.
+
+        Args:
+            pose_data: One entry of parsed OpenPose JSON data.
+
+        Returns:
+            FrameDelta: The new or moved elements and the ids of removed ones.
+        """
+        changed = {}
+        drawn = set()
+        for element in self.renderer.iter_elements([pose_data]):
+            drawn.add(element.element_id)
+            previous = self.__emitted.get(element.element_id)
+            if previous is None or self.__moved(previous, element.geometry):
+                changed[element.element_id] = self.renderer.draw_element(element)
+                self.__emitted[element.element_id] = element.geometry
+
+        removed = [element_id for element_id in self.__emitted if element_id not in drawn]
+        for element_id in removed:
+            del self.__emitted[element_id]
+        return FrameDelta(changed, removed)
+
+    def iter_stream(self, pose_json_data):
+        """
+        Renders all entries of parsed OpenPose JSON data as a JSON lines stream.
+        The first line is {"frame": 0, "svg": <keyframe>}, every further line is
+        {"frame": i, "set": {id: markup}, "remove": [id, ...]}. A player replaces the
+        elements in "set" (appending new ones to the document) and deletes those in "remove".
+
+        Yields:
+            str: The next line, including its line break.
+        """
+        for frame_index, pose_data in enumerate(pose_json_data):
+            if frame_index == 0:
+                record = {'frame': 0, 'svg': self.render_keyframe(pose_data)}
+            else:
+                delta = self.render_delta(pose_data)
+                record = {'frame': frame_index, 'set': delta.changed, 'remove': delta.removed}
+            yield json.dumps(record) + "\n"
+
+    def __moved(self, previous, current):
+        return any(abs(a - b) > self.tolerance for a, b in zip(previous, current))
@@ -0,0 +1,12 @@
+from typing import NamedTuple
+
+class SVGElement(NamedTuple):
+    """
+    A single drawable element of a rendered frame: a pose bone loop, a face circle or a hand line.
+    The element_id is derived from the person index and the keypoints the element connects,
+    so the same element keeps its id from frame to frame.
+    """
+    element_id: str
+    kind: str          # "pose_bone", "face", "hand_left" or "hand_right"
+    geometry: tuple    # Canvas coordinates: (x1, y1, x2, y2) for bones and lines, (x, y) for circles
+    detail: tuple      # (idx1, idx2) for pose bones, (bone index,) for hand lines, () for face circles
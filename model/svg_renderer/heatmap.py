@@ -0,0 +1,285 @@
+import struct
+import zlib
+
+import numpy as np
+
+from ..pose_array_loader import DEFAULT_KEYPOINT_LAYOUT
+from .renderer import DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT, canvas_of
+
+# Names of the 18 body keypoints (COCO order), usable as joint selectors
+POSE_JOINT_NAMES = (
+    "nose", "neck", "right_shoulder", "right_elbow", "right_wrist", "left_shoulder", "left_elbow", "left_wrist",
+    "right_hip", "right_knee", "right_ankle", "left_hip", "left_knee", "left_ankle",
+    "right_eye", "left_eye", "right_ear", "left_ear",
+)
+
+# Short names of the keypoint groups, e.g. "hand_left" for "hand_left_keypoints_2d"
+GROUP_NAMES = tuple(name[:-len("_keypoints_2d")] for name, _ in DEFAULT_KEYPOINT_LAYOUT)
+
+# Colour ramp from empty to densest cell, similar to the inferno colour map
+HEATMAP_COLOR_STOPS = ((0x1b, 0x0c, 0x41), (0x4a, 0x0c, 0x6b), (0x93, 0x26, 0x67),
+                       (0xdd, 0x51, 0x3a), (0xfc, 0xa5, 0x0a), (0xfc, 0xff, 0xa4))
+HEATMAP_LEVELS = 64
+
+# Pending bin indices are added to the histogram once this many have been collected
+FLUSH_SIZE = 1 << 20
+
+
+def _level_colors():
+    stops = np.array(HEATMAP_COLOR_STOPS, dtype=np.float64)
+    positions = np.linspace(0.0, 1.0, len(stops))
+    levels = np.linspace(0.0, 1.0, HEATMAP_LEVELS)
+    return np.stack([np.interp(levels, positions, stops[:, channel]) for channel in range(3)], axis=1).round().astype(np.uint8)
+
+
+class JointHeatmap:
+    """
+    Per-joint 2D histograms of where keypoints appear across many frames.
+
+    Keypoints are binned relative to the canvas of their own frame, so frames of different
+    sizes line up by their relative position. Coordinates between 0 and 1 are taken as
+    normalised, like the renderer does. Keypoints with a score of 0, negative coordinates
+    or outside their canvas are not counted.
+
+    Binning is vectorised: the flat bin index of every keypoint is computed with array
+    operations and collected, and the collected indices are added to the counts with a single
+    bincount once a million of them have piled up. Heatmaps built in different processes can
+    be combined with merge(); they pickle with their counts only.
+    """
+
+    def __init__(self, bins=128, canvas_width=None, canvas_height=None):
+        """
+        Args:
+            bins: Number of cells along both axes, or a (columns, rows) pair.
+            canvas_width, canvas_height: Size of the rendered heatmap. Defaults to the canvas
+                of the first frame that is added.
+        """
+        self.bins_x, self.bins_y = (bins, bins) if np.isscalar(bins) else bins
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.joint_count = sum(count for _, count in DEFAULT_KEYPOINT_LAYOUT)
+        self.frames = 0
+        self.__counts = np.zeros((self.joint_count, self.bins_y, self.bins_x), dtype=np.int64)
+        self.__pending = []
+        self.__pending_size = 0
+
+    @property
+    def counts(self):
+        """
+        The histograms as a (joints, rows, columns) array, including all keypoints added so far.
+        """
+        self.__flush()
+        return self.__counts
+
+    def __getstate__(self):
+        self.__flush()
+        return self.__dict__
+
+    def add_keypoints(self, keypoints, canvas_width=None, canvas_height=None, joint_offset=0):
+        """
+        Adds keypoints without counting frames.
+
+        Args:
+            keypoints: Array shaped (..., joints, 3). Joint j is counted as joint joint_offset + j
+                of the default layout (body pose, face, left hand, right hand).
+            canvas_width, canvas_height: Canvas of the keypoints, defaults to the heatmap canvas.
+        """
+        keypoints = np.asarray(keypoints, dtype=np.float64)
+        joints = keypoints.shape[-2]
+        if joint_offset + joints > self.joint_count:
+            raise ValueError(f"Keypoints for joints {joint_offset}..{joint_offset + joints - 1} do not fit the layout")
+        width = canvas_width or self.canvas_width or DEFAULT_CANVAS_WIDTH
+        height = canvas_height or self.canvas_height or DEFAULT_CANVAS_HEIGHT
+
+        x = keypoints[..., 0]
+        y = keypoints[..., 1]
+        normalised = (x <= 1.0) & (y <= 1.0)
+        column = np.floor(np.where(normalised, x, x / width) * self.bins_x)
+        row = np.floor(np.where(normalised, y, y / height) * self.bins_y)
+        valid = (keypoints[..., 2] > 0) & (x >= 0) & (y >= 0) & (column < self.bins_x) & (row < self.bins_y)
+
+        joint = np.broadcast_to(np.arange(joint_offset, joint_offset + joints), x.shape)
+        flat_index = (joint[valid] * self.bins_y + row[valid].astype(np.int64)) * self.bins_x + column[valid].astype(np.int64)
+        self.__pending.append(flat_index)
+        self.__pending_size += len(flat_index)
+        if self.__pending_size >= FLUSH_SIZE:
+            self.__flush()
+
+    def add_pose_json(self, pose_json_data):
+        """
+        Adds every entry of parsed OpenPose JSON data as one frame.
+        """
+        for pose_data in pose_json_data:
+            canvas = canvas_of(pose_data)
+            self.__adopt_canvas(canvas.width, canvas.height)
+            people = pose_data.get('people', [])
+
+            # One (people, joints, 3) block per frame; missing groups stay at score 0
+            keypoints = np.zeros((len(people), self.joint_count, 3))
+            for person_index, person in enumerate(people):
+                offset = 0
+                for name, count in DEFAULT_KEYPOINT_LAYOUT:
+                    values = person.get(name)
+                    if values is not None and len(values):
+                        rows = np.asarray(values, dtype=np.float64)
+                        if rows.ndim == 1:
+                            rows = rows[:len(rows) // 3 * 3].reshape(-1, 3)
+                        rows = rows[:count]
+                        keypoints[person_index, offset:offset + len(rows)] = rows
+                    offset += count
+            self.add_keypoints(keypoints, canvas.width, canvas.height)
+            self.frames += 1
+
+    def add_sequence(self, sequence, chunk_frames=4096):
+        """
+        Adds every frame of a PoseSequence, a chunk of frames at a time so that memory
+        mapped sequences are never loaded as a whole.
+        """
+        self.__adopt_canvas(sequence.canvas_width, sequence.canvas_height)
+        for start in range(0, len(sequence), chunk_frames):
+            chunk = sequence.keypoints[start:start + chunk_frames]
+            offset = 0
+            for (_, count), (_, part_start, part_stop) in zip(DEFAULT_KEYPOINT_LAYOUT, sequence.parts):
+                joints = min(part_stop - part_start, count)
+                self.add_keypoints(chunk[:, :, part_start:part_start + joints], sequence.canvas_width,
+                                   sequence.canvas_height, offset)
+                offset += count
+            self.frames += len(chunk)
+
+    def merge(self, other):
+        """
+        Adds the counts of another heatmap with the same bins, e.g. one built by a worker process.
+
+        Returns:
+            JointHeatmap: This heatmap.
+        """
+        if (other.bins_x, other.bins_y) != (self.bins_x, self.bins_y):
+            raise ValueError(f"Cannot merge a {other.bins_x}x{other.bins_y} heatmap into a {self.bins_x}x{self.bins_y} one")
+        self.__counts += other.counts
+        self.frames += other.frames
+        self.__adopt_canvas(other.canvas_width, other.canvas_height)
+        return self
+
+    def density(self, joints=None):
+        """
+        Returns the summed counts of the given joints (flat indices, see joint_indices) as a
+        (rows, columns) array. Defaults to all joints.
+        """
+        if joints is None:
+            return self.counts.sum(axis=0)
+        return self.counts[list(joints)].sum(axis=0)
+
+    def to_svg(self, joints=None):
+        """
+        Renders the density of the given joints as an SVG document on a black background.
+        Neighbouring cells of the same colour are joined into one rectangle.
+        """
+        density = self.density(joints)
+        levels = self.__levels(density)
+        colors = ['#{:02x}{:02x}{:02x}'.format(*color) for color in _level_colors()]
+        width, height = self.__canvas()
+        cell_width = width / self.bins_x
+        cell_height = height / self.bins_y
+
+        parts = [
+            f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">\n',
+            f'\t<title>Density of {int(density.sum())} keypoints from {self.frames} frames</title>\n',
+            f'\t<g id="background">\n\t\t<rect width="{width}" height="{height}" fill="black" />\n\t</g>\n',
+            '\t<g id="heatmap" shape-rendering="crispEdges">\n',
+        ]
+        for row in range(self.bins_y):
+            row_levels = levels[row]
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(row_levels)) + 1))
+            stops = np.append(starts[1:], self.bins_x)
+            for start, stop in zip(starts, stops):
+                level = row_levels[start]
+                if level:
+                    parts.append(f'\t\t<rect x="{start * cell_width:.2f}" y="{row * cell_height:.2f}" '
+                                 f'width="{(stop - start) * cell_width:.2f}" height="{cell_height:.2f}" '
+                                 f'fill="{colors[level - 1]}" />\n')
+        parts.append('\t</g>\n</svg>')
+        return "".join(parts)
+
+    def to_png(self, joints=None, cell_size=None):
+        """
+        Renders the density of the given joints as PNG bytes on a black background.
+
+        Args:
+            cell_size: Pixels per cell. Defaults to roughly the heatmap canvas size.
+        """
+        levels = self.__levels(self.density(joints))
+        if cell_size is None:
+            width, _ = self.__canvas()
+            cell_size = max(1, round(width / self.bins_x))
+
+        palette = np.vstack([[0, 0, 0], _level_colors()]).astype(np.uint8)
+        pixels = palette[levels].repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        return encode_png(pixels)
+
+    def __levels(self, density):
+        # Logarithmic scale, so sparse areas stay visible next to hot spots; 0 marks empty cells
+        maximum = density.max()
+        if maximum == 0:
+            return np.zeros(density.shape, dtype=np.int64)
+        scaled = np.log1p(density) / np.log1p(maximum)
+        return np.ceil(scaled * HEATMAP_LEVELS).astype(np.int64)
+
+    def __canvas(self):
+        return self.canvas_width or DEFAULT_CANVAS_WIDTH, self.canvas_height or DEFAULT_CANVAS_HEIGHT
+
+    def __adopt_canvas(self, canvas_width, canvas_height):
+        if self.canvas_width is None and self.canvas_height is None:
+            self.canvas_width = canvas_width
+            self.canvas_height = canvas_height
+
+    def __flush(self):
+        if not self.__pending:
+            return
+        flat_index = np.concatenate(self.__pending)
+        self.__counts += np.bincount(flat_index, minlength=self.__counts.size).reshape(self.__counts.shape)
+        self.__pending = []
+        self.__pending_size = 0
+
+
+def joint_indices(selector):
+    """
+    Resolves a joint selector to flat joint indices of the default layout.
+
+    Accepted are body joint names ("left_wrist"), group names ("pose", "face",
+    "hand_left", "hand_right"), a joint of a group ("hand_left:8") and "all".
+    """
+    offsets = {}
+    offset = 0
+    for group, (_, count) in zip(GROUP_NAMES, DEFAULT_KEYPOINT_LAYOUT):
+        offsets[group] = (offset, count)
+        offset += count
+
+    if selector == "all":
+        return list(range(offset))
+    if selector in POSE_JOINT_NAMES:
+        return [POSE_JOINT_NAMES.index(selector)]
+    group, _, index = selector.partition(":")
+    if group not in offsets:
+        raise ValueError(f"Unknown joint selector '{selector}'")
+    start, count = offsets[group]
+    if not index:
+        return list(range(start, start + count))
+    if not index.isdigit() or int(index) >= count:
+        raise ValueError(f"Group '{group}' has joints 0 to {count - 1}, got '{index}'")
+    return [start + int(index)]
+
+
+def encode_png(pixels):
+    """
+    Encodes an (height, width, 3) uint8 RGB array as PNG bytes, using only zlib.
+    """
+    height, width, _ = pixels.shape
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    # Every row starts with filter type 0 (none)
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, width * 3)], axis=1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+            + chunk(b"IEND", b""))
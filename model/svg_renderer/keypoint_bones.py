@@ -0,0 +1,25 @@
+from .pose_bone_colors import POSE_BONE_COLORS
+from .hand_bone_indices import HAND_BONE_INDICES
+
+
+def build_keypoint_bones(bones):
+    """
+    Builds the reverse index of a bone list: keypoint index -> positions of the bones
+    that end in this keypoint, in drawing order.
+    """
+    index = {}
+    for position, (idx1, idx2) in enumerate(bones):
+        index.setdefault(idx1, []).append(position)
+        if idx2 != idx1:
+            index.setdefault(idx2, []).append(position)
+    return {keypoint: tuple(positions) for keypoint, positions in index.items()}
+
+
+# Pose keypoint -> the (idx1, idx2) keys of POSE_BONE_COLORS attached to it
+POSE_KEYPOINT_BONES = {
+    keypoint: tuple(list(POSE_BONE_COLORS)[position] for position in positions)
+    for keypoint, positions in build_keypoint_bones(list(POSE_BONE_COLORS)).items()
+}
+
+# Hand keypoint -> the indices into HAND_BONE_INDICES of the lines attached to it
+HAND_KEYPOINT_BONES = build_keypoint_bones(HAND_BONE_INDICES)
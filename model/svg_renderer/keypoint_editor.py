@@ -0,0 +1,194 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .delta_renderer import FrameDelta
+from .keypoints import KeyPoint
+from .pose_bone_colors import POSE_BONE_COLORS
+from .renderer import PoseRenderer, element_prefix, parse_keypoints
+
+# Keys of the keypoint sets in the order of the parts of FrameGeometry.people
+PART_KEYS = ('pose_keypoints_2d', 'face_keypoints_2d', 'hand_left_keypoints_2d', 'hand_right_keypoints_2d')
+POSE_BONE_ORDER = {bone: position for position, bone in enumerate(POSE_BONE_COLORS)}
+
+
+class KeypointRef(NamedTuple):
+    """
+    Addresses one keypoint of a rendered person.
+    """
+    position: int   # Position of the person in FrameGeometry.people
+    part: int       # 0 pose, 1 face, 2 left hand, 3 right hand
+    index: int      # Keypoint within the part
+
+
+class KeypointEditor:
+    """
+    Moves single keypoints of a StyledFrame, e.g. to fix a mis-detected joint before export.
+
+    A move writes the new coordinates back into the pose data of the frame and computes only
+    the elements attached to the keypoint, found in the reverse index from keypoints to bones
+    (see keypoint_bones.py). Those elements are patched into the frame's geometry and markup,
+    so neither the cost of a move nor the cost of the next render() grows with the number
+    of people in the frame beyond joining the cached markup.
+    """
+
+    def __init__(self, styled_frame):
+        self.frame = styled_frame
+        self.pose_data = styled_frame.pose_json_data[0]
+        self.__keypoints = {}   # (position, part) -> parsed keypoints, parsed when first needed
+        self.__points = None    # (n, 2) canvas coordinates of the drawable keypoints, built for the first hit test
+        self.__refs = None      # KeypointRef of every row in __points
+        self.__rows = None      # KeypointRef -> row in __points
+        self.__renderer = None
+
+    def hit_test(self, x, y, radius):
+        """
+        Finds the drawable keypoint nearest to (x, y).
+
+        Args:
+            x, y: Canvas coordinates.
+            radius: Largest distance to a keypoint that still hits it, in canvas pixels.
+
+        Returns:
+            KeypointRef or None: The keypoint, None if there is none within the radius.
+        """
+        if self.__points is None:
+            self.__build_points()
+        if not len(self.__points):
+            return None
+
+        distances = np.hypot(self.__points[:, 0] - x, self.__points[:, 1] - y)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > radius:
+            return None
+        return self.__refs[nearest]
+
+    def keypoint_position(self, ref):
+        """
+        Returns the (x, y) canvas coordinates a keypoint is drawn at.
+        """
+        kp = self.__parsed(ref.position, ref.part)[ref.index]
+        return self.__to_canvas(kp[0], kp[1])
+
+    def move_keypoint(self, ref, x, y):
+        """
+        Moves a keypoint, writes it back into the pose data and redraws the attached elements.
+        Coordinates are clamped to the canvas. Keypoints stored normalised stay normalised.
+
+        Args:
+            ref: The KeypointRef to move.
+            x, y: The new position in canvas coordinates.
+
+        Returns:
+            FrameDelta: The markup (with ids) of the attached elements that are drawn, and
+            the ids of the attached elements that are no longer drawn.
+        """
+        canvas = self.frame.geometry.canvas
+        x = min(max(x, 0), canvas.width)
+        y = min(max(y, 0), canvas.height)
+
+        person = self.__person(ref.position)
+        values = person.get(PART_KEYS[ref.part])
+        if not isinstance(values, list):
+            values = person[PART_KEYS[ref.part]] = list(values)
+        base = ref.index * 3
+        if 0.0 <= values[base] <= 1.0 and 0.0 <= values[base + 1] <= 1.0:
+            stored_x, stored_y = x / canvas.width, y / canvas.height
+        else:
+            stored_x, stored_y = x, y
+        values[base], values[base + 1] = stored_x, stored_y
+
+        keypoints = self.__parsed(ref.position, ref.part)
+        keypoints[ref.index] = KeyPoint(stored_x, stored_y, keypoints[ref.index][2])
+        if self.__rows is not None and ref in self.__rows:
+            self.__points[self.__rows[ref]] = (x, y)
+
+        renderer = self.__current_renderer()
+        attached = self.__attached(ref)
+        old_elements = self.frame.geometry.people[ref.position][ref.part]
+        old_ids = {element.element_id for element in old_elements}
+        replaced = dict(attached)
+        elements = [element for element in old_elements if element.element_id not in replaced]
+        elements.extend(element for element in replaced.values() if element is not None)
+        elements.sort(key=self.__order_key)
+        self.frame.update_part(ref.position, ref.part, elements)
+
+        changed = {element_id: renderer.draw_element(element) for element_id, element in attached if element is not None}
+        removed = [element_id for element_id, element in attached if element is None and element_id in old_ids]
+        return FrameDelta(changed, removed)
+
+    def render_detached(self, ref):
+        """
+        Renders the frame without the elements attached to a keypoint, i.e. everything that
+        stays put while the keypoint is dragged.
+        """
+        attached_ids = {element_id for element_id, _ in self.__attached(ref)}
+        old_elements = self.frame.geometry.people[ref.position][ref.part]
+        self.frame.update_part(ref.position, ref.part, [
+            element for element in old_elements if element.element_id not in attached_ids
+        ])
+        try:
+            return self.frame.render()
+        finally:
+            self.frame.update_part(ref.position, ref.part, old_elements)
+
+    def render_attached(self, ref):
+        """
+        Renders only the elements attached to a keypoint, in a document of the same size and
+        region as the frame and without a background, to be drawn over render_detached().
+        """
+        renderer = self.__current_renderer()
+        geometry = self.frame.geometry
+        markup = "".join(renderer.draw_element(element, with_id=False) for _, element in self.__attached(ref) if element is not None)
+        return f'{renderer.header(geometry.canvas, geometry.view_box)}\n\t{markup}\n</svg>'
+
+    def __attached(self, ref):
+        return self.__current_renderer().keypoint_elements(
+            self.__parsed(ref.position, ref.part), self.frame.geometry.canvas, ref.part, ref.index,
+            element_prefix(self.frame.geometry.indices[ref.position])
+        )
+
+    def __current_renderer(self):
+        # Markup is formatted in the style the frame was rendered in last
+        if self.__renderer is None or self.__renderer.config.style != self.frame.style:
+            self.__renderer = PoseRenderer(self.frame.config._replace(style=self.frame.style))
+        return self.__renderer
+
+    def __person(self, position):
+        return self.pose_data['people'][self.frame.geometry.indices[position]]
+
+    def __parsed(self, position, part):
+        keypoints = self.__keypoints.get((position, part))
+        if keypoints is None:
+            keypoints = parse_keypoints(self.__person(position).get(PART_KEYS[part], []))
+            self.__keypoints[(position, part)] = keypoints
+        return keypoints
+
+    def __to_canvas(self, x, y):
+        # Single keypoints are scaled like face keypoints by the renderer
+        canvas = self.frame.geometry.canvas
+        if 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0:
+            return x * canvas.width, y * canvas.height
+        return x, y
+
+    def __build_points(self):
+        """
+        Collects the canvas coordinates of all drawable keypoints of the rendered people.
+        """
+        points = []
+        self.__refs = []
+        for position in range(len(self.frame.geometry.people)):
+            for part in range(len(PART_KEYS)):
+                for index, kp in enumerate(self.__parsed(position, part)):
+                    if kp[2] > 0 and kp[0] >= 0 and kp[1] >= 0:
+                        points.append(self.__to_canvas(kp[0], kp[1]))
+                        self.__refs.append(KeypointRef(position, part, index))
+        self.__points = np.array(points, dtype=float).reshape(-1, 2)
+        self.__rows = {ref: row for row, ref in enumerate(self.__refs)}
+
+    def __order_key(self, element):
+        if element.kind == "pose_bone":
+            return POSE_BONE_ORDER[element.detail]
+        if element.kind == "face":
+            return int(element.element_id.rpartition('_')[2])
+        return element.detail[0]
@@ -1,16 +1,13 @@
-class KeyPoint:
+from typing import NamedTuple
+
+class KeyPoint(NamedTuple):
     """
     Represents a single pose keypoint with coordinates and a probability score.
+    Being a tuple, it can be used interchangeably with plain (x, y, score) rows.
     """
-    def __init__(self, x: float, y: float, score: float):
-        self.x = x
-        self.y = y
-        self.score = score
-
-    def __iter__(self):
-        yield self.x
-        yield self.y
-        yield self.score
+    x: float
+    y: float
+    score: float
 
     def __repr__(self):
         return f"KeyPoint(x={self.x}, y={self.y}, s={self.score})"
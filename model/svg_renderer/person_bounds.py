@@ -0,0 +1,34 @@
+import numpy as np
+
+
+def padded_bounds(bounds, margin):
+    """
+    Grows (x, y, width, height) boxes, one row per person, by the margin on every side.
+    NaN rows (people without drawable keypoints) stay NaN.
+    """
+    return bounds + np.array([-margin, -margin, 2 * margin, 2 * margin])
+
+
+def indices_in_region(bounds, region):
+    """
+    Returns the positions of the boxes that intersect the region in ascending order, from
+    one vectorised comparison over all boxes. NaN rows never intersect.
+    Boxes are rows of (x, y, width, height), the region is an (x, y, width, height) tuple.
+    """
+    x, y, width, height = region
+    inside = ((bounds[:, 0] <= x + width) & (x <= bounds[:, 0] + bounds[:, 2]) &
+              (bounds[:, 1] <= y + height) & (y <= bounds[:, 1] + bounds[:, 3]))
+    return np.flatnonzero(inside).tolist()
+
+
+def union_bounds(bounds):
+    """
+    Returns the smallest box containing all given boxes (NaN rows are ignored) as a
+    tuple, or None if there is none.
+    """
+    boxes = bounds[~np.isnan(bounds[:, 0])]
+    if not len(boxes):
+        return None
+    left, top = boxes[:, 0].min(), boxes[:, 1].min()
+    right, bottom = (boxes[:, 0] + boxes[:, 2]).max(), (boxes[:, 1] + boxes[:, 3]).max()
+    return tuple(float(value) for value in (left, top, right - left, bottom - top))
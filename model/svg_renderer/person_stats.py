@@ -0,0 +1,187 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .hand_bone_indices import HAND_BONE_INDICES
+from .pose_bone_colors import POSE_BONE_COLORS
+
+
+# The keypoint sets of a person in the OpenPose JSON format; the first one is the body
+KEYPOINT_KEYS = ('pose_keypoints_2d', 'face_keypoints_2d', 'hand_left_keypoints_2d', 'hand_right_keypoints_2d')
+
+# The bones the renderer draws, as (n, 2) arrays of keypoint indices in drawing order
+POSE_BONES = np.array(list(POSE_BONE_COLORS), dtype=np.intp)
+HAND_BONES = np.array(HAND_BONE_INDICES, dtype=np.intp)
+
+
+class PersonStats(NamedTuple):
+    """
+    Summary statistics of all people in a frame, one entry per person.
+    Only drawable keypoints count: score > 0 and non-negative coordinates.
+    The scores and joint counts only look at the body joints. The bounds cover what the
+    renderer draws: the end points of the pose and hand bones and the face points.
+    """
+    mean_score: np.ndarray    # Mean score of the drawable body joints, 0 if there are none
+    valid_joints: np.ndarray  # Number of drawable body joints
+    bounds: np.ndarray        # (x, y, width, height) of everything drawn in canvas pixels, NaN if nothing is
+    drawable: np.ndarray      # Whether a person has any drawable keypoint
+
+    @property
+    def total_score(self):
+        return self.mean_score * self.valid_joints
+
+    @property
+    def bbox_area(self):
+        return np.nan_to_num(self.bounds[:, 2] * self.bounds[:, 3])
+
+
+def keypoint_rows(keypoint_array):
+    """
+    Converts a flat JSON keypoint list or an (n, 3) array into an (n, 3) float array.
+    Trailing values that do not form a full keypoint are ignored, as in the renderer.
+    """
+    if keypoint_array is None:
+        return np.zeros((0, 3))
+    values = np.asarray(keypoint_array, dtype=np.float64).reshape(-1)
+    usable = len(values) - len(values) % 3
+    return values[:usable].reshape(-1, 3)
+
+
+def padded_rows(keypoints, count):
+    """
+    Returns the first count rows of (..., n, 3) keypoints, filled up with rows of score 0,
+    which are never drawn. Used to look up bones by index without bounds checks.
+    """
+    rows = np.zeros(keypoints.shape[:-2] + (count, 3))
+    usable = min(keypoints.shape[-2], count)
+    rows[..., :usable, :] = keypoints[..., :usable, :]
+    return rows
+
+
+def drawable_mask(keypoints):
+    """
+    Whether the renderer draws each of (..., 3) keypoints: score > 0 and non-negative coordinates.
+    """
+    return (keypoints[..., 2] > 0) & (keypoints[..., 0] >= 0) & (keypoints[..., 1] >= 0)
+
+
+def scaled_points(keypoints, canvas_width, canvas_height):
+    """
+    Returns the (..., 2) canvas positions of drawable keypoints by the renderer's rule for
+    face points and hand lines: a keypoint whose coordinates are both within [0, 1] is
+    normalised and scaled to the canvas on its own.
+    """
+    xy = keypoints[..., :2]
+    normalised = ((xy >= 0) & (xy <= 1.0)).all(axis=-1, keepdims=True)
+    return np.where(normalised, xy * (canvas_width, canvas_height), xy)
+
+
+def pose_bone_segments(body, canvas_width, canvas_height):
+    """
+    Returns the pose bones the renderer draws for (..., n, 3) body keypoints, one per row of
+    POSE_BONES, as (drawn, segments): whether each bone is drawn and its (..., 4) end points
+    (x1, y1, x2, y2) in canvas pixels.
+
+    Like the renderer, the end points of a bone are scaled to the canvas together, and only
+    if all four coordinates are normalised. The same keypoint can therefore end up at
+    different positions in two bones. Bones shorter than 0.001 pixels are not drawn.
+    """
+    body = padded_rows(body, int(POSE_BONES.max()) + 1)
+    start, end = body[..., POSE_BONES[:, 0], :], body[..., POSE_BONES[:, 1], :]
+    drawn = drawable_mask(start) & drawable_mask(end)
+    segments = np.concatenate([start[..., :2], end[..., :2]], axis=-1)
+    normalised = ((segments >= 0) & (segments <= 1.0)).all(axis=-1, keepdims=True)
+    segments = np.where(normalised, segments * (canvas_width, canvas_height, canvas_width, canvas_height), segments)
+    drawn &= np.hypot(segments[..., 2] - segments[..., 0], segments[..., 3] - segments[..., 1]) >= 0.001
+    return drawn, segments
+
+
+def compute_person_stats(people, canvas_width, canvas_height):
+    """
+    Computes PersonStats straight from the keypoint arrays of the people, before any
+    keypoint is parsed, with vectorised passes over all their keypoints.
+
+    Args:
+        people: The person entries of a frame as in the OpenPose JSON format, e.g. pose_data['people'].
+        canvas_width, canvas_height: Used to scale normalised coordinates like the renderer does.
+    """
+    groups = [[keypoint_rows(person.get(key)) for key in KEYPOINT_KEYS] for person in people]
+    rows = [part for person in groups for part in person]
+    counts = np.array([len(part) for part in rows], dtype=np.int64)
+    keypoints = np.concatenate(rows) if rows else np.zeros((0, 3))
+    # The person and whether it is a body joint, for every row
+    owner = np.repeat(np.repeat(np.arange(len(people)), len(KEYPOINT_KEYS)), counts)
+    body = np.repeat(np.tile(np.arange(len(KEYPOINT_KEYS)) == 0, len(people)), counts)
+
+    scores = keypoints[:, 2]
+    valid = drawable_mask(keypoints)
+    valid_body = valid & body
+    valid_joints = np.bincount(owner[valid_body], minlength=len(people))
+    score_sums = np.bincount(owner[valid_body], weights=scores[valid_body], minlength=len(people))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_score = np.where(valid_joints > 0, score_sums / valid_joints, 0.0)
+    drawable = np.bincount(owner[valid], minlength=len(people)) > 0
+
+    return PersonStats(mean_score, valid_joints, _drawn_bounds(groups, canvas_width, canvas_height), drawable)
+
+
+def _drawn_bounds(groups, canvas_width, canvas_height):
+    """
+    Returns the (people, 4) bounds of what the renderer draws from the keypoint groups of
+    every person, with every element scaled by the renderer's rule for it.
+    """
+    bounds = np.full((len(groups), 4), np.nan)
+    if not groups:
+        return bounds
+
+    # Pose bones, whose end points are scaled together
+    bodies = np.stack([padded_rows(person[0], int(POSE_BONES.max()) + 1) for person in groups])
+    drawn, segments = pose_bone_segments(bodies, canvas_width, canvas_height)
+    points = [segments.reshape(len(groups), -1, 2)]
+    masks = [np.repeat(drawn, 2, axis=-1)]
+
+    # Face points and hand bone end points, which are scaled one by one
+    face_count = max(len(person[1]) for person in groups)
+    faces = np.stack([padded_rows(person[1], face_count) for person in groups])
+    points.append(scaled_points(faces, canvas_width, canvas_height))
+    masks.append(drawable_mask(faces))
+    for group in (2, 3):
+        hands = np.stack([padded_rows(person[group], int(HAND_BONES.max()) + 1) for person in groups])
+        start, end = hands[:, HAND_BONES[:, 0]], hands[:, HAND_BONES[:, 1]]
+        drawn = drawable_mask(start) & drawable_mask(end)
+        points += [scaled_points(start, canvas_width, canvas_height), scaled_points(end, canvas_width, canvas_height)]
+        masks += [drawn, drawn]
+
+    points = np.concatenate(points, axis=1)
+    masks = np.concatenate(masks, axis=1)
+    x, y = points[..., 0], points[..., 1]
+    left = np.where(masks, x, np.inf).min(axis=1)
+    top = np.where(masks, y, np.inf).min(axis=1)
+    right = np.where(masks, x, -np.inf).max(axis=1)
+    bottom = np.where(masks, y, -np.inf).max(axis=1)
+
+    drawn_any = masks.any(axis=1)
+    bounds[drawn_any] = np.stack([left, top, right - left, bottom - top], axis=1)[drawn_any]
+    return bounds
+
+
+def select_people(stats, min_mean_score=None, min_valid_joints=None, min_bbox_area=None, top_k=None):
+    """
+    Returns the indices of the people passing the quality thresholds in ascending order.
+    People without any drawable keypoint are never kept.
+    With top_k, only the k people with the highest total score (mean score x valid joints) are kept.
+    """
+    keep = stats.drawable
+    if min_mean_score is not None:
+        keep &= stats.mean_score >= min_mean_score
+    if min_valid_joints is not None:
+        keep &= stats.valid_joints >= min_valid_joints
+    if min_bbox_area is not None:
+        keep &= stats.bbox_area >= min_bbox_area
+
+    indices = np.flatnonzero(keep)
+    if top_k is not None and len(indices) > top_k:
+        # Stable sort keeps the earlier person on equal scores
+        order = np.argsort(-stats.total_score[indices], kind='stable')
+        indices = np.sort(indices[order[:top_k]])
+    return indices.tolist()
@@ -0,0 +1,77 @@
+from typing import Iterator, NamedTuple, Optional
+
+class RenderStyle(NamedTuple):
+    """
+    How the elements are painted. The defaults give the classic OpenPose2SVG look.
+    Only the bone loops, face circles and hand lines depend on the geometry of a frame;
+    the style is applied when the markup is formatted (see StyledFrame).
+    """
+    bone_alpha: float = 0.6             # Fill opacity of the bone loops and their keypoint markers
+    bone_handle_offset: float = 10      # Length of the Bezier handles, i.e. half the width of a bone loop
+    pose_marker_size: float = 20        # Size of the box around the pose keypoint markers
+    pose_marker_radius: float = 9       # Radius of the pose keypoint markers
+    hand_marker_size: float = 5         # Size of the box around the hand keypoint markers
+    hand_marker_radius: float = 2       # Radius of the hand keypoint markers
+    hand_bone_width: float = 2          # Stroke width of the hand lines
+    face_radius: float = 2              # Radius of the face keypoint circles
+    face_color: str = "#ffffff"
+    hand_color: str = "#0000ff"         # Fill of the hand keypoint markers
+    background: str = "black"
+
+    def part_keys(self):
+        """
+        The fields that shape the markup of the pose bones, the face circles, the left and
+        the right hand lines, in that order (see FrameGeometry.people). A part whose key is
+        unchanged draws the same markup up to its paint, the bone alpha or the face colour,
+        which is replaced in the formatted markup (see PoseRenderer.part_paint). All other
+        fields only affect the <defs> section and the background.
+        """
+        hand = (self.hand_bone_width,)
+        return ((self.bone_handle_offset,), (self.face_radius,), hand, hand)
+
+    def extent(self):
+        """
+        How far bone loops and keypoint markers reach beyond the keypoint coordinates.
+        """
+        return max(self.bone_handle_offset, self.pose_marker_size / 2, self.hand_marker_size / 2, self.face_radius)
+
+
+class RenderConfig(NamedTuple):
+    """
+    Render options that apply to every frame. Being immutable, one configuration
+    (and one PoseRenderer built from it) can be shared by any number of threads.
+    """
+    roi: Optional[tuple] = None             # (x, y, width, height) in canvas pixels; only people intersecting it are rendered
+    tight_crop: bool = False                # Use the smallest region containing all people as the roi
+    min_mean_score: Optional[float] = None  # Skip people whose drawable body joints have a lower mean score
+    min_valid_joints: Optional[int] = None  # Skip people with fewer drawable body joints
+    top_k: Optional[int] = None             # Render at most this many people, those with the highest total score
+    style: RenderStyle = RenderStyle()      # Colours and sizes of the drawn elements
+
+
+class Canvas(NamedTuple):
+    """
+    Size of the frame being rendered. Passed along instead of being stored on the renderer.
+    """
+    width: float
+    height: float
+
+
+class RenderedFrame(NamedTuple):
+    """
+    A frame rendered without the document around it, see PoseRenderer.render_frame.
+    """
+    canvas: Canvas
+    view_box: Optional[tuple]   # (x, y, width, height) to show, None for the whole canvas
+    fragments: Iterator[str]    # Background and people, formatted while they are consumed
+
+
+class FrameGeometry(NamedTuple):
+    """
+    The geometry of a frame after parsing and selecting its people, without any markup.
+    See PoseRenderer.frame_geometry.
+    """
+    canvas: Canvas
+    view_box: Optional[tuple]   # (x, y, width, height) to show, None for the whole canvas
+    people: tuple               # Per rendered person: (pose, face, hand_left, hand_right) tuples of SVGElement
+    indices: tuple              # Per rendered person: its index in the 'people' list of the pose data
@@ -1,185 +1,495 @@
 import math
 import colorsys
+import logging
 DEFAULT_CANVAS_WIDTH = 400
 DEFAULT_CANVAS_HEIGHT = 400
 DEFAULT_COLOR = "#cccccc"
-FACE_KEYPOINT_COLOR = "#ffffff"
-HAND_KEYPOINT_COLOR = "#0000ff"
-POSE_BONE_ALPHA_VALUE = "0.6"
 
 from .keypoints import KeyPoint
+from .elements import SVGElement
 from .pose_keypoint_colors import POSE_KEYPOINT_COLORS
 from .pose_bone_colors import POSE_BONE_COLORS
 from .hand_bone_indices import HAND_BONE_INDICES
+from .keypoint_bones import POSE_KEYPOINT_BONES, HAND_KEYPOINT_BONES
+from .render_config import RenderConfig, Canvas, RenderedFrame, FrameGeometry
 
-class SVGRenderer:
+# Per-frame diagnostics, off unless debug logging is enabled. Rendering runs on thread and
+# process pools, so it must not write to the standard output
+logger = logging.getLogger(__name__)
+
+def canvas_of(pose_data):
+    """
+    Returns the Canvas of one pose data entry, falling back to the default size.
+    """
+    return Canvas(
+        pose_data.get('canvas_width', DEFAULT_CANVAS_WIDTH),
+        pose_data.get('canvas_height', DEFAULT_CANVAS_HEIGHT),
+    )
+
+
+def element_prefix(person_index):
     """
-    Class to render OpenPose JSON data into SVG format.
+    Returns the prefix of the element ids of a person, see SVGElement.
+    """
+    return f"person{person_index}_"
+
+
+def format_number(value):
+    """
+    Formats a style value for an attribute: 10 and 10.0 both become "10", 0.6 stays "0.6".
+    """
+    return f"{value:g}"
+
+
+def parse_keypoints(keypoint_array):
+    """
+    Groups a flat array of numbers into KeyPoint objects.
+    Each keypoint is represented by 3 consecutive values: x, y, probability.
+    The rest of the renderer only indexes or unpacks keypoints, so any (x, y, score) sequence works.
+    """
+    if keypoint_array is None:
+        return []
+
+    # (n, 3) arrays from the array input path already hold one (x, y, score) row per keypoint
+    if getattr(keypoint_array, 'ndim', 1) == 2:
+        return keypoint_array.tolist()
+        
+    keypoints = []
+    for i in range(0, len(keypoint_array), 3):
+        if i + 2 < len(keypoint_array):
+            keypoints.append(KeyPoint(
+                x=keypoint_array[i],
+                y=keypoint_array[i+1],
+                score=keypoint_array[i+2]
+            ))
+    return keypoints
+
+
+class PoseRenderer:
+    """
+    Renders OpenPose JSON data into SVG format.
     The OpenPose format consists of a list of pose data entries at the top level.
-    This renderer uses the first entry from the list for the entire rendering process.
+    The first entry of the list given to a render call is rendered.
+
+    The renderer only holds its immutable RenderConfig. Everything that belongs to a
+    frame, like the canvas size, is passed along as arguments, so a single instance can
+    render any number of frames, also from several threads at the same time.
+    Colours and sizes come from the RenderStyle of the configuration.
     """
-    
-    def __init__(self, pose_json_data):
-        """
-        Initializes the renderer with OpenPose JSON data.
-        Validates the data and extracts the first entry for rendering.
-        """
-        if not pose_json_data:
-            raise Exception("No pose data found")
-        self.pose_json_data = pose_json_data
-        self.pose_data = pose_json_data[0]
-        self.__extract_canvas_size()
+    __slots__ = ('config', '__style_text')
 
+    def __init__(self, config=None):
+        """
+        Args:
+            config: The RenderConfig to apply to every frame. Defaults to rendering everybody
+                on the full canvas.
+        """
+        object.__setattr__(self, 'config', config or RenderConfig())
+        # The style values drawn into every element, formatted once
+        style = self.config.style
+        object.__setattr__(self, '_PoseRenderer__style_text', {
+            field: format_number(getattr(style, field)) for field in ('bone_alpha', 'face_radius', 'hand_bone_width')
+        })
 
-    def render(self):
+    def __setattr__(self, name, value):
+        raise AttributeError("PoseRenderer is immutable, create a new one with another RenderConfig")
+
+    def render(self, pose_json_data):
         """
-        Renders the stored pose data into an SVG string.
+        Renders the first entry of the pose data into an SVG string.
         
         Returns:
             str: The rendered SVG as a string.
         """
-        header = self.__generate_svg_header()
-        background = self.__generate_background()
+        return "".join(self.iter_render(pose_json_data))
+
+    def render_bytes(self, pose_json_data):
+        """
+        Renders the first entry of the pose data into UTF-8 encoded SVG.
+        Every fragment is encoded once, directly into the returned buffer, so no
+        intermediate full-size string is built.
         
-        people_svg_content = []
-        for person in self.pose_data.get('people', []):
-            # Parse different keypoint sets
-            pose_keypoints = self.__parse_keypoints(person.get('pose_keypoints_2d', []))
-            face_keypoints = self.__parse_keypoints(person.get('face_keypoints_2d', []))
-            left_hand_keypoints = self.__parse_keypoints(person.get('hand_left_keypoints_2d', []))
-            right_hand_keypoints = self.__parse_keypoints(person.get('hand_right_keypoints_2d', []))
-
-            print(f"Pose Keypoints: {len(pose_keypoints)}")
-            print(f"Face Keypoints: {len(face_keypoints)}")
-            print(f"Left Hand Keypoints: {len(left_hand_keypoints)}")
-            print(f"Right Hand Keypoints: {len(right_hand_keypoints)}")
-            
-            # Render each set
-            people_svg_content.append(self.__render_pose(pose_keypoints))
-            people_svg_content.append(self.__render_face(face_keypoints))
-            people_svg_content.append(self.__render_hand_left(left_hand_keypoints))
-            people_svg_content.append(self.__render_hand_right(right_hand_keypoints))
-            
-        footer = self.__generate_svg_footer()
+        Returns:
+            bytearray: The rendered SVG as UTF-8 bytes.
+        """
+        buffer = bytearray()
+        for fragment in self.iter_render(pose_json_data):
+            buffer += fragment.encode('utf-8')
+        return buffer
+
+    def iter_render(self, pose_json_data, element_ids=False):
+        """
+        Renders the first entry of the pose data as a sequence of SVG fragments.
+        Joining the fragments gives the same document as render(); consumers that write
+        to a stream can take them one by one instead of building the full string first.
+
+        Args:
+            pose_json_data: The parsed OpenPose JSON data.
+            element_ids: Give every bone, circle and line the id of its SVGElement,
+                so later updates can address it.
         
-        return header + background + "".join(people_svg_content) + footer
+        Yields:
+            str: The next fragment of the SVG document.
+        """
+        frame = self.render_frame(pose_json_data, element_ids)
+        yield self.header(frame.canvas, frame.view_box)
+        yield from frame.fragments
+        yield self.__generate_svg_footer()
+
+    def render_frame(self, pose_json_data, element_ids=False, background=True):
+        """
+        Renders the first entry of the pose data without the document around it, for
+        composing several frames into one document (see ContactSheetRenderer).
+        The people are selected right away, the fragments are only formatted while they are consumed.
 
-    def __parse_keypoints(self, keypoint_array):
+        Args:
+            background: Start with the black background rectangle covering the canvas.
+
+        Returns:
+            RenderedFrame: The canvas, the region to show and the fragments of the frame.
         """
-        Groups a flat array of numbers into KeyPoint objects.
-        Each keypoint is represented by 3 consecutive values: x, y, probability.
+        pose_data, canvas = self.__open_frame(pose_json_data)
+        people = pose_data.get('people', [])
+        view_box, visible_indices = self.__select_people(people, canvas)
+        fragments = self.__iter_frame_content(people, visible_indices, canvas, element_ids, background)
+        return RenderedFrame(canvas, view_box, fragments)
+
+    def frame_geometry(self, pose_json_data):
         """
-        if keypoint_array is None:
-            return []
-            
-        keypoints = []
-        for i in range(0, len(keypoint_array), 3):
-            if i + 2 < len(keypoint_array):
-                keypoints.append(KeyPoint(
-                    x=keypoint_array[i],
-                    y=keypoint_array[i+1],
-                    score=keypoint_array[i+2]
-                ))
-        return keypoints
+        Parses the first entry of the pose data, selects its people and computes the geometry
+        of all their elements, without formatting any markup. The result does not depend on
+        the colours of the style and can be drawn again and again, see draw_people().
+
+        Returns:
+            FrameGeometry: The canvas, the region to show and the elements of every rendered person.
+        """
+        pose_data, canvas = self.__open_frame(pose_json_data)
+        people = pose_data.get('people', [])
+        view_box, visible_indices = self.__select_people(people, canvas)
+        return FrameGeometry(canvas, view_box, tuple(
+            self.__person_geometry(self.__parse_person(people[person_index]), canvas, person_index)
+            for person_index in visible_indices
+        ), tuple(visible_indices))
 
-    def __render_pose(self, keypoints):
+    def keypoint_elements(self, keypoints, canvas, part, keypoint_index, prefix=""):
         """
-        Renders the pose body keypoints and connections (bones).
+        Computes the geometry of only those elements of a person's part that are attached to
+        one keypoint, looked up in the reverse index from keypoints to bones. Used to redraw
+        the bones around a keypoint that was moved.
+
+        Args:
+            keypoints: The parsed keypoints of the part, see parse_keypoints().
+            part: 0 pose, 1 face, 2 left hand, 3 right hand, as in FrameGeometry.people.
+            keypoint_index: The keypoint within the part.
+            prefix: The element id prefix of the person.
+
+        Returns:
+            list of (element_id, SVGElement or None): Every element that can be attached to the
+            keypoint, in drawing order. None for elements that are not drawn with these keypoints.
+        """
+        if part == 0:
+            elements = []
+            for idx1, idx2 in POSE_KEYPOINT_BONES.get(keypoint_index, ()):
+                geometry = self.__pose_bone_geometry(keypoints, canvas, idx1, idx2)
+                element_id = f"{prefix}bone_{idx1}_{idx2}"
+                elements.append((element_id, SVGElement(element_id, "pose_bone", geometry, (idx1, idx2)) if geometry is not None else None))
+            return elements
+
+        if part == 1:
+            element_id = f"{prefix}face_{keypoint_index}"
+            kp = keypoints[keypoint_index] if keypoint_index < len(keypoints) else None
+            if kp is None or kp[2] <= 0 or not self.__are_coordinates_valid(kp):
+                return [(element_id, None)]
+            return [(element_id, SVGElement(element_id, "face", self.__scale_head_keypoint_if_needed(kp, canvas), ()))]
+
+        hand_id = "hand_left" if part == 2 else "hand_right"
+        return [
+            (f"{prefix}{hand_id}_{i}", self.__hand_bone_element(keypoints, canvas, hand_id, prefix, i))
+            for i in HAND_KEYPOINT_BONES.get(keypoint_index, ())
+        ]
+
+    def draw_people(self, geometry, element_ids=False):
         """
-        if not keypoints:
-            return ""
-            
-        svg_elements = []
-        for idx1, idx2 in POSE_BONE_COLORS.keys():
-            svg_elements.append(self.__draw_pose_bone(keypoints, idx1, idx2))
-            
-        return "".join(svg_elements)
+        Formats the people of a FrameGeometry in the style of this renderer.
 
-    def __render_face(self, keypoints):
+        Yields:
+            str: The next fragment, as render() draws it after the background.
         """
-        Renders the face keypoints as filled white circles without stroke.
-        The circles are encapsulated in a <g id="head"> group.
+        for person in geometry.people:
+            yield from self.__draw_person(person, element_ids)
+
+    def draw_part(self, elements, part, element_ids=False):
         """
-        if not keypoints:
-            return ""
-            
-        svg_elements = []
-        for kp in keypoints:
-            if kp.score > 0 and self.__are_coordinates_valid(kp):
-                x, y = self.__scale_head_keypoint_if_needed(kp)
-                svg_elements.append(f'<circle cx="{x}" cy="{y}" r="2" style="fill:{FACE_KEYPOINT_COLOR};stroke:none" />')
-                
-        if not svg_elements:
-            return ""
-            
-        return f'\t<g id="head">\n\t\t{"".join(svg_elements)}\n\t</g>\n'
+        Formats one part of a person from FrameGeometry.people.
 
-    def __render_hand_left(self, keypoints):
+        Args:
+            elements: The elements of the part.
+            part: Its position in the person tuple: 0 pose, 1 face, 2 left hand, 3 right hand.
+
+        Returns:
+            str: The markup, "" for a part without elements.
+        """
+        if part == 0:
+            return self.__render_pose(elements, element_ids)
+        if part == 1:
+            return self.__render_face(elements, element_ids)
+        return self.__render_hand_generic(elements, "hand_left" if part == 2 else "hand_right", element_ids)
+
+    def part_paint(self, part):
+        """
+        Returns the text the style's paint takes in the markup of a part: the bone alpha for
+        the pose bones, the face colour for the face circles, None for the hands. It occurs in
+        every element of the part and nowhere else, so markup drawn in one style can be
+        repainted by replacing it (see StyledFrame).
+        """
+        if part == 0:
+            return f'fill-opacity:{self.__style_text["bone_alpha"]};'
+        if part == 1:
+            return f'style="fill:{self.config.style.face_color};stroke:none"'
+        return None
+
+    def header(self, canvas, view_box=None):
         """
-        Renders the left hand keypoints and bones.
+        Returns the opening <svg> tag with the <defs> section for a frame.
         """
-        return self.__render_hand_generic(keypoints, "hand_left")
+        return self.__generate_svg_header(canvas, view_box)
 
-    def __render_hand_right(self, keypoints):
+    def defs(self):
         """
-        Renders the right hand keypoints and bones.
+        Returns the <defs> section with the markers that the fragments of every frame refer to.
         """
-        return self.__render_hand_generic(keypoints, "hand_right")
+        return self.__define_markers()
 
-    def __render_hand_generic(self, keypoints, hand_id):
+    def background(self, canvas):
         """
-        Generic internal method to render a hand (left or right).
-        Connects keypoints with lines and applies markers.
+        Returns the background group covering the canvas.
         """
-        if not keypoints:
-            return ""
-            
-        svg_elements = []
-        num_indices = len(HAND_BONE_INDICES)
+        return self.__generate_background(canvas)
+
+    def __iter_frame_content(self, people, visible_indices, canvas, element_ids, background):
+        if background:
+            yield self.__generate_background(canvas)
+
+        # Only the people that are drawn are parsed
+        for person_index in visible_indices:
+            person = self.__parse_person(people[person_index])
+            yield from self.__draw_person(self.__person_geometry(person, canvas, person_index), element_ids)
+
+    def __person_geometry(self, person, canvas, person_index):
+        """
+        Returns the elements of a person as a tuple (pose, face, left hand, right hand).
+        """
+        pose_keypoints, face_keypoints, left_hand_keypoints, right_hand_keypoints = person
+        prefix = element_prefix(person_index)
+        return (
+            tuple(self.__pose_elements(pose_keypoints, canvas, prefix)),
+            tuple(self.__face_elements(face_keypoints, canvas, prefix)),
+            tuple(self.__hand_elements(left_hand_keypoints, canvas, "hand_left", prefix)),
+            tuple(self.__hand_elements(right_hand_keypoints, canvas, "hand_right", prefix)),
+        )
+
+    def __draw_person(self, person, element_ids):
+        # Render each set
+        for part, elements in enumerate(person):
+            yield self.draw_part(elements, part, element_ids)
+
+    def iter_elements(self, pose_json_data):
+        """
+        Computes the geometry of every element that render() would draw, in document order,
+        without formatting any markup. Use draw_element() to get the markup of an element.
+        
+        Yields:
+            SVGElement: The next element.
+        """
+        pose_data, canvas = self.__open_frame(pose_json_data)
+        people = pose_data.get('people', [])
+        _, visible_indices = self.__select_people(people, canvas)
+
+        for person_index in visible_indices:
+            pose_keypoints, face_keypoints, left_hand_keypoints, right_hand_keypoints = self.__parse_person(people[person_index])
+            prefix = element_prefix(person_index)
+
+            yield from self.__pose_elements(pose_keypoints, canvas, prefix)
+            yield from self.__face_elements(face_keypoints, canvas, prefix)
+            yield from self.__hand_elements(left_hand_keypoints, canvas, "hand_left", prefix)
+            yield from self.__hand_elements(right_hand_keypoints, canvas, "hand_right", prefix)
+
+    def draw_element(self, element, with_id=True):
+        """
+        Formats the markup of a single element as render() draws it.
+
+        Args:
+            element: An SVGElement from iter_elements().
+            with_id: Add the element's id as an attribute.
+        
+        Returns:
+            str: The SVG markup of the element.
+        """
+        id_attribute = f' id="{element.element_id}"' if with_id else ""
+
+        if element.kind == "pose_bone":
+            idx1, idx2 = element.detail
+            return self.__draw_pose_bone_geometry(element.geometry, idx1, idx2, id_attribute)
+
+        style_text = self.__style_text
+        if element.kind == "face":
+            x, y = element.geometry
+            return f'<circle{id_attribute} cx="{x}" cy="{y}" r="{style_text["face_radius"]}" style="fill:{self.config.style.face_color};stroke:none" />'
+
+        x1, y1, x2, y2 = element.geometry
+        hand_id = element.kind
         
-        for i, (idx1, idx2) in enumerate(HAND_BONE_INDICES):
-            if idx1 < len(keypoints) and idx2 < len(keypoints):
-                kp1 = keypoints[idx1]
-                kp2 = keypoints[idx2]
-                
-                if kp1.score > 0 and kp2.score > 0 and self.__are_coordinates_valid(kp1, kp2):
-                    x1, y1 = self.__scale_head_keypoint_if_needed(kp1)
-                    x2, y2 = self.__scale_head_keypoint_if_needed(kp2)
-                    
-                    # Calculate color using HSV
-                    h = i / float(num_indices)
-                    color_hex = self.__hsv_to_hex(h, 1.0, 1.0)
-                    
-                    line = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" ' \
-                           f'stroke="{color_hex}" stroke-width="2" ' \
-                           f'marker-start="url(#marker_{hand_id})" marker-end="url(#marker_{hand_id})" />'
-                    svg_elements.append(line)
-                    
-        if not svg_elements:
+        # Calculate color using HSV
+        h = element.detail[0] / float(len(HAND_BONE_INDICES))
+        color_hex = self.__hsv_to_hex(h, 1.0, 1.0)
+        
+        return f'<line{id_attribute} x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" ' \
+               f'stroke="{color_hex}" stroke-width="{style_text["hand_bone_width"]}" ' \
+               f'marker-start="url(#marker_{hand_id})" marker-end="url(#marker_{hand_id})" />'
+
+    def __open_frame(self, pose_json_data):
+        """
+        Validates the data and returns its first entry together with its canvas.
+        """
+        if not pose_json_data:
+            raise Exception("No pose data found")
+        pose_data = pose_json_data[0]
+        canvas = canvas_of(pose_data)
+
+        logger.debug("SVG Header: Canvas size %sx%s", canvas.width, canvas.height)
+        return pose_data, canvas
+
+    def __parse_person(self, person):
+        """
+        Parses the different keypoint sets of a person.
+        Returns a tuple (pose, face, left hand, right hand).
+        """
+        pose_keypoints = parse_keypoints(person.get('pose_keypoints_2d', []))
+        face_keypoints = parse_keypoints(person.get('face_keypoints_2d', []))
+        left_hand_keypoints = parse_keypoints(person.get('hand_left_keypoints_2d', []))
+        right_hand_keypoints = parse_keypoints(person.get('hand_right_keypoints_2d', []))
+
+        logger.debug("Keypoints: pose %d, face %d, left hand %d, right hand %d", len(pose_keypoints),
+                     len(face_keypoints), len(left_hand_keypoints), len(right_hand_keypoints))
+
+        return pose_keypoints, face_keypoints, left_hand_keypoints, right_hand_keypoints
+
+    def __select_people(self, people, canvas):
+        """
+        Applies the quality filters and the region of interest to the people of a frame,
+        given as in the OpenPose JSON format.
+        Returns a tuple (view_box, indices) with the indices of the people to render in
+        ascending order; view_box is None when the whole canvas is rendered.
+        """
+        config = self.config
+        filtering = config.min_mean_score is not None or config.min_valid_joints is not None or config.top_k is not None
+        cropping = config.roi is not None or config.tight_crop
+        if not filtering and not cropping:
+            return None, list(range(len(people)))
+
+        # Imported here, so plain rendering does not load NumPy
+        from .person_stats import compute_person_stats, select_people
+        from .person_bounds import indices_in_region, padded_bounds, union_bounds
+        stats = compute_person_stats(people, canvas.width, canvas.height)
+        indices = list(range(len(people)))
+        if filtering:
+            indices = select_people(stats, config.min_mean_score, config.min_valid_joints, top_k=config.top_k)
+        if not cropping:
+            return None, indices
+
+        # Each render asks for one region, so a linear pass over the boxes beats building an index
+        bounds = padded_bounds(stats.bounds[indices], self.config.style.extent())
+        region = config.roi
+        if config.tight_crop:
+            region = union_bounds(bounds)
+            # Whole numbers are written without a fraction, as the coordinates usually are
+            region = tuple(int(value) if value.is_integer() else value for value in region) if region else \
+                (0, 0, canvas.width, canvas.height)
+        return region, [indices[i] for i in indices_in_region(bounds, region)]
+
+    def __render_pose(self, elements, element_ids=False):
+        """
+        Renders the pose body connections (bones) with their keypoint markers.
+        With element_ids, every bone gets the id of its element.
+        """
+        return "".join(self.draw_element(element, with_id=element_ids) for element in elements)
+
+    def __render_face(self, elements, element_ids=False):
+        """
+        Renders the face keypoints as filled circles without stroke.
+        The circles are encapsulated in a <g id="head"> group.
+        """
+        if not elements:
             return ""
-            
+
+        svg_elements = [self.draw_element(element, with_id=element_ids) for element in elements]
+        return f'\t<g id="head">\n\t\t{"".join(svg_elements)}\n\t</g>\n'
+
+    def __render_hand_generic(self, elements, hand_id, element_ids=False):
+        """
+        Renders the bones of a hand (left or right) as lines with markers.
+        """
+        if not elements:
+            return ""
+
+        svg_elements = [self.draw_element(element, with_id=element_ids) for element in elements]
         return f'\t<g id="{hand_id}">\n\t\t{"".join(svg_elements)}\n\t</g>\n'
 
-    def __hsv_to_hex(self, h, s, v):
-        """Helper to convert HSV to Hex color string."""
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        return '#{:02x}{:02x}{:02x}'.format(int(r * 255), int(g * 255), int(b * 255))
+    def __pose_elements(self, keypoints, canvas, prefix):
+        """
+        Yields an element for every pose bone that would be drawn.
+        """
+        for idx1, idx2 in POSE_BONE_COLORS.keys():
+            geometry = self.__pose_bone_geometry(keypoints, canvas, idx1, idx2)
+            if geometry is not None:
+                yield SVGElement(f"{prefix}bone_{idx1}_{idx2}", "pose_bone", geometry, (idx1, idx2))
 
+    def __face_elements(self, keypoints, canvas, prefix):
+        """
+        Yields an element for every valid face keypoint.
+        """
+        for index, kp in enumerate(keypoints):
+            if kp[2] > 0 and self.__are_coordinates_valid(kp):
+                yield SVGElement(f"{prefix}face_{index}", "face", self.__scale_head_keypoint_if_needed(kp, canvas), ())
 
-    def __extract_canvas_size(self):
+    def __hand_elements(self, keypoints, canvas, hand_id, prefix):
+        """
+        Yields an element for every hand bone whose keypoints are both valid.
         """
-        Extracts canvas dimensions from the pose data and stores them as attributes.
+        for i in range(len(HAND_BONE_INDICES)):
+            element = self.__hand_bone_element(keypoints, canvas, hand_id, prefix, i)
+            if element is not None:
+                yield element
+
+    def __hand_bone_element(self, keypoints, canvas, hand_id, prefix, i):
         """
-        self.width = self.pose_data.get('canvas_width', DEFAULT_CANVAS_WIDTH)
-        self.height = self.pose_data.get('canvas_height', DEFAULT_CANVAS_HEIGHT)
+        Returns the element of the i-th hand bone, or None if one of its keypoints is not valid.
+        """
+        idx1, idx2 = HAND_BONE_INDICES[i]
+        if idx1 < len(keypoints) and idx2 < len(keypoints):
+            kp1 = keypoints[idx1]
+            kp2 = keypoints[idx2]
+
+            if kp1[2] > 0 and kp2[2] > 0 and self.__are_coordinates_valid(kp1, kp2):
+                x1, y1 = self.__scale_head_keypoint_if_needed(kp1, canvas)
+                x2, y2 = self.__scale_head_keypoint_if_needed(kp2, canvas)
+                return SVGElement(f"{prefix}{hand_id}_{i}", hand_id, (x1, y1, x2, y2), (i,))
+        return None
 
-        print(f"SVG Header: Canvas size {self.width}x{self.height}")
+    def __hsv_to_hex(self, h, s, v):
+        """Helper to convert HSV to Hex color string."""
+        r, g, b = colorsys.hsv_to_rgb(h, s, v)
+        return '#{:02x}{:02x}{:02x}'.format(int(r * 255), int(g * 255), int(b * 255))
 
 
-    def __generate_svg_header(self):        
+    def __generate_svg_header(self, canvas, view_box=None):
         defs = self.__define_markers()
+
+        if view_box is not None:
+            x, y, width, height = view_box
+            return f'<svg width="{width}" height="{height}" viewBox="{x} {y} {width} {height}" xmlns="http://www.w3.org/2000/svg">\n{defs}'
         
-        return f'<svg width="{self.width}" height="{self.height}" xmlns="http://www.w3.org/2000/svg">\n{defs}'
+        return f'<svg width="{canvas.width}" height="{canvas.height}" xmlns="http://www.w3.org/2000/svg">\n{defs}'
 
 
     def __define_markers(self):
@@ -190,51 +500,66 @@ class SVGRenderer:
         unique_colors = set(POSE_KEYPOINT_COLORS)
         unique_colors.update(POSE_BONE_COLORS.values())
         unique_colors.add(DEFAULT_COLOR)
-        
+
+        style = self.config.style
+        size, center = format_number(style.pose_marker_size), format_number(style.pose_marker_size / 2)
+        radius, alpha = format_number(style.pose_marker_radius), format_number(style.bone_alpha)
         markers = []
         for color in sorted(unique_colors):
             marker = f"""
-		<marker id="marker_{color}" viewBox="0 0 20 20" refX="10" refY="10" markerWidth="20" markerHeight="20">
-			<circle cx="10" cy="10" r="9" style="fill:{color};fill-opacity:{POSE_BONE_ALPHA_VALUE};stroke:none;"/>
+		<marker id="marker_{color}" viewBox="0 0 {size} {size}" refX="{center}" refY="{center}" markerWidth="{size}" markerHeight="{size}">
+			<circle cx="{center}" cy="{center}" r="{radius}" style="fill:{color};fill-opacity:{alpha};stroke:none;"/>
 		</marker>"""
             markers.append(marker)
 
         # Add specific markers for hand keypoints (side-specific)
+        size, center = format_number(style.hand_marker_size), format_number(style.hand_marker_size / 2)
+        radius = format_number(style.hand_marker_radius)
         for side in ["left", "right"]:
             hand_marker = f"""
-		<marker id="marker_hand_{side}" viewBox="0 0 5 5" refX="2.5" refY="2.5" markerWidth="5" markerHeight="5">
-			<circle cx="2.5" cy="2.5" r="2" style="fill:{HAND_KEYPOINT_COLOR};fill-opacity:1.0;stroke:none;"/>
+		<marker id="marker_hand_{side}" viewBox="0 0 {size} {size}" refX="{center}" refY="{center}" markerWidth="{size}" markerHeight="{size}">
+			<circle cx="{center}" cy="{center}" r="{radius}" style="fill:{style.hand_color};fill-opacity:1.0;stroke:none;"/>
 		</marker>"""
             markers.append(hand_marker)
             
         return f"\t<defs>{''.join(markers)}\n\t</defs>"
 
-    def __generate_background(self):
+    def __generate_background(self, canvas):
         """
-        Generates a black background rectangle matching the canvas size.
+        Generates a background rectangle in the style's colour matching the canvas size.
         The rectangle is encapsulated in an SVG group.
         """
-        return f'\t<g id="background">\n\t\t<rect width="{self.width}" height="{self.height}" fill="black" />\n\t</g>\n'
+        return f'\t<g id="background">\n\t\t<rect width="{canvas.width}" height="{canvas.height}" fill="{self.config.style.background}" />\n\t</g>\n'
 
     def __generate_svg_footer(self):
         return "</svg>"
 
-    def __draw_pose_bone(self, keypoints, idx1, idx2):
+    def __pose_bone_geometry(self, keypoints, canvas, idx1, idx2):
         """
-        Draws a bone between two keypoints if they exist and have a score > 0.
-        Uses predefined colors for the bone and the markers but make them semi-transparent.
+        Returns the scaled end points (x1, y1, x2, y2) of a bone, or None if it is not drawn.
         """
         if idx1 >= len(keypoints) or idx2 >= len(keypoints):
-            return ""
+            return None
             
         kp1 = keypoints[idx1]
         kp2 = keypoints[idx2]
         
-        if kp1.score <= 0 or kp2.score <= 0 or not self.__are_coordinates_valid(kp1, kp2):
-            return ""
+        if kp1[2] <= 0 or kp2[2] <= 0 or not self.__are_coordinates_valid(kp1, kp2):
+            return None
             
         # Scale if coordinates are normalized (between 0 and 1)
-        x1, y1, x2, y2 = self.__scale_coordinates_if_needed(kp1, kp2)
+        x1, y1, x2, y2 = self.__scale_coordinates_if_needed(kp1, kp2, canvas)
+
+        # Degenerate bones have no loop to draw
+        if math.hypot(x2 - x1, y2 - y1) < 0.001:
+            return None
+        return x1, y1, x2, y2
+
+    def __draw_pose_bone_geometry(self, geometry, idx1, idx2, id_attribute=""):
+        """
+        Draws the bezier loop of a bone from its scaled end points.
+        """
+        x1, y1, x2, y2 = geometry
             
         # Get bone color
         bone_color = POSE_BONE_COLORS.get((idx1, idx2))
@@ -246,9 +571,9 @@ class SVGRenderer:
         color1 = POSE_KEYPOINT_COLORS[idx1] if idx1 < len(POSE_KEYPOINT_COLORS) else DEFAULT_COLOR
         color2 = POSE_KEYPOINT_COLORS[idx2] if idx2 < len(POSE_KEYPOINT_COLORS) else DEFAULT_COLOR
         
-        return self.__draw_bezier_loop(x1, y1, color1, x2, y2, color2, bone_color)
+        return self.__draw_bezier_loop(x1, y1, color1, x2, y2, color2, bone_color, id_attribute)
 
-    def __scale_coordinates_if_needed(self, kp1, kp2):
+    def __scale_coordinates_if_needed(self, kp1, kp2, canvas):
         """
         Scales coordinates if they are normalized (between 0 and 1).
         Returns scaled x1, y1, x2, y2.
@@ -256,34 +581,34 @@ class SVGRenderer:
         x1, y1, _ = kp1
         x2, y2, _ = kp2
         if 0.0 <= x1 <= 1.0 and 0.0 <= y1 <= 1.0 and 0.0 <= x2 <= 1.0 and 0.0 <= y2 <= 1.0:
-            x1 *= self.width
-            y1 *= self.height
-            x2 *= self.width
-            y2 *= self.height
+            x1 *= canvas.width
+            y1 *= canvas.height
+            x2 *= canvas.width
+            y2 *= canvas.height
         return x1, y1, x2, y2
 
-    def __scale_head_keypoint_if_needed(self, kp):
+    def __scale_head_keypoint_if_needed(self, kp, canvas):
         """
         Scales a single head (face) keypoint if the coordinates are normalized.
         Returns scaled x, y.
         """
         x, y, _ = kp
         if 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0:
-            x *= self.width
-            y *= self.height
+            x *= canvas.width
+            y *= canvas.height
         return x, y
 
     def __are_coordinates_valid(self, *keypoints):
         """
         Centralized validation for coordinates.
-        Returns True if all coordinates in the provided KeyPoint objects are non-negative.
+        Returns True if all coordinates in the provided keypoints are non-negative.
         """
-        return all(kp.x >= 0 and kp.y >= 0 for kp in keypoints)
+        return all(kp[0] >= 0 and kp[1] >= 0 for kp in keypoints)
 
-    def __draw_bezier_loop(self, x1, y1, color1, x2, y2, color2, fill_color):
+    def __draw_bezier_loop(self, x1, y1, color1, x2, y2, color2, fill_color, id_attribute=""):
         """
         Draws a bezier curve from (x1, y1) to (x2, y2) and back to (x1, y1).
-        Handles of length 10 are orthogonal to the line connecting the two points.
+        Handles of the style's bone_handle_offset are orthogonal to the line connecting the two points.
         The loop is filled with fill_color.
         Markers at the points are colored with color1 and color2.
         """
@@ -299,8 +624,9 @@ class SVGRenderer:
         ny = dx / length
         
         # Offset for handles
-        ox = nx * 10
-        oy = ny * 10
+        offset = self.config.style.bone_handle_offset
+        ox = nx * offset
+        oy = ny * offset
         
         # Control points for forward curve
         cp1x, cp1y = x1 + ox, y1 + oy
@@ -310,5 +636,58 @@ class SVGRenderer:
         cp3x, cp3y = x2 - ox, y2 - oy
         cp4x, cp4y = x1 - ox, y1 - oy
         
-        return f'<path d="M {x1},{y1} C {cp1x},{cp1y} {cp2x},{cp2y} {x2},{y2} C {cp3x},{cp3y} {cp4x},{cp4y} {x1},{y1}" style="fill:{fill_color};fill-opacity:{POSE_BONE_ALPHA_VALUE};stroke:none" marker-start="url(#marker_{color1})" marker-mid="url(#marker_{color2})" marker-end="url(#marker_{color1})" />'
+        return f'<path{id_attribute} d="M {x1},{y1} C {cp1x},{cp1y} {cp2x},{cp2y} {x2},{y2} C {cp3x},{cp3y} {cp4x},{cp4y} {x1},{y1}" style="fill:{fill_color};fill-opacity:{self.__style_text["bone_alpha"]};stroke:none" marker-start="url(#marker_{color1})" marker-mid="url(#marker_{color2})" marker-end="url(#marker_{color1})" />'
+
+
+class SVGRenderer:
+    """
+    Renders a single OpenPose JSON document, bound to it in the constructor.
+    The OpenPose format consists of a list of pose data entries at the top level.
+    This renderer uses the first entry from the list for the entire rendering process.
+
+    Kept for callers that render one document at a time; the work is done by a
+    PoseRenderer, which can be shared between documents and threads.
+    """
+    
+    def __init__(self, pose_json_data, roi=None, tight_crop=False, min_mean_score=None, min_valid_joints=None, top_k=None):
+        """
+        Initializes the renderer with OpenPose JSON data.
+        Validates the data and extracts the first entry for rendering.
+
+        Args:
+            pose_json_data: The parsed OpenPose JSON data.
+            roi, tight_crop, min_mean_score, min_valid_joints, top_k: See RenderConfig.
+        """
+        if not pose_json_data:
+            raise Exception("No pose data found")
+        self.pose_json_data = pose_json_data
+        self.pose_data = pose_json_data[0]
+        self.width, self.height = canvas_of(self.pose_data)
+        self.renderer = PoseRenderer(RenderConfig(roi, tight_crop, min_mean_score, min_valid_joints, top_k))
+
+    def render(self):
+        """
+        Renders the stored pose data into an SVG string.
+        """
+        return self.renderer.render(self.pose_json_data)
+
+    def render_bytes(self):
+        """
+        Renders the stored pose data into UTF-8 encoded SVG.
+        """
+        return self.renderer.render_bytes(self.pose_json_data)
+
+    def iter_render(self, element_ids=False):
+        """
+        Renders the stored pose data as a sequence of SVG fragments, see PoseRenderer.iter_render.
+        """
+        return self.renderer.iter_render(self.pose_json_data, element_ids)
+
+    def iter_elements(self):
+        """
+        Computes the elements of the stored pose data, see PoseRenderer.iter_elements.
+        """
+        return self.renderer.iter_elements(self.pose_json_data)
 
+    def draw_element(self, element, with_id=True):
+        return self.renderer.draw_element(element, with_id)
@@ -0,0 +1,124 @@
+from .render_config import RenderConfig
+from .renderer import PoseRenderer
+
+
+class StyledFrame:
+    """
+    One frame whose geometry is computed once and then drawn in any number of RenderStyles,
+    e.g. while the user adjusts colours in the settings dialog.
+
+    Parsing, selecting people and computing the geometry of every element happens in the
+    constructor. Rendering in a style only formats markup, and the markup of every part of
+    the people (bones, face, hands) is kept for the last style's part_keys(). Changing the
+    markers, the hand colour or the background only formats the <defs> section and the
+    background again, however many people the frame has. Changing the bone alpha or the
+    face colour joins the kept markup of the bones or the face around the new value,
+    without formatting any element again.
+    """
+
+    def __init__(self, pose_json_data, config=None):
+        """
+        Args:
+            pose_json_data: The parsed OpenPose JSON data, the first entry is rendered.
+            config: The RenderConfig to select people with. Its style is used until render() is given another one.
+        """
+        self.pose_json_data = pose_json_data
+        self.config = config or RenderConfig()
+        self.geometry = PoseRenderer(self.config).frame_geometry(pose_json_data)
+        self.__geometry_extent = self.config.style.extent()
+        self.__renderer = PoseRenderer(self.config)  # Renderer of the last style
+        self.__part_keys = [None] * 4
+        self.__part_templates = [None] * 4  # Per part, the markup of every person split at its paint
+        self.__part_paints = [None] * 4
+        self.__part_markup = [None] * 4  # Per part, the markup of every person in the last paint
+
+    @property
+    def style(self):
+        """
+        The RenderStyle the frame was rendered in last.
+        """
+        return self.__renderer.config.style
+
+    def update_part(self, position, part, elements):
+        """
+        Replaces the elements of one part of a rendered person, e.g. after a keypoint was
+        moved (see KeypointEditor). Only the markup of this part of this person is formatted
+        again. The region of a cropped frame is kept.
+
+        Args:
+            position: Position of the person in geometry.people.
+            part: 0 pose, 1 face, 2 left hand, 3 right hand.
+            elements: The new elements of the part, in drawing order.
+        """
+        person = list(self.geometry.people[position])
+        person[part] = tuple(elements)
+        people = list(self.geometry.people)
+        people[position] = tuple(person)
+        self.geometry = self.geometry._replace(people=tuple(people))
+
+        if self.__part_templates[part] is not None:
+            template = self.__template(self.__renderer, person[part], part)
+            self.__part_templates[part][position] = template
+            self.__part_markup[part][position] = self.__paint(template, self.__part_paints[part])
+
+    def render(self, style=None):
+        """
+        Renders the frame into an SVG string, the same document PoseRenderer renders for this style.
+
+        Args:
+            style: The RenderStyle to draw in, defaults to the style of the last rendering.
+        """
+        return "".join(self.iter_render(style))
+
+    def render_bytes(self, style=None):
+        """
+        Renders the frame into UTF-8 encoded SVG, see render().
+        """
+        return self.render(style).encode('utf-8')
+
+    def iter_render(self, style=None):
+        """
+        Renders the frame as a sequence of SVG fragments, see render().
+        """
+        style = style or self.style
+        renderer = self.__renderer
+        if style != renderer.config.style:
+            renderer = self.__renderer = PoseRenderer(self.config._replace(style=style))
+        self.__update_geometry(renderer, style)
+
+        for part, key in enumerate(style.part_keys()):
+            paint = renderer.part_paint(part)
+            redrawn = key != self.__part_keys[part]
+            if redrawn:
+                self.__part_templates[part] = [self.__template(renderer, person[part], part) for person in self.geometry.people]
+                self.__part_keys[part] = key
+            if redrawn or paint != self.__part_paints[part]:
+                self.__part_markup[part] = [self.__paint(template, paint) for template in self.__part_templates[part]]
+                self.__part_paints[part] = paint
+
+        yield renderer.header(self.geometry.canvas, self.geometry.view_box)
+        yield renderer.background(self.geometry.canvas)
+        for person_parts in zip(*self.__part_markup):
+            yield from person_parts
+        yield "</svg>"
+
+    @staticmethod
+    def __template(renderer, elements, part):
+        markup = renderer.draw_part(elements, part)
+        paint = renderer.part_paint(part)
+        return markup.split(paint) if paint is not None else [markup]
+
+    @staticmethod
+    def __paint(template, paint):
+        return paint.join(template) if paint is not None else template[0]
+
+    def __update_geometry(self, renderer, style):
+        """
+        The region of a cropped frame is padded by the extent of the loops and markers,
+        so it is computed again when a style reaches further or less far.
+        """
+        cropping = self.config.roi is not None or self.config.tight_crop
+        if cropping and style.extent() != self.__geometry_extent:
+            self.geometry = renderer.frame_geometry(self.pose_json_data)
+            self.__geometry_extent = style.extent()
+            self.__part_keys = [None] * 4
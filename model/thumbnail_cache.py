@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_FILE_SUFFIX = ".thumb"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_directory():
+    """
+    Returns the directory for cached thumbnails below the user's cache directory.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "openpose2svg", "thumbnails")
+
+
+def thumbnail_key(file_path, variant=""):
+    """
+    Returns the cache key of a file's thumbnail. It is derived from the absolute path, the
+    modification time and the size of the file, so a changed file gets a new thumbnail.
+
+    Args:
+        file_path: The pose file.
+        variant: Distinguishes thumbnails of the same file, e.g. their size and style.
+    """
+    stat = os.stat(file_path)
+    identity = f"{os.path.abspath(file_path)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{variant}"
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ThumbnailCache:
+    """
+    Stores rendered thumbnails (e.g. PNG bytes) on disk, one file per key, and evicts the
+    least recently used ones once the cache grows beyond max_bytes.
+
+    The recency of an entry is the modification time of its file, which is updated on every
+    hit, so the order survives restarts. Entries of files that were changed are never hit
+    again and age out. All methods can be called from several threads.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Where the thumbnails are stored, defaults to default_cache_directory().
+            max_bytes: Total size of the thumbnails to keep.
+        """
+        self.directory = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self.__total_bytes = 0
+        self.__scan()
+
+    @property
+    def total_bytes(self):
+        return self.__total_bytes
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def get(self, key):
+        """
+        Returns the cached data of a key, or None. A hit makes the entry the most recently used.
+        """
+        with self.__lock:
+            if key not in self.__entries:
+                return None
+            self.__entries.move_to_end(key)
+
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            # Removed behind our back, e.g. by another instance evicting it
+            self.__forget(key)
+            return None
+        return data
+
+    def put(self, key, data):
+        """
+        Stores the data of a key and evicts the least recently used entries beyond max_bytes.
+        """
+        path = self.__path(key)
+        # Written under a temporary name, so readers never see half a thumbnail
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            print(f"[ThumbnailCache] Cannot store thumbnail: {e}")
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            return
+
+        with self.__lock:
+            self.__total_bytes += len(data) - self.__entries.pop(key, 0)
+            self.__entries[key] = len(data)
+            evicted = []
+            while self.__total_bytes > self.max_bytes and len(self.__entries) > 1:
+                old_key, size = self.__entries.popitem(last=False)
+                self.__total_bytes -= size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self.__path(old_key))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self.__lock:
+            keys = list(self.__entries)
+            self.__entries.clear()
+            self.__total_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self.__path(key))
+            except OSError:
+                pass
+
+    def __scan(self):
+        """
+        Loads the entries already on disk, ordered by their last use.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_FILE_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.name[:-len(CACHE_FILE_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.__entries[key] = size
+            self.__total_bytes += size
+
+    def __forget(self, key):
+        with self.__lock:
+            self.__total_bytes -= self.__entries.pop(key, 0)
+
+    def __path(self, key):
+        return os.path.join(self.directory, key + CACHE_FILE_SUFFIX)
@@ -0,0 +1,455 @@
+import colorsys
+import math
+from typing import NamedTuple
+
+# A frozen copy of the SVGRenderer the project started with, the reference of the render
+# equivalence harness (render_equivalence.py). It imports nothing from the model, so a change
+# to the renderer under test cannot change the reference as well. Do not update it along with
+# the renderer; only the debug prints of the original were removed.
+
+DEFAULT_CANVAS_WIDTH = 400
+DEFAULT_CANVAS_HEIGHT = 400
+DEFAULT_COLOR = "#cccccc"
+FACE_KEYPOINT_COLOR = "#ffffff"
+HAND_KEYPOINT_COLOR = "#0000ff"
+POSE_BONE_ALPHA_VALUE = "0.6"
+
+POSE_KEYPOINT_COLORS = [
+    "#FF0000", "#FF5500", "#FFAA00", "#FFFF00", "#AAFF00", "#55FF00", "#00FF00", "#00FF55", "#00FFAA",
+    "#00FFFF", "#00AAFF", "#0055FF", "#0000FF", "#5500FF", "#AA00FF", "#FF00FF", "#FF00AA", "#FF0055",
+]
+
+POSE_BONE_COLORS = {
+    (1, 2): "#990000", (1, 5): "#993300", (2, 3): "#996600", (3, 4): "#999900", (5, 6): "#669900",
+    (6, 7): "#339900", (1, 8): "#009900", (8, 9): "#009933", (9, 10): "#009966", (1, 11): "#009999",
+    (11, 12): "#006699", (12, 13): "#003399", (1, 0): "#000099", (0, 14): "#330099", (14, 16): "#660099",
+    (0, 15): "#990099", (15, 17): "#990066",
+}
+
+HAND_BONE_INDICES = [
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (0, 9), (9, 10),
+    (10, 11), (11, 12), (0, 13), (13, 14), (14, 15), (15, 16), (0, 17), (17, 18), (18, 19), (19, 20)
+]
+
+# Reach of the bone loops and markers of the original look beyond the keypoints, see RenderStyle.extent()
+REFERENCE_EXTENT = 10
+
+KEYPOINT_KEYS = ('pose_keypoints_2d', 'face_keypoints_2d', 'hand_left_keypoints_2d', 'hand_right_keypoints_2d')
+
+
+class KeyPoint(NamedTuple):
+    x: float
+    y: float
+    score: float
+
+
+class ReferenceSVGRenderer:
+    """
+    Class to render OpenPose JSON data into SVG format.
+    The OpenPose format consists of a list of pose data entries at the top level.
+    This renderer uses the first entry from the list for the entire rendering process.
+    """
+
+    def __init__(self, pose_json_data):
+        """
+        Initializes the renderer with OpenPose JSON data.
+        Validates the data and extracts the first entry for rendering.
+        """
+        if not pose_json_data:
+            raise Exception("No pose data found")
+        self.pose_json_data = pose_json_data
+        self.pose_data = pose_json_data[0]
+        self.__extract_canvas_size()
+
+    def render(self):
+        """
+        Renders the stored pose data into an SVG string.
+
+        Returns:
+            str: The rendered SVG as a string.
+        """
+        header = self.__generate_svg_header()
+        background = self.__generate_background()
+
+        people_svg_content = []
+        for person in self.pose_data.get('people', []):
+            # Parse different keypoint sets
+            pose_keypoints = self.__parse_keypoints(person.get('pose_keypoints_2d', []))
+            face_keypoints = self.__parse_keypoints(person.get('face_keypoints_2d', []))
+            left_hand_keypoints = self.__parse_keypoints(person.get('hand_left_keypoints_2d', []))
+            right_hand_keypoints = self.__parse_keypoints(person.get('hand_right_keypoints_2d', []))
+
+            # Render each set
+            people_svg_content.append(self.__render_pose(pose_keypoints))
+            people_svg_content.append(self.__render_face(face_keypoints))
+            people_svg_content.append(self.__render_hand_left(left_hand_keypoints))
+            people_svg_content.append(self.__render_hand_right(right_hand_keypoints))
+
+        footer = self.__generate_svg_footer()
+
+        return header + background + "".join(people_svg_content) + footer
+
+    def __parse_keypoints(self, keypoint_array):
+        """
+        Groups a flat array of numbers into KeyPoint objects.
+        Each keypoint is represented by 3 consecutive values: x, y, probability.
+        """
+        if keypoint_array is None:
+            return []
+
+        keypoints = []
+        for i in range(0, len(keypoint_array), 3):
+            if i + 2 < len(keypoint_array):
+                keypoints.append(KeyPoint(
+                    x=keypoint_array[i],
+                    y=keypoint_array[i+1],
+                    score=keypoint_array[i+2]
+                ))
+        return keypoints
+
+    def __render_pose(self, keypoints):
+        """
+        Renders the pose body keypoints and connections (bones).
+        """
+        if not keypoints:
+            return ""
+
+        svg_elements = []
+        for idx1, idx2 in POSE_BONE_COLORS.keys():
+            svg_elements.append(self.__draw_pose_bone(keypoints, idx1, idx2))
+
+        return "".join(svg_elements)
+
+    def __render_face(self, keypoints):
+        """
+        Renders the face keypoints as filled white circles without stroke.
+        The circles are encapsulated in a <g id="head"> group.
+        """
+        if not keypoints:
+            return ""
+
+        svg_elements = []
+        for kp in keypoints:
+            if kp.score > 0 and self.__are_coordinates_valid(kp):
+                x, y = self.__scale_head_keypoint_if_needed(kp)
+                svg_elements.append(f'<circle cx="{x}" cy="{y}" r="2" style="fill:{FACE_KEYPOINT_COLOR};stroke:none" />')
+
+        if not svg_elements:
+            return ""
+
+        return f'\t<g id="head">\n\t\t{"".join(svg_elements)}\n\t</g>\n'
+
+    def __render_hand_left(self, keypoints):
+        """
+        Renders the left hand keypoints and bones.
+        """
+        return self.__render_hand_generic(keypoints, "hand_left")
+
+    def __render_hand_right(self, keypoints):
+        """
+        Renders the right hand keypoints and bones.
+        """
+        return self.__render_hand_generic(keypoints, "hand_right")
+
+    def __render_hand_generic(self, keypoints, hand_id):
+        """
+        Generic internal method to render a hand (left or right).
+        Connects keypoints with lines and applies markers.
+        """
+        if not keypoints:
+            return ""
+
+        svg_elements = []
+        num_indices = len(HAND_BONE_INDICES)
+
+        for i, (idx1, idx2) in enumerate(HAND_BONE_INDICES):
+            if idx1 < len(keypoints) and idx2 < len(keypoints):
+                kp1 = keypoints[idx1]
+                kp2 = keypoints[idx2]
+
+                if kp1.score > 0 and kp2.score > 0 and self.__are_coordinates_valid(kp1, kp2):
+                    x1, y1 = self.__scale_head_keypoint_if_needed(kp1)
+                    x2, y2 = self.__scale_head_keypoint_if_needed(kp2)
+
+                    # Calculate color using HSV
+                    h = i / float(num_indices)
+                    color_hex = self.__hsv_to_hex(h, 1.0, 1.0)
+
+                    line = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" ' \
+                           f'stroke="{color_hex}" stroke-width="2" ' \
+                           f'marker-start="url(#marker_{hand_id})" marker-end="url(#marker_{hand_id})" />'
+                    svg_elements.append(line)
+
+        if not svg_elements:
+            return ""
+
+        return f'\t<g id="{hand_id}">\n\t\t{"".join(svg_elements)}\n\t</g>\n'
+
+    def __hsv_to_hex(self, h, s, v):
+        """Helper to convert HSV to Hex color string."""
+        r, g, b = colorsys.hsv_to_rgb(h, s, v)
+        return '#{:02x}{:02x}{:02x}'.format(int(r * 255), int(g * 255), int(b * 255))
+
+    def __extract_canvas_size(self):
+        """
+        Extracts canvas dimensions from the pose data and stores them as attributes.
+        """
+        self.width = self.pose_data.get('canvas_width', DEFAULT_CANVAS_WIDTH)
+        self.height = self.pose_data.get('canvas_height', DEFAULT_CANVAS_HEIGHT)
+
+    def __generate_svg_header(self):
+        defs = self.__define_markers()
+
+        return f'<svg width="{self.width}" height="{self.height}" xmlns="http://www.w3.org/2000/svg">\n{defs}'
+
+    def __define_markers(self):
+        """
+        Defines circular markers for all colors used in the pose rendering.
+        Returns the <defs> section as a string.
+        """
+        unique_colors = set(POSE_KEYPOINT_COLORS)
+        unique_colors.update(POSE_BONE_COLORS.values())
+        unique_colors.add(DEFAULT_COLOR)
+
+        markers = []
+        for color in sorted(unique_colors):
+            marker = f"""
+		<marker id="marker_{color}" viewBox="0 0 20 20" refX="10" refY="10" markerWidth="20" markerHeight="20">
+			<circle cx="10" cy="10" r="9" style="fill:{color};fill-opacity:{POSE_BONE_ALPHA_VALUE};stroke:none;"/>
+		</marker>"""
+            markers.append(marker)
+
+        # Add specific markers for hand keypoints (side-specific)
+        for side in ["left", "right"]:
+            hand_marker = f"""
+		<marker id="marker_hand_{side}" viewBox="0 0 5 5" refX="2.5" refY="2.5" markerWidth="5" markerHeight="5">
+			<circle cx="2.5" cy="2.5" r="2" style="fill:{HAND_KEYPOINT_COLOR};fill-opacity:1.0;stroke:none;"/>
+		</marker>"""
+            markers.append(hand_marker)
+
+        return f"\t<defs>{''.join(markers)}\n\t</defs>"
+
+    def __generate_background(self):
+        """
+        Generates a black background rectangle matching the canvas size.
+        The rectangle is encapsulated in an SVG group.
+        """
+        return f'\t<g id="background">\n\t\t<rect width="{self.width}" height="{self.height}" fill="black" />\n\t</g>\n'
+
+    def __generate_svg_footer(self):
+        return "</svg>"
+
+    def __draw_pose_bone(self, keypoints, idx1, idx2):
+        """
+        Draws a bone between two keypoints if they exist and have a score > 0.
+        Uses predefined colors for the bone and the markers but make them semi-transparent.
+        """
+        if idx1 >= len(keypoints) or idx2 >= len(keypoints):
+            return ""
+
+        kp1 = keypoints[idx1]
+        kp2 = keypoints[idx2]
+
+        if kp1.score <= 0 or kp2.score <= 0 or not self.__are_coordinates_valid(kp1, kp2):
+            return ""
+
+        # Scale if coordinates are normalized (between 0 and 1)
+        x1, y1, x2, y2 = self.__scale_coordinates_if_needed(kp1, kp2)
+
+        # Get bone color
+        bone_color = POSE_BONE_COLORS.get((idx1, idx2))
+        if not bone_color:
+            # Try reverse tuple if not found
+            bone_color = POSE_BONE_COLORS.get((idx2, idx1), DEFAULT_COLOR)
+
+        # Get marker colors
+        color1 = POSE_KEYPOINT_COLORS[idx1] if idx1 < len(POSE_KEYPOINT_COLORS) else DEFAULT_COLOR
+        color2 = POSE_KEYPOINT_COLORS[idx2] if idx2 < len(POSE_KEYPOINT_COLORS) else DEFAULT_COLOR
+
+        return self.__draw_bezier_loop(x1, y1, color1, x2, y2, color2, bone_color)
+
+    def __scale_coordinates_if_needed(self, kp1, kp2):
+        """
+        Scales coordinates if they are normalized (between 0 and 1).
+        Returns scaled x1, y1, x2, y2.
+        """
+        x1, y1, _ = kp1
+        x2, y2, _ = kp2
+        if 0.0 <= x1 <= 1.0 and 0.0 <= y1 <= 1.0 and 0.0 <= x2 <= 1.0 and 0.0 <= y2 <= 1.0:
+            x1 *= self.width
+            y1 *= self.height
+            x2 *= self.width
+            y2 *= self.height
+        return x1, y1, x2, y2
+
+    def __scale_head_keypoint_if_needed(self, kp):
+        """
+        Scales a single head (face) keypoint if the coordinates are normalized.
+        Returns scaled x, y.
+        """
+        x, y, _ = kp
+        if 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0:
+            x *= self.width
+            y *= self.height
+        return x, y
+
+    def __are_coordinates_valid(self, *keypoints):
+        """
+        Centralized validation for coordinates.
+        Returns True if all coordinates in the provided KeyPoint objects are non-negative.
+        """
+        return all(kp.x >= 0 and kp.y >= 0 for kp in keypoints)
+
+    def __draw_bezier_loop(self, x1, y1, color1, x2, y2, color2, fill_color):
+        """
+        Draws a bezier curve from (x1, y1) to (x2, y2) and back to (x1, y1).
+        Handles of length 10 are orthogonal to the line connecting the two points.
+        The loop is filled with fill_color.
+        Markers at the points are colored with color1 and color2.
+        """
+        dx = x2 - x1
+        dy = y2 - y1
+        length = math.sqrt(dx*dx + dy*dy)
+
+        if length < 0.001:
+            return ""
+
+        # Unit orthogonal vector (nx, ny)
+        nx = -dy / length
+        ny = dx / length
+
+        # Offset for handles
+        ox = nx * 10
+        oy = ny * 10
+
+        # Control points for forward curve
+        cp1x, cp1y = x1 + ox, y1 + oy
+        cp2x, cp2y = x2 + ox, y2 + oy
+
+        # Control points for return curve
+        cp3x, cp3y = x2 - ox, y2 - oy
+        cp4x, cp4y = x1 - ox, y1 - oy
+
+        return f'<path d="M {x1},{y1} C {cp1x},{cp1y} {cp2x},{cp2y} {x2},{y2} C {cp3x},{cp3y} {cp4x},{cp4y} {x1},{y1}" style="fill:{fill_color};fill-opacity:{POSE_BONE_ALPHA_VALUE};stroke:none" marker-start="url(#marker_{color1})" marker-mid="url(#marker_{color2})" marker-end="url(#marker_{color1})" />'
+
+
+def _drawable_keypoints(keypoint_array, width, height):
+    """
+    Returns the (x, y, score) of the drawable keypoints of one keypoint set in canvas pixels.
+    """
+    keypoints = []
+    for i in range(0, len(keypoint_array or ()) - 2, 3):
+        x, y, score = keypoint_array[i], keypoint_array[i + 1], keypoint_array[i + 2]
+        if score > 0 and x >= 0 and y >= 0:
+            if x <= 1.0 and y <= 1.0:
+                x, y = x * width, y * height
+            keypoints.append((float(x), float(y), float(score)))
+    return keypoints
+
+
+def _drawn_points(person, width, height):
+    """
+    Returns the canvas positions of everything the frozen renderer draws for one person:
+    the end points of the pose bones (scaled per bone), the face points and the end points
+    of the hand bones (scaled per keypoint).
+    """
+    def rows(key):
+        values = person.get(key) or ()
+        return [tuple(values[i:i + 3]) for i in range(0, len(values) - 2, 3)]
+
+    def drawable(kp):
+        return kp[2] > 0 and kp[0] >= 0 and kp[1] >= 0
+
+    def scaled(kp):
+        return (kp[0] * width, kp[1] * height) if kp[0] <= 1.0 and kp[1] <= 1.0 else (kp[0], kp[1])
+
+    points = []
+    body = rows(KEYPOINT_KEYS[0])
+    for idx1, idx2 in POSE_BONE_COLORS:
+        if idx1 < len(body) and idx2 < len(body) and drawable(body[idx1]) and drawable(body[idx2]):
+            x1, y1, x2, y2 = body[idx1][0], body[idx1][1], body[idx2][0], body[idx2][1]
+            if max(x1, y1, x2, y2) <= 1.0:
+                x1, y1, x2, y2 = x1 * width, y1 * height, x2 * width, y2 * height
+            if math.hypot(x2 - x1, y2 - y1) >= 0.001:
+                points += [(x1, y1), (x2, y2)]
+    points += [scaled(kp) for kp in rows(KEYPOINT_KEYS[1]) if drawable(kp)]
+    for key in KEYPOINT_KEYS[2:]:
+        hand = rows(key)
+        for idx1, idx2 in HAND_BONE_INDICES:
+            if idx1 < len(hand) and idx2 < len(hand) and drawable(hand[idx1]) and drawable(hand[idx2]):
+                points += [scaled(hand[idx1]), scaled(hand[idx2])]
+    return [(float(x), float(y)) for x, y in points]
+
+
+def _person_summary(person, width, height):
+    """
+    Returns (mean body score, drawable body joints, whether any keypoint is drawable,
+    padded box of what is drawn or None) of one person.
+    """
+    body = _drawable_keypoints(person.get(KEYPOINT_KEYS[0]), width, height)
+    mean_score = sum(score for _, _, score in body) / len(body) if body else 0.0
+    drawable = any(_drawable_keypoints(person.get(key), width, height) for key in KEYPOINT_KEYS)
+    points = _drawn_points(person, width, height)
+    if not points:
+        return mean_score, len(body), drawable, None
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    box = (min(xs) - REFERENCE_EXTENT, min(ys) - REFERENCE_EXTENT,
+           max(xs) - min(xs) + 2 * REFERENCE_EXTENT, max(ys) - min(ys) + 2 * REFERENCE_EXTENT)
+    return mean_score, len(body), drawable, box
+
+
+def _intersects(box, region):
+    x, y, width, height = region
+    return box[0] <= x + width and x <= box[0] + box[2] and box[1] <= y + height and y <= box[1] + box[3]
+
+
+def reference_render(pose_json_data, config):
+    """
+    Renders a document with the frozen renderer, applying the render options it predates
+    the plain way: the people that pass the quality filters and intersect the region are
+    kept in a copy of the document, and the region becomes the viewBox.
+
+    Args:
+        config: A RenderConfig in the default style.
+    """
+    if config.style != type(config.style)():
+        raise ValueError("The reference renderer only draws the default style")
+    if not pose_json_data:
+        return ReferenceSVGRenderer(pose_json_data).render()
+
+    pose_data = pose_json_data[0]
+    width = pose_data.get('canvas_width', DEFAULT_CANVAS_WIDTH)
+    height = pose_data.get('canvas_height', DEFAULT_CANVAS_HEIGHT)
+    people = pose_data.get('people', [])
+    summaries = [_person_summary(person, width, height) for person in people]
+
+    # People without drawable keypoints draw nothing, so leaving them out changes nothing
+    kept = [i for i, summary in enumerate(summaries) if summary[2]]
+    if config.min_mean_score is not None:
+        kept = [i for i in kept if summaries[i][0] >= config.min_mean_score]
+    if config.min_valid_joints is not None:
+        kept = [i for i in kept if summaries[i][1] >= config.min_valid_joints]
+    if config.top_k is not None:
+        # The highest total scores, the earlier person first on a tie
+        ranked = sorted(kept, key=lambda i: -summaries[i][0] * summaries[i][1])
+        kept = sorted(ranked[:config.top_k])
+
+    region = config.roi
+    if config.tight_crop:
+        boxes = [summaries[i][3] for i in kept if summaries[i][3] is not None]
+        if boxes:
+            left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+            right, bottom = max(box[0] + box[2] for box in boxes), max(box[1] + box[3] for box in boxes)
+            region = (left, top, right - left, bottom - top)
+        else:
+            region = (0, 0, width, height)
+    if region is not None:
+        kept = [i for i in kept if summaries[i][3] is not None and _intersects(summaries[i][3], region)]
+
+    document = [dict(pose_data, people=[people[i] for i in kept])] + list(pose_json_data[1:])
+    svg_content = ReferenceSVGRenderer(document).render()
+    if region is None:
+        return svg_content
+    x, y, region_width, region_height = region
+    return (f'<svg width="{region_width}" height="{region_height}" viewBox="{x} {y} {region_width} {region_height}"'
+            + svg_content[svg_content.index(' xmlns='):])
@@ -0,0 +1,387 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, NamedTuple
+
+# Add project root and the tests directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from model.svg_renderer import PoseRenderer, RenderConfig, SVGRenderer, StyledFrame, render_poses_threaded
+from model.pose_array_loader import PoseSequence
+from reference_renderer import reference_render
+
+# Keypoints per person in the OpenPose BODY_25, face and hand models
+POSE_JOINTS, FACE_JOINTS, HAND_JOINTS = 25, 70, 21
+PART_KEYS = ("pose_keypoints_2d", "face_keypoints_2d", "hand_left_keypoints_2d", "hand_right_keypoints_2d")
+PART_JOINTS = (POSE_JOINTS, FACE_JOINTS, HAND_JOINTS, HAND_JOINTS)
+
+# Render options every case is rendered with, by the reference and by every engine.
+# Only options of the default style, the only one the reference draws.
+CONFIGS = {
+    "default": {},
+    "tight_crop": {"tight_crop": True},
+    "filtered": {"min_valid_joints": 3, "top_k": 2},
+    "roi": {"roi": (100, 50, 300, 200), "min_mean_score": 0.5},
+}
+
+# Numbers in SVG attributes, compared after rounding
+NUMBER_PATTERN = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class PoseCase(NamedTuple):
+    """One generated document and what it exercises."""
+    name: str
+    pose_json_data: list
+
+
+class Engine(NamedTuple):
+    """A rendering path compared with the reference."""
+    render: Callable                # render(pose_json_data, config) -> SVG as str or bytes
+    compare_structure: bool = True  # False for engines that may draw the same with other elements, e.g. merged paths
+
+
+class EngineResult(NamedTuple):
+    """Comparison of one engine with the reference over all cases and configs."""
+    engine: str
+    renders: int
+    seconds: float
+    reference_seconds: float
+    failures: list  # (case name, config name, reason)
+
+    @property
+    def speedup(self):
+        return self.reference_seconds / self.seconds if self.seconds > 0 else 0.0
+
+
+class EquivalenceReport:
+    """
+    Results of run_harness(): for every engine the failures and its speed relative to the reference.
+    """
+    def __init__(self, results, cases, pixels):
+        self.results = results
+        self.cases = cases
+        self.pixels = pixels
+
+    @property
+    def failures(self):
+        return [(result.engine,) + failure for result in self.results for failure in result.failures]
+
+    def summary(self):
+        width = max([14] + [len(result.engine) for result in self.results])
+        lines = [
+            f"{self.cases} cases x {len(CONFIGS)} configs, compared by structure"
+            + (" and pixels" if self.pixels else " only (pixels skipped)"),
+            f"  {'engine':<{width}} {'renders':>8} {'time':>9} {'speedup':>8}  result",
+        ]
+        for result in self.results:
+            verdict = "equivalent" if not result.failures else f"{len(result.failures)} mismatches"
+            lines.append(
+                f"  {result.engine:<{width}} {result.renders:>8} {result.seconds:>8.3f}s {result.speedup:>7.2f}x  {verdict}"
+            )
+            for case, config, reason in result.failures[:5]:
+                lines.append(f"    {case} [{config}]: {reason}")
+        return "\n".join(lines)
+
+
+def _render_svg_renderer(pose_json_data, config):
+    return SVGRenderer(pose_json_data, config.roi, config.tight_crop, config.min_mean_score,
+                       config.min_valid_joints, config.top_k).render()
+
+
+def _render_array_input(pose_json_data, config):
+    # Keypoints as (n, 3) array views, like frames of a .npy sequence
+    return PoseRenderer(config).render([PoseSequence.from_pose_json(pose_json_data).frame(0)])
+
+
+# The rendering paths of the repository, by name
+ENGINES = {
+    "render": Engine(lambda pose_json_data, config: PoseRenderer(config).render(pose_json_data)),
+    "svg_renderer": Engine(_render_svg_renderer),
+    "render_bytes": Engine(lambda pose_json_data, config: PoseRenderer(config).render_bytes(pose_json_data)),
+    "iter_render": Engine(lambda pose_json_data, config: "".join(PoseRenderer(config).iter_render(pose_json_data))),
+    "styled_frame": Engine(lambda pose_json_data, config: StyledFrame(pose_json_data, config).render()),
+    "threaded": Engine(lambda pose_json_data, config: render_poses_threaded([pose_json_data], config, workers=1)[0]),
+    "array_input": Engine(_render_array_input),
+}
+
+
+def register_engine(name, render, compare_structure=True):
+    """
+    Adds a rendering path to compare with the reference, e.g. an optimised renderer.
+
+    Args:
+        name: Shown in the report.
+        render: Called as render(pose_json_data, config) with a RenderConfig; returns the
+            SVG as str or bytes and raises for documents the reference rejects.
+        compare_structure: Whether the elements must match the reference's. Without it,
+            only the pixels are compared, so the engine may merge or reorder elements.
+    """
+    ENGINES[name] = Engine(render, compare_structure)
+
+
+def _keypoints(rng, count, canvas, mode):
+    """
+    Returns a flat keypoint list of count keypoints in pixel or normalised coordinates,
+    with some zero scores, negative coordinates and keypoints outside the canvas.
+    """
+    values = []
+    for _ in range(count):
+        if mode == "normalised" or (mode == "mixed" and rng.random() < 0.5):
+            x, y = rng.random(), rng.random()
+        else:
+            x, y = rng.uniform(0, canvas[0]), rng.uniform(0, canvas[1])
+        roll = rng.random()
+        if roll < 0.05:
+            x = -rng.uniform(0, 50)
+        elif roll < 0.1:
+            y = canvas[1] + rng.uniform(1, 200)
+        score = 0.0 if rng.random() < 0.2 else round(rng.uniform(0.05, 1.0), 3)
+        values.extend([round(x, 3) if x > 1 else x, round(y, 3) if y > 1 else y, score])
+    return values
+
+
+def _random_person(rng, canvas):
+    mode = rng.choice(("pixel", "normalised", "mixed"))
+    person = {}
+    for key, joints in zip(PART_KEYS, PART_JOINTS):
+        # The body is nearly always there; faces and hands are often missing, empty or None
+        roll = rng.random()
+        if key != "pose_keypoints_2d" and roll < 0.4:
+            choice = rng.random()
+            if choice < 0.5:
+                continue
+            person[key] = [] if choice < 0.8 else None
+            continue
+        values = _keypoints(rng, joints if rng.random() < 0.8 else rng.randint(1, joints), canvas, mode)
+        if rng.random() < 0.1:
+            # Truncated mid keypoint
+            values = values[:-rng.randint(1, 2)]
+        person[key] = values
+    return person
+
+
+def random_case(rng, index):
+    """
+    Returns a PoseCase with a random canvas (or none) and up to five random people.
+    """
+    canvas = rng.choice(((400, 400), (640, 480), (1920, 1080), (100, 300)))
+    entry = {'people': [_random_person(rng, canvas) for _ in range(rng.randint(0, 5))]}
+    if rng.random() < 0.9:
+        entry['canvas_width'], entry['canvas_height'] = canvas
+    else:
+        canvas = (400, 400)
+    return PoseCase(f"random_{index}", [entry])
+
+
+def edge_cases():
+    """
+    Returns PoseCases for inputs the renderer has to handle specially.
+    """
+    def body(points, score=0.9):
+        values = []
+        for x, y in points:
+            values.extend([x, y, score])
+        return values
+
+    line = [(100 + 10 * i, 50 + 12 * i) for i in range(POSE_JOINTS)]
+    hand = [(300 + 3 * i, 200 + 4 * i) for i in range(HAND_JOINTS)]
+    face = [(200 + i, 100 + (i % 7)) for i in range(FACE_JOINTS)]
+    canvas = {'canvas_width': 640, 'canvas_height': 480}
+    cases = [
+        ("no_people", [{'people': [], **canvas}]),
+        ("default_canvas", [{'people': [{'pose_keypoints_2d': body(line)}]}]),
+        ("all_zero_scores", [{'people': [{'pose_keypoints_2d': body(line, 0.0)}], **canvas}]),
+        ("coincident_keypoints", [{'people': [{'pose_keypoints_2d': body([(120, 80)] * POSE_JOINTS)}], **canvas}]),
+        ("negative_coordinates", [{'people': [{'pose_keypoints_2d': body([(x - 200, y - 100) for x, y in line])}], **canvas}]),
+        ("normalised_bounds", [{'people': [{'pose_keypoints_2d': body([(i % 2, (i // 2) % 2) for i in range(POSE_JOINTS)])}], **canvas}]),
+        ("normalised_and_pixel", [{'people': [{'pose_keypoints_2d': body([(0.5, 0.5), (320, 240)] * 12 + [(0.1, 0.9)])}], **canvas}]),
+        ("far_outside_canvas", [{'people': [{'pose_keypoints_2d': body([(x * 40, y * 40) for x, y in line])}], **canvas}]),
+        ("truncated_by_one", [{'people': [{'pose_keypoints_2d': body(line)[:-1], 'hand_left_keypoints_2d': body(hand)[:-2]}], **canvas}]),
+        ("single_keypoint", [{'people': [{'pose_keypoints_2d': [50, 60, 0.8]}], **canvas}]),
+        ("missing_hands_and_face", [{'people': [{'pose_keypoints_2d': body(line)}], **canvas}]),
+        ("none_hands_and_face", [{'people': [{'pose_keypoints_2d': body(line), 'face_keypoints_2d': None,
+                                              'hand_left_keypoints_2d': None, 'hand_right_keypoints_2d': []}], **canvas}]),
+        ("hands_and_face_only", [{'people': [{'face_keypoints_2d': body(face), 'hand_right_keypoints_2d': body(hand)}], **canvas}]),
+        ("zero_score_person_first", [{'people': [{'pose_keypoints_2d': body(line, 0.0)}, {'pose_keypoints_2d': body(line)}], **canvas}]),
+    ]
+    return [PoseCase(name, pose_json_data) for name, pose_json_data in cases]
+
+
+def generate_cases(count, seed=0):
+    """
+    Returns the edge cases followed by count random cases, reproducible from the seed.
+    """
+    rng = random.Random(seed)
+    return edge_cases() + [random_case(rng, index) for index in range(count)]
+
+
+class NormalisedElement(NamedTuple):
+    """One element of a normalised document."""
+    markup: str     # Tag and sorted attributes, with every number replaced by '#'
+    numbers: tuple  # The numbers, in order
+
+
+def normalise_svg(svg_content):
+    """
+    Returns the structure of an SVG document as one NormalisedElement per element, in
+    document order. Attributes are sorted and whitespace is collapsed, so documents that
+    draw the same elements compare equal however they were formatted.
+    """
+    if isinstance(svg_content, (bytes, bytearray, memoryview)):
+        svg_content = bytes(svg_content).decode('utf-8')
+
+    elements = []
+    for element in ET.fromstring(svg_content).iter():
+        tag = element.tag.rpartition('}')[2]
+        attributes = "".join(f' {name}="{" ".join(value.split())}"' for name, value in sorted(element.attrib.items()))
+        markup = f"<{tag}{attributes}>{' '.join((element.text or '').split())}"
+        numbers = tuple(float(number) for number in NUMBER_PATTERN.findall(markup))
+        elements.append(NormalisedElement(NUMBER_PATTERN.sub("#", markup), numbers))
+    return elements
+
+
+def structural_difference(expected, actual, tolerance=1e-3):
+    """
+    Returns a description of the first difference between two normalised documents, or
+    None. Numbers may differ by the tolerance, relative to their size if that is above 1.
+    """
+    for index, (expected_element, actual_element) in enumerate(zip(expected, actual)):
+        if expected_element.markup != actual_element.markup:
+            return f"element {index}: expected {expected_element.markup[:100]} got {actual_element.markup[:100]}"
+        for expected_number, actual_number in zip(expected_element.numbers, actual_element.numbers):
+            if abs(expected_number - actual_number) > tolerance * max(1.0, abs(expected_number)):
+                return f"element {index} ({expected_element.markup[:40]}): expected {expected_number:g} got {actual_number:g}"
+    if len(expected) != len(actual):
+        return f"{len(expected)} elements expected, got {len(actual)}"
+    return None
+
+
+def rasterize(svg_content, size):
+    """
+    Returns the pixels of an SVG document fitted into size x size as a (size, size, 4) array.
+    """
+    import numpy as np
+    from viewmodel.svg_rasterizer import rasterize_svg
+
+    if isinstance(svg_content, str):
+        svg_content = svg_content.encode('utf-8')
+    image = rasterize_svg(svg_content, size, size)
+    pixels = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8)
+    return pixels.reshape(size, image.bytesPerLine() // 4, 4)[:, :size]
+
+
+def pixel_difference(expected, actual, channel_tolerance=8, max_fraction=0.001):
+    """
+    Returns a description of the difference between two rasterised documents, or None if
+    at most max_fraction of the pixels differ by more than channel_tolerance in any channel.
+    Anti-aliasing may differ slightly between equivalent drawings.
+    """
+    import numpy as np
+
+    differing = np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max(axis=2) > channel_tolerance
+    fraction = differing.mean()
+    if fraction <= max_fraction:
+        return None
+    return f"{fraction:.2%} of the pixels differ"
+
+
+def _outcome(render, pose_json_data, config):
+    """
+    Returns (svg or None, exception type name or None, seconds).
+    """
+    started = time.perf_counter()
+    try:
+        svg_content = render(pose_json_data, config)
+        error = None
+    except Exception as e:
+        svg_content, error = None, type(e).__name__
+    return svg_content, error, time.perf_counter() - started
+
+
+def _pixels_available():
+    try:
+        import PyQt6.QtSvg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_harness(cases, engines=None, configs=None, pixels=True, raster_size=96):
+    """
+    Renders every case in every config with the reference and with every engine, and
+    compares the results. Engines must raise where the reference raises.
+
+    Args:
+        cases: PoseCases, e.g. from generate_cases().
+        engines: Names from ENGINES, defaults to all registered engines.
+        configs: Names from CONFIGS, defaults to all.
+        pixels: Also compare the rasterised documents; skipped if PyQt6 is not installed.
+        raster_size: Edge length of the rasterised documents.
+
+    Returns:
+        EquivalenceReport
+    """
+    engines = engines or list(ENGINES)
+    configs = configs or list(CONFIGS)
+    pixels = pixels and _pixels_available()
+    if not pixels and not all(ENGINES[name].compare_structure for name in engines):
+        raise ValueError("Engines that are not compared by structure need the pixel comparison (PyQt6)")
+
+    timings = {name: [0, 0.0, 0.0, []] for name in engines}  # renders, seconds, reference seconds, failures
+    for case in cases:
+        for config_name in configs:
+            config = RenderConfig(**CONFIGS[config_name])
+            expected, expected_error, reference_seconds = _outcome(reference_render, case.pose_json_data, config)
+            expected_structure = normalise_svg(expected) if expected is not None else None
+            expected_pixels = rasterize(expected, raster_size) if pixels and expected is not None else None
+
+            for name in engines:
+                engine = ENGINES[name]
+                actual, error, seconds = _outcome(engine.render, case.pose_json_data, config)
+                timing = timings[name]
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] += reference_seconds
+
+                if error != expected_error:
+                    reason = f"raised {error}, reference raised {expected_error}"
+                elif actual is None:
+                    continue
+                else:
+                    reason = None
+                    if engine.compare_structure:
+                        reason = structural_difference(expected_structure, normalise_svg(actual))
+                    if reason is None and expected_pixels is not None:
+                        reason = pixel_difference(expected_pixels, rasterize(actual, raster_size))
+                if reason is not None:
+                    timing[3].append((case.name, config_name, reason))
+
+    results = [EngineResult(name, *timings[name]) for name in engines]
+    return EquivalenceReport(results, len(cases), pixels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Renders generated pose documents with the frozen reference renderer and every registered engine, "
+                    "and reports whether they draw the same and how fast they are."
+    )
+    parser.add_argument("--cases", type=int, default=200, help="Number of random cases, added to the edge cases")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random cases")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), help="Engines to compare, defaults to all")
+    parser.add_argument("--no-pixels", action="store_true", help="Compare the structure only, without rasterising")
+    parser.add_argument("--size", type=int, default=96, help="Edge length of the rasterised documents")
+    args = parser.parse_args(argv)
+
+    report = run_harness(generate_cases(args.cases, args.seed), args.engines, pixels=not args.no_pixels,
+                         raster_size=args.size)
+    print(report.summary())
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
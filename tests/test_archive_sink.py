@@ -0,0 +1,94 @@
+import sys
+import os
+import json
+import tarfile
+import tempfile
+import zipfile
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import ArchiveSink, BatchPipeline, build_jobs
+from model.file_handler import ModelError
+from model.svg_renderer import render_pose, render_pose_fragments
+
+def _pose_data(canvas_size):
+    return [{
+        'canvas_width': canvas_size,
+        'canvas_height': canvas_size,
+        'people': [{
+            'pose_keypoints_2d': [0.5, 0.5, 1.0, 0.6, 0.6, 1.0]
+        }]
+    }]
+
+def test_zip_sink():
+    with tempfile.TemporaryDirectory() as directory:
+        archive_path = os.path.join(directory, "poses.zip")
+        with ArchiveSink(archive_path, compress=True, queue_size=2) as sink:
+            for i in range(5):
+                sink.add(f"frame_{i}.svg", render_pose_fragments(_pose_data(100 + i)), source=f"frame_{i}.json")
+
+        with zipfile.ZipFile(archive_path) as archive:
+            assert archive.getinfo("frame_0.svg").compress_type == zipfile.ZIP_DEFLATED
+            for i in range(5):
+                assert archive.read(f"frame_{i}.svg").decode('utf-8') == render_pose(_pose_data(100 + i))
+            manifest = json.loads(archive.read("manifest.json"))
+
+        assert [entry["name"] for entry in manifest["members"]] == [f"frame_{i}.svg" for i in range(5)]
+        assert manifest["members"][0]["source"] == "frame_0.json"
+    print("Zip archive sink test passed")
+
+def test_tar_sink():
+    with tempfile.TemporaryDirectory() as directory:
+        archive_path = os.path.join(directory, "poses.tar.gz")
+        with ArchiveSink(archive_path) as sink:
+            sink.add("a/pose.svg", render_pose(_pose_data(200)))
+
+        with tarfile.open(archive_path, "r:gz") as archive:
+            assert archive.getnames() == ["a/pose.svg", "manifest.json"]
+            content = archive.extractfile("a/pose.svg").read().decode('utf-8')
+        assert content == render_pose(_pose_data(200))
+    print("Tar archive sink test passed")
+
+def _failing_fragments():
+    yield "<svg>"
+    raise OSError("No space left on device")
+
+def test_writer_failure():
+    with tempfile.TemporaryDirectory() as directory:
+        input_paths = []
+        for i in range(3):
+            input_paths.append(os.path.join(directory, f"frame_{i}.json"))
+            with open(input_paths[-1], 'w', encoding='utf-8') as f:
+                json.dump(_pose_data(100 + i), f)
+
+        sink = ArchiveSink(os.path.join(directory, "poses.zip"))
+        failed = sink.add("broken.svg", _failing_fragments())
+        try:
+            failed.result()
+            assert False, "Expected the member to fail"
+        except ModelError as e:
+            assert "No space left on device" in str(e)
+
+        # Every job the writer could not write is reported as failed, not as converted
+        report = BatchPipeline(readers=1, renderers=1, writers=1, sink=sink).run(build_jobs(input_paths, ""))
+        assert len(report.results) == 3
+        assert all(result.error.startswith("write: Failed to write archive") for result in report.results)
+        try:
+            sink.close()
+            assert False, "Expected close to raise"
+        except ModelError:
+            pass
+    print("Archive writer failure test passed")
+
+if __name__ == "__main__":
+    try:
+        test_zip_sink()
+        test_tar_sink()
+        test_writer_failure()
+        print("\nArchive sink tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,117 @@
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import BatchPipeline, build_jobs
+from model.svg_renderer import render_pose
+
+def _write_pose_file(directory, name, canvas_size):
+    pose_data = [{
+        'canvas_width': canvas_size,
+        'canvas_height': canvas_size,
+        'people': [{
+            'pose_keypoints_2d': [0.5, 0.5, 1.0, 0.6, 0.6, 1.0]
+        }]
+    }]
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(pose_data, f)
+    return pose_data
+
+def test_batch_pipeline():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        expected = {}
+        for i in range(6):
+            expected[f"frame_{i}"] = _write_pose_file(input_dir, f"frame_{i}.json", 100 + i)
+        with open(os.path.join(input_dir, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("{ not json")
+
+        jobs = build_jobs([input_dir], output_dir)
+        assert len(jobs) == 7
+
+        pipeline = BatchPipeline(readers=2, renderers=2, writers=2, queue_size=2)
+        report = pipeline.run(jobs)
+        print(report.summary())
+
+        # The broken file is reported but does not stop the other conversions
+        assert len(report.results) == 7
+        assert len(report.errors) == 1
+        assert report.errors[0].input_path.endswith("broken.json")
+        assert report.errors[0].error.startswith("render:")
+
+        for stem, pose_data in expected.items():
+            with open(os.path.join(output_dir, stem + ".svg"), 'r', encoding='utf-8') as f:
+                assert f.read() == render_pose(pose_data)
+
+        stages = {stage.name: stage for stage in report.stages}
+        assert stages["read"].items == 7
+        assert stages["render"].items == 6
+        assert stages["render"].failures == 1
+        assert stages["write"].items == 6
+        for stage in report.stages:
+            assert 0.0 <= stage.utilisation(report.wall_seconds) <= 1.0
+        print("Batch pipeline test passed")
+
+def test_thread_render_pool():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        expected = {f"frame_{i}": _write_pose_file(input_dir, f"frame_{i}.json", 100 + i) for i in range(4)}
+
+        pipeline = BatchPipeline(renderers=2, render_pool="thread", render_options={'tight_crop': True})
+        report = pipeline.run(build_jobs([input_dir], output_dir))
+        assert report.errors == []
+
+        for stem, pose_data in expected.items():
+            with open(os.path.join(output_dir, stem + ".svg"), 'r', encoding='utf-8') as f:
+                assert f.read() == render_pose(pose_data, tight_crop=True)
+
+        try:
+            BatchPipeline(render_pool="fibers")
+            assert False, "Unknown render pools should be rejected"
+        except ValueError:
+            pass
+        print("Thread render pool test passed")
+
+def test_same_names_in_different_directories():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        for camera, canvas_size in (("cam1", 100), ("cam2", 200)):
+            os.makedirs(os.path.join(input_dir, camera))
+            _write_pose_file(os.path.join(input_dir, camera), "frame_0.json", canvas_size)
+        _write_pose_file(input_dir, "single.json", 300)
+
+        # The same file twice is converted once
+        single = os.path.join(input_dir, "single.json")
+        jobs = build_jobs([os.path.join(input_dir, "cam1"), os.path.join(input_dir, "cam2"), single, single], output_dir)
+        assert [os.path.relpath(job.output_path, output_dir) for job in jobs] == [
+            os.path.join("cam1", "frame_0.svg"), os.path.join("cam2", "frame_0.svg"), "single.svg"
+        ]
+
+        report = BatchPipeline(readers=1, renderers=1, render_pool="thread").run(jobs)
+        assert report.errors == []
+        with open(os.path.join(output_dir, "cam2", "frame_0.svg"), 'r', encoding='utf-8') as f:
+            assert '<svg width="200" height="200"' in f.read()
+
+        # Names that differ only in the compression suffix cannot be told apart
+        with open(os.path.join(input_dir, "single.json.gz"), 'wb'):
+            pass
+        try:
+            build_jobs([input_dir], output_dir)
+            assert False, "Colliding outputs should be rejected"
+        except ValueError as e:
+            assert "single.svg" in str(e)
+    print("Same names in different directories test passed")
+
+if __name__ == "__main__":
+    try:
+        test_batch_pipeline()
+        test_thread_render_pool()
+        test_same_names_in_different_directories()
+        print("\nBatch pipeline tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
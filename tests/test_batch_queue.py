@@ -0,0 +1,96 @@
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt6.QtCore import QCoreApplication
+from model.file_handler import FileHandler
+from model.json_parser import PoseJsonParser
+from model.svg_renderer import RenderStyle, render_pose
+from viewmodel.batch_queue import BatchQueue
+from viewmodel.processing_state import ProcessingState
+
+# Kept for the whole run; the queue's signals need the application
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+def _write_pose_files(directory, count):
+    pose_data = [{'canvas_width': 100, 'canvas_height': 100, 'people': [
+        {'pose_keypoints_2d': [0.5, 0.5, 1.0, 0.6, 0.6, 1.0]}
+    ]}]
+    for i in range(count):
+        with open(os.path.join(directory, f"frame_{i}.json"), 'w', encoding='utf-8') as f:
+            json.dump(pose_data, f)
+    return pose_data
+
+def _wait_until_finished(queue, timeout=10):
+    started = time.time()
+    while queue.is_running() and time.time() - started < timeout:
+        app.processEvents()
+        time.sleep(0.01)
+    assert not queue.is_running(), "Batch did not finish"
+
+def test_batch_queue():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        pose_data = _write_pose_files(input_dir, 5)
+        with open(os.path.join(input_dir, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("{ not json")
+
+        queue = BatchQueue(FileHandler(), PoseJsonParser(), workers=2, progress_interval=20)
+        queue.set_render_style(RenderStyle(bone_alpha=0.3))
+        states, progress, failed = [], [], []
+        queue.state_changed.connect(states.append)
+        queue.progress_changed.connect(progress.append)
+        queue.item_failed.connect(failed.append)
+
+        assert queue.add_inputs([input_dir], output_dir) == 6
+        _wait_until_finished(queue)
+
+        assert states == [ProcessingState.BATCH_RUNNING, ProcessingState.BATCH_FINISHED]
+        # The broken file is listed but does not stop the other conversions
+        assert len(failed) == 1 and failed[0].input_path.endswith("broken.json")
+        assert queue.errors == failed
+        last = progress[-1]
+        assert (last.done, last.failed, last.total) == (6, 1, 6)
+        assert last.files_per_second > 0 and last.eta_seconds == 0
+        for i in range(5):
+            with open(os.path.join(output_dir, f"frame_{i}.svg"), 'r', encoding='utf-8') as f:
+                assert f.read() == render_pose(pose_data, style=RenderStyle(bone_alpha=0.3))
+
+        # A new batch starts counting from zero
+        assert queue.add_inputs([os.path.join(input_dir, "frame_0.json")], output_dir) == 1
+        _wait_until_finished(queue)
+        assert queue.progress()[:3] == (1, 0, 1) and queue.errors == []
+    print("Batch queue test passed")
+
+def test_cancel():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        _write_pose_files(input_dir, 200)
+        queue = BatchQueue(FileHandler(), PoseJsonParser(), workers=1)
+        states = []
+        queue.state_changed.connect(states.append)
+
+        queue.add_inputs([input_dir], output_dir)
+        queue.cancel()
+        _wait_until_finished(queue)
+
+        assert states == [ProcessingState.BATCH_RUNNING, ProcessingState.BATCH_CANCELLING, ProcessingState.BATCH_FINISHED]
+        # Only the files that were already in the pool can have been converted
+        done, failed, total, _, _ = queue.progress()
+        assert done == total == len(os.listdir(output_dir)) and failed == 0
+        assert total <= queue.max_in_flight
+    print("Cancel test passed")
+
+if __name__ == "__main__":
+    try:
+        test_batch_queue()
+        test_cancel()
+        print("\nBatch queue tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
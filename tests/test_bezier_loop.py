@@ -5,10 +5,10 @@ import math
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from model.svg_renderer import SVGRenderer
+from model.svg_renderer import PoseRenderer
 
 def test_bezier_loop():
-    renderer = SVGRenderer()
+    renderer = PoseRenderer()
     
     # Test horizontal line: (0,0) to (100,0)
     # dx=100, dy=0, length=100
@@ -18,12 +18,12 @@ def test_bezier_loop():
     # Return handles: (100, -10), (0, -10)
     x1, y1, x2, y2 = 0, 0, 100, 0
     color = "red"
-    svg_path = renderer._SVGRenderer__draw_bezier_loop(x1, y1, x2, y2, color)
+    svg_path = renderer._PoseRenderer__draw_bezier_loop(x1, y1, color, x2, y2, color, color)
     
     print(f"Generated SVG Path: {svg_path}")
     
     assert 'M 0,0' in svg_path
-    assert 'style="fill:red;stroke:none"' in svg_path
+    assert 'style="fill:red;fill-opacity:0.6;stroke:none"' in svg_path
     assert 'marker-start="url(#marker_red)"' in svg_path
     assert 'marker-mid="url(#marker_red)"' in svg_path
     assert 'marker-end="url(#marker_red)"' in svg_path
@@ -39,11 +39,11 @@ def test_bezier_loop():
     # Return handles: (10, 100), (10, 0)
     x1, y1, x2, y2 = 0, 0, 0, 100
     color_v = "blue"
-    svg_path_v = renderer._SVGRenderer__draw_bezier_loop(x1, y1, x2, y2, color_v)
+    svg_path_v = renderer._PoseRenderer__draw_bezier_loop(x1, y1, color_v, x2, y2, color_v, color_v)
     print(f"Generated SVG Path (Vertical): {svg_path_v}")
     
     assert 'M 0,0' in svg_path_v
-    assert 'style="fill:blue;stroke:none"' in svg_path_v
+    assert 'style="fill:blue;fill-opacity:0.6;stroke:none"' in svg_path_v
     assert 'marker-start="url(#marker_blue)"' in svg_path_v
     assert 'marker-mid="url(#marker_blue)"' in svg_path_v
     assert 'marker-end="url(#marker_blue)"' in svg_path_v
@@ -0,0 +1,134 @@
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import BatchJob, BatchPipeline, CheckpointManifest, build_jobs, select_shard, shard_manifest_path, shard_of
+from model.batch.checkpoint import input_stat
+
+def _write_pose_file(directory, name):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        json.dump([{'canvas_width': 100, 'canvas_height': 100,
+                    'people': [{'pose_keypoints_2d': [10, 10, 1.0, 20, 20, 1.0]}]}], f)
+
+def test_shards():
+    jobs = [BatchJob(f"/data/frame_{i:05d}.json", f"out/frame_{i:05d}.svg") for i in range(1000)]
+    shards = [select_shard(jobs, index, 4) for index in range(4)]
+
+    # Every job lands in exactly one shard, and the shards are roughly even
+    assert sorted(job for shard in shards for job in shard) == sorted(jobs)
+    assert all(150 < len(shard) < 350 for shard in shards)
+
+    # The shard only depends on the file name, not on where the data is mounted
+    assert shard_of("/mnt/a/frame_00001.json", 4) == shard_of("/nfs/b/frame_00001.json", 4)
+    assert select_shard(jobs, 0, 1) == jobs
+    for index, count in ((4, 4), (-1, 4), (0, 0)):
+        try:
+            select_shard(jobs, index, count)
+            assert False, f"Shard {index}/{count} should be rejected"
+        except ValueError:
+            pass
+
+    assert shard_manifest_path("runs/batch.jsonl", 2, 8) == "runs/batch.shard-2-of-8.jsonl"
+    print("Shard test passed")
+
+def test_manifest_recovers_from_crash():
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_path = os.path.join(directory, "manifest.jsonl")
+        a_path, b_path = os.path.join(directory, "a.json"), os.path.join(directory, "b.json")
+        _write_pose_file(directory, "a.json")
+        _write_pose_file(directory, "b.json")
+        with CheckpointManifest(manifest_path) as manifest:
+            manifest.record(a_path, "a.svg", "hash-a", stat=input_stat(a_path))
+            manifest.record(b_path, "b.svg", "hash-b", error="render: broken", stat=input_stat(b_path))
+
+        # A crash while a record was written leaves a cut off last line
+        with open(manifest_path, 'a', encoding='utf-8') as f:
+            f.write('{"input": "c.json", "outp')
+
+        with CheckpointManifest(manifest_path) as manifest:
+            assert len(manifest) == 2
+            assert manifest.is_done(BatchJob(a_path, "a.svg"))
+            assert not manifest.is_done(BatchJob(a_path, "elsewhere/a.svg"))
+            assert not manifest.is_done(BatchJob(b_path, "b.svg"))
+            assert manifest.lookup(b_path).error == "render: broken"
+            assert manifest.lookup("c.json") is None
+
+            # A later record of the same input replaces the earlier one
+            manifest.record(b_path, "b.svg", "hash-b", stat=input_stat(b_path))
+
+        with CheckpointManifest(manifest_path) as manifest:
+            assert manifest.is_done(BatchJob(b_path, "b.svg"))
+            assert manifest.lookup(b_path).status == "done"
+
+            # A changed input is not done, but may still have the recorded content
+            os.utime(b_path, ns=(0, 0))
+            assert not manifest.is_done(BatchJob(b_path, "b.svg"))
+            assert manifest.is_unchanged(BatchJob(b_path, "b.svg"), "hash-b")
+            assert not manifest.is_unchanged(BatchJob(b_path, "b.svg"), "hash-c")
+            os.remove(a_path)
+            assert not manifest.is_done(BatchJob(a_path, "a.svg"))
+        print("Manifest crash recovery test passed")
+
+def test_resume_batch():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        for i in range(6):
+            _write_pose_file(input_dir, f"frame_{i}.json")
+        broken_path = os.path.join(input_dir, "broken.json")
+        with open(broken_path, 'w', encoding='utf-8') as f:
+            f.write("{ not json")
+        manifest_path = os.path.join(output_dir, "manifest.jsonl")
+        jobs = build_jobs([input_dir], output_dir)
+
+        # The first run is interrupted after three files
+        first_jobs = [job for job in jobs if job.input_path != broken_path][:3]
+        with CheckpointManifest(manifest_path) as manifest:
+            report = BatchPipeline(renderers=1, render_pool="thread", manifest=manifest).run(first_jobs)
+            assert report.errors == [] and report.skipped == 0
+
+        # The restarted run converts the rest and retries the broken file once it is fixed
+        with CheckpointManifest(manifest_path) as manifest:
+            report = BatchPipeline(renderers=1, render_pool="thread", manifest=manifest).run(jobs)
+            assert report.skipped == 3
+            assert len(report.results) == 4
+            assert [os.path.basename(result.input_path) for result in report.errors] == ["broken.json"]
+            assert manifest.lookup(jobs[0].input_path).input_hash is not None
+            assert manifest.lookup(jobs[0].input_path).input_size == os.path.getsize(jobs[0].input_path)
+
+        _write_pose_file(input_dir, "broken.json")
+        with CheckpointManifest(manifest_path) as manifest:
+            report = BatchPipeline(renderers=1, render_pool="thread", manifest=manifest).run(jobs)
+            assert report.skipped == 6
+            assert [result.input_path for result in report.results] == [broken_path]
+            assert report.errors == []
+            print(report.summary())
+
+        # A touched input is read again but not rendered again, an edited one is converted anew
+        os.utime(jobs[0].input_path, ns=(0, 0))
+        with open(jobs[1].input_path, 'w', encoding='utf-8') as f:
+            json.dump([{'canvas_width': 50, 'canvas_height': 50, 'people': []}], f)
+        with CheckpointManifest(manifest_path) as manifest:
+            report = BatchPipeline(renderers=1, render_pool="thread", manifest=manifest).run(jobs)
+            assert report.skipped == 6
+            assert [result.input_path for result in report.results] == [jobs[1].input_path]
+            assert manifest.is_done(jobs[0]) and manifest.is_done(jobs[1])
+        with open(jobs[1].output_path, 'r', encoding='utf-8') as f:
+            assert '<svg width="50" height="50"' in f.read()
+
+        assert len(os.listdir(output_dir)) == 7 + 1
+        print("Resume batch test passed")
+
+if __name__ == "__main__":
+    try:
+        test_shards()
+        test_manifest_recovers_from_crash()
+        test_resume_batch()
+        print("\nCheckpoint tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,178 @@
+import sys
+import os
+import contextlib
+import json
+import tempfile
+import xml.dom.minidom
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from contact_sheet_export import FrameSource, iter_selected, open_source
+from model.file_handler import FileHandler
+from model.json_parser import PoseJsonParser
+from model.svg_renderer import ContactSheetRenderer, PoseRenderer, RenderConfig
+
+def _frame(i):
+    return [{'canvas_width': 400, 'canvas_height': 200, 'people': [{
+        'pose_keypoints_2d': [100 + i, 50, 0.9, 120 + i, 150, 0.8],
+        'hand_left_keypoints_2d': [200, 100, 0.9, 210, 110, 0.9],
+    }]}]
+
+def test_contact_sheet():
+    sheet = ContactSheetRenderer(columns=3, cell_width=100, cell_height=80, gap=10)
+    assert sheet.size(7) == (10 + 3 * 110, 10 + 3 * 90)
+    assert sheet.size(2) == (10 + 2 * 110, 10 + 90)
+
+    frames = [_frame(i) for i in range(7)]
+    svg = sheet.render(frames, labels=[f"frame <{i}>" for i in range(7)])
+    document = xml.dom.minidom.parseString(svg)
+
+    # The markers are defined once for the whole sheet
+    markers = [marker.getAttribute('id') for marker in document.getElementsByTagName('marker')]
+    assert len(markers) == len(set(markers)) > 0
+
+    cells = [g for g in document.getElementsByTagName('g') if g.getAttribute('id').startswith('cell_')]
+    assert len(cells) == 7
+    assert cells[4].getAttribute('transform') == "translate(120 100)"
+    assert cells[4].getElementsByTagName('text')[0].firstChild.data == "frame <4>"
+
+    # A 400x200 canvas is scaled by 0.25 into the 100x64 space below the label
+    inner = cells[0].getElementsByTagName('g')[0]
+    assert "scale(0.250000)" in inner.getAttribute('transform')
+    assert inner.getAttribute('clip-path') == "url(#cell_0_clip)"
+    assert len(inner.getElementsByTagName('path')) == 1
+    assert len(inner.getElementsByTagName('line')) == 1
+    print("Contact sheet test passed")
+
+def test_frame_without_document():
+    renderer = PoseRenderer(RenderConfig(tight_crop=True))
+    frame = renderer.render_frame(_frame(0))
+    assert frame.canvas == (400, 200)
+    assert frame.view_box is not None
+
+    # Wrapping the fragments in a document gives the full rendering
+    document = renderer.render(_frame(0))
+    body = "".join(frame.fragments)
+    assert body in document
+    assert document.startswith('<svg') and not body.startswith('<svg')
+    assert "background" not in "".join(renderer.render_frame(_frame(0), background=False).fragments)
+    print("Frame without document test passed")
+
+def test_streaming_and_errors():
+    consumed = []
+
+    def frames():
+        for i in range(5):
+            consumed.append(i)
+            yield None if i == 2 else _frame(i)
+
+    sheet = ContactSheetRenderer(columns=2, cell_width=100, cell_height=100, tight_crop=True)
+    try:
+        sheet.render(frames())
+        assert False, "A generator without a count should be rejected"
+    except ValueError:
+        pass
+
+    fragments = sheet.iter_render(frames(), count=5)
+    next(fragments)  # Header with the shared defs
+    next(fragments)  # Sheet background
+    first_cell = next(fragments)
+    # Cells are rendered while the document is consumed, not all up front
+    assert consumed == [0]
+    assert 'id="cell_0"' in first_cell
+
+    rest = "".join(fragments)
+    assert consumed == [0, 1, 2, 3, 4]
+    # The broken frame leaves a cell with its error, the following cells are still rendered
+    assert "No pose data found" in rest
+    assert 'id="cell_4"' in rest and rest.endswith("</svg>")
+    print("Contact sheet streaming test passed")
+
+def test_sources_are_closed():
+    closed = []
+
+    def source(label, count):
+        return FrameSource(label, count, lambda indices: (_frame(i) for i in indices), lambda: closed.append(label))
+
+    sources = [source("a", 3), source("b", 1), source("c", 2)]
+    cells = iter_selected(sources, [0, 2, 5])
+    assert [label for label, _ in cells] == ["a #0", "a #2", "c #1"]
+    # Sources without selected frames are closed as well
+    assert closed == ["a", "b", "c"]
+
+    # A sheet cut short closes the source it was reading from
+    closed.clear()
+    cells = iter_selected([source("a", 3), source("b", 1)], [0, 1, 3])
+    next(cells)
+    cells.close()
+    assert closed == ["a"]
+    print("Contact sheet sources closed test passed")
+
+class _CountingFileHandler(FileHandler):
+    def __init__(self):
+        self.lines_read = 0
+        self.open_streams = 0
+
+    @contextlib.contextmanager
+    def open_binary_stream(self, file_path):
+        with super().open_binary_stream(file_path) as f:
+            self.open_streams += 1
+            try:
+                yield self.__count(f)
+            finally:
+                self.open_streams -= 1
+
+    def __count(self, lines):
+        for line in lines:
+            self.lines_read += 1
+            yield line
+
+def test_jsonl_source():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(600):
+                f.write(json.dumps(_frame(i)[0]) + "\n")
+
+        file_handler = _CountingFileHandler()
+        source = open_source(path, file_handler, PoseJsonParser())
+        assert source.count == 600
+        file_handler.lines_read = 0
+
+        parsed = []
+        parse_pose_data = PoseJsonParser.parse_pose_data
+
+        def counting_parse(parser, json_string):
+            parsed.append(json_string)
+            return parse_pose_data(parser, json_string)
+
+        PoseJsonParser.parse_pose_data = counting_parse
+        try:
+            frames = list(source.frames([1, 3]))
+        finally:
+            PoseJsonParser.parse_pose_data = parse_pose_data
+        assert frames == [_frame(1), _frame(3)]
+        # Only the wanted lines are decoded, and reading stops after the chunk holding the last one
+        assert len(parsed) == 2
+        assert file_handler.lines_read == 256
+        assert file_handler.open_streams == 0
+
+        cells = list(iter_selected([source], [599]))
+        assert cells == [("capture.jsonl #599", _frame(599))]
+        assert file_handler.open_streams == 0
+    print("Contact sheet JSONL source test passed")
+
+if __name__ == "__main__":
+    try:
+        test_contact_sheet()
+        test_frame_without_document()
+        test_streaming_and_errors()
+        test_sources_are_closed()
+        test_jsonl_source()
+        print("\nContact sheet tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,153 @@
+import sys
+import os
+import json
+import tempfile
+import zipfile
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import ArchiveSink, BatchPipeline, PoseDedupCache, build_jobs
+from model.json_parser import PoseJsonParser
+from model.svg_renderer import render_pose_bytes
+
+def _pose_data(offset, score=0.9):
+    return [{
+        'canvas_width': 500,
+        'canvas_height': 500,
+        'people': [{
+            'pose_keypoints_2d': [100.0 + offset, 100.0, score, 200.0 + offset, 200.0, score]
+        }]
+    }]
+
+def test_quantised_keys():
+    cache = PoseDedupCache(tolerance=1.0)
+    key = cache.key_for(_pose_data(0.0))
+
+    # Noise that stays within the same tolerance bin and score changes keep the key
+    assert cache.key_for(_pose_data(0.2)) == key
+    assert cache.key_for(_pose_data(0.0, score=0.5)) == key
+    # Real movement, hidden keypoints and other canvas sizes or styles change it
+    assert cache.key_for(_pose_data(3.0)) != key
+    assert cache.key_for(_pose_data(0.0, score=0.0)) != key
+    resized = _pose_data(0.0)
+    resized[0]['canvas_width'] = 640
+    assert cache.key_for(resized) != key
+    assert PoseDedupCache(tolerance=1.0, style="dark").key_for(_pose_data(0.0)) != key
+    # Keys are bins, not distances: a small difference across a bin edge changes the key
+    assert cache.key_for(_pose_data(0.4)) != cache.key_for(_pose_data(0.6))
+
+    # Normalised coordinates are compared in canvas pixels, as they are drawn
+    def normalised(pose_keypoints):
+        return [{'people': [{'pose_keypoints_2d': pose_keypoints}]}]
+    default_cache = PoseDedupCache()
+    first, moved = normalised([0.1, 0.1, 1, 0.2, 0.2, 1]), normalised([0.2, 0.05, 1, 0.24, 0.2, 1])
+    assert render_pose_bytes(first) != render_pose_bytes(moved)
+    assert default_cache.key_for(first) != default_cache.key_for(moved)
+    assert default_cache.key_for(first) == default_cache.key_for(normalised([0.1005, 0.1, 1, 0.2, 0.2, 1]))
+    # A bone with one pixel end point is drawn unscaled, so it differs from the normalised one
+    assert default_cache.key_for(first) != default_cache.key_for(normalised([0.1, 0.1, 1, 80, 80, 1]))
+    # Keypoints at negative coordinates are not drawn, wherever they are
+    assert default_cache.key_for(normalised([-5, 10, 1, 50, 50, 1])) == default_cache.key_for(normalised([-90, 10, 1, 50, 50, 1]))
+
+    assert cache.lookup(key) is None
+    cache.remember(key, "first.svg")
+    assert cache.lookup(key) == "first.svg"
+    assert cache.hit_rate == 0.5
+    print("Quantised key test passed")
+
+def _write_frames(directory, offsets):
+    for i, offset in enumerate(offsets):
+        with open(os.path.join(directory, f"frame_{i:02d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(_pose_data(offset), f)
+
+def test_pipeline_links_repeated_frames():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        _write_frames(input_dir, [0.0, 0.1, 0.2, 5.0, 5.1, 0.0])
+
+        # A single reader keeps the lookups in input order, so the first frame of a pose is the original
+        cache = PoseDedupCache(tolerance=1.0)
+        pipeline = BatchPipeline(readers=1, renderers=2, queue_size=2, dedup_cache=cache)
+        report = pipeline.run(build_jobs([input_dir], output_dir))
+        print(report.summary())
+
+        assert not report.errors
+        assert cache.hits == 4 and cache.misses == 2
+        stages = {stage.name: stage for stage in report.stages}
+        assert stages["render"].items == 2
+
+        aliases = {os.path.basename(r.output_path): r.alias_of for r in report.results}
+        assert aliases["frame_01.svg"].endswith("frame_00.svg")
+        assert aliases["frame_04.svg"].endswith("frame_03.svg")
+        first = os.stat(os.path.join(output_dir, "frame_00.svg"))
+        linked = os.stat(os.path.join(output_dir, "frame_05.svg"))
+        assert (first.st_ino, first.st_dev) == (linked.st_ino, linked.st_dev)
+    print("Pipeline hard link dedup test passed")
+
+def test_pipeline_archive_aliases():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        _write_frames(input_dir, [0.0, 0.1, 5.0])
+        archive_path = os.path.join(output_dir, "poses.zip")
+
+        with ArchiveSink(archive_path) as sink:
+            pipeline = BatchPipeline(readers=1, renderers=1, sink=sink, dedup_cache=PoseDedupCache(tolerance=1.0))
+            report = pipeline.run(build_jobs([input_dir], ""))
+        assert not report.errors
+
+        with zipfile.ZipFile(archive_path) as archive:
+            assert sorted(archive.namelist()) == ["frame_00.svg", "frame_02.svg", "manifest.json"]
+            manifest = {entry["name"]: entry for entry in json.loads(archive.read("manifest.json"))["members"]}
+        assert manifest["frame_01.svg"]["alias_of"] == "frame_00.svg"
+    print("Archive alias dedup test passed")
+
+def test_failed_original_is_a_miss():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        _write_frames(input_dir, [0.0, 0.1])
+
+        # An invalid render option makes every render fail
+        cache = PoseDedupCache(tolerance=1.0)
+        pipeline = BatchPipeline(readers=1, renderers=1, dedup_cache=cache, render_options={'top_k': 'all'},
+                                 render_pool="thread")
+        report = pipeline.run(build_jobs([input_dir], output_dir))
+        assert len(report.errors) == 2
+        assert all(result.alias_of is None for result in report.results)
+        # The second frame had to be rendered itself, so its lookup is no hit
+        assert cache.hits == 0 and cache.misses == 2
+    print("Failed original dedup test passed")
+
+def test_thread_pool_reuses_decoded_data():
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        _write_frames(input_dir, [0.0, 5.0])
+        parsed = []
+        parse_pose_data = PoseJsonParser.parse_pose_data
+
+        def counting_parse(parser, json_string):
+            parsed.append(json_string)
+            return parse_pose_data(parser, json_string)
+
+        PoseJsonParser.parse_pose_data = counting_parse
+        try:
+            pipeline = BatchPipeline(readers=1, renderers=1, dedup_cache=PoseDedupCache(), render_pool="thread")
+            report = pipeline.run(build_jobs([input_dir], output_dir))
+        finally:
+            PoseJsonParser.parse_pose_data = parse_pose_data
+        assert not report.errors
+        with open(os.path.join(output_dir, "frame_00.svg"), 'rb') as f:
+            assert f.read() == render_pose_bytes(_pose_data(0.0))
+        # Decoded once in the reader; the render threads received the decoded data
+        assert len(parsed) == 2
+    print("Thread pool decoded data test passed")
+
+if __name__ == "__main__":
+    try:
+        test_quantised_keys()
+        test_pipeline_links_repeated_frames()
+        test_pipeline_archive_aliases()
+        test_failed_original_is_a_miss()
+        test_thread_pool_reuses_decoded_data()
+        print("\nDedup cache tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,86 @@
+import sys
+import os
+import json
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import SVGRenderer, DeltaSequenceRenderer, render_pose, render_pose_deltas
+
+def _frame(neck_x, hand_x=None):
+    # Neck (1) to right shoulder (2) and right shoulder to right elbow (3)
+    pose = [0.0, 0.0, 0.0] * 18
+    pose[3:12] = [neck_x, 100, 1.0, 150, 120, 1.0, 160, 200, 1.0]
+    person = {'pose_keypoints_2d': pose}
+    if hand_x is not None:
+        person['hand_left_keypoints_2d'] = [hand_x, 300, 1.0, hand_x + 10, 310, 1.0] + [0.0, 0.0, 0.0] * 19
+    return {'canvas_width': 500, 'canvas_height': 500, 'people': [person]}
+
+def test_element_ids():
+    renderer = SVGRenderer([_frame(100, hand_x=200)])
+    elements = list(renderer.iter_elements())
+    assert [e.element_id for e in elements] == ['person0_bone_1_2', 'person0_bone_2_3', 'person0_hand_left_0']
+    assert elements[0].geometry == (100, 100, 150, 120)
+
+    # Without ids, drawing every element gives the plain render
+    document = render_pose([_frame(100, hand_x=200)])
+    assert all(renderer.draw_element(e, with_id=False) in document for e in elements)
+
+    keyframe = "".join(renderer.iter_render(element_ids=True))
+    assert keyframe.count(' id="person0_') == 3
+    assert keyframe.replace(' id="person0_bone_1_2"', '').replace(' id="person0_bone_2_3"', '') \
+                   .replace(' id="person0_hand_left_0"', '') == document
+    print("Element id test passed")
+
+def test_deltas():
+    renderer = DeltaSequenceRenderer(tolerance=0.5)
+    renderer.render_keyframe(_frame(100, hand_x=200))
+
+    # Sub-tolerance jitter emits nothing
+    delta = renderer.render_delta(_frame(100.3, hand_x=200))
+    assert delta.changed == {} and delta.removed == []
+
+    # The neck moves bone 1-2 only; the hand disappears
+    delta = renderer.render_delta(_frame(101, hand_x=None))
+    assert list(delta.changed) == ['person0_bone_1_2']
+    assert delta.changed['person0_bone_1_2'].startswith('<path id="person0_bone_1_2" d="M 101,100')
+    assert delta.removed == ['person0_hand_left_0']
+
+    # Drift is measured against the last emitted geometry
+    assert renderer.render_delta(_frame(101.4)).changed == {}
+    assert list(renderer.render_delta(_frame(101.6)).changed) == ['person0_bone_1_2']
+
+    delta = renderer.render_delta(_frame(101.6, hand_x=200))
+    assert list(delta.changed) == ['person0_hand_left_0']
+    print("Delta test passed")
+
+def test_stream():
+    frames = [_frame(100)] * 50 + [_frame(140, hand_x=200)]
+    lines = list(render_pose_deltas(frames))
+    assert len(lines) == 51
+    records = [json.loads(line) for line in lines]
+    assert records[0]['frame'] == 0 and records[0]['svg'].startswith('<svg')
+    assert all(record['set'] == {} for record in records[1:50])
+    assert len(records[50]['set']) == 2
+
+    # Output of a static clip scales with motion, not with the frame count
+    assert sum(len(line) for line in lines[1:50]) < len(lines[0])
+
+    try:
+        DeltaSequenceRenderer(tight_crop=True)
+        assert False, "tight_crop should be rejected"
+    except ValueError:
+        pass
+    print("Stream test passed")
+
+if __name__ == "__main__":
+    try:
+        test_element_ids()
+        test_deltas()
+        test_stream()
+        print("\nDelta renderer tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.file_handler import ModelError
+from model.frame_index import FrameIndex, IndexedPoseFile, INDEX_SUFFIX
+
+def _entries(count):
+    return [{
+        'version': 1.3,
+        'name': f'frame [{i}] {{"quoted"}}',  # Brackets and escaped quotes inside strings
+        'canvas_width': 500,
+        'canvas_height': 500,
+        'people': [{'pose_keypoints_2d': [float(i), 10.0, 0.9] * 18}]
+    } for i in range(count)]
+
+def _write(path, entries, indent=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=indent)
+
+def test_build_and_read():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sequence.json')
+        entries = _entries(50)
+        _write(path, entries, indent=2)
+
+        with IndexedPoseFile(path) as pose_file:
+            assert len(pose_file) == 50
+            assert pose_file.frame(37) == [entries[37]]
+            assert pose_file.frame(0) == [entries[0]]
+            try:
+                pose_file.frame(50)
+                assert False, "Out of range frame should fail"
+            except IndexError:
+                pass
+
+        assert os.path.exists(path + INDEX_SUFFIX)
+        assert os.path.getsize(path + INDEX_SUFFIX) < 1000
+        print("Build and read test passed")
+
+def test_sidecar_reuse_and_staleness():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sequence.json')
+        _write(path, _entries(5))
+        built = FrameIndex.open(path)
+
+        loaded = FrameIndex.load(path)
+        assert loaded is not None
+        assert list(loaded.offsets) == list(built.offsets) and list(loaded.lengths) == list(built.lengths)
+
+        # Changing the file invalidates the sidecar
+        _write(path, _entries(7))
+        assert FrameIndex.load(path) is None
+        assert len(FrameIndex.open(path)) == 7
+        assert len(FrameIndex.load(path)) == 7
+        print("Sidecar staleness test passed")
+
+def test_invalid_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            'object.json': '{"people": []}',
+            'truncated.json': '[{"people": []}, {"people": [',
+            'strings.json': '["a", "b"]',
+            'frames.json.gz': '[]',
+        }
+        for name, content in cases.items():
+            path = os.path.join(tmp, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            try:
+                FrameIndex.build(path)
+                assert False, f"{name} should not be indexable"
+            except ModelError:
+                pass
+        print("Invalid files test passed")
+
+if __name__ == "__main__":
+    try:
+        test_build_and_read()
+        test_sidecar_reuse_and_staleness()
+        test_invalid_files()
+        print("\nFrame index tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
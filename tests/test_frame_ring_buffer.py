@@ -0,0 +1,51 @@
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from viewmodel.frame_ring_buffer import FrameRingBuffer, prefetch_order
+
+def test_eviction():
+    buffer = FrameRingBuffer(3)
+    for index in (10, 11, 12):
+        assert buffer.put(index, f"frame {index}", playhead=10) is None
+    assert len(buffer) == 3
+
+    # Playback moved on: the frame farthest behind is evicted
+    assert buffer.put(13, "frame 13", playhead=12) == 10
+    assert buffer.indices() == [11, 12, 13]
+
+    # A frame farther away than everything buffered is not stored
+    assert buffer.put(20, "frame 20", playhead=12) == 20
+    assert 20 not in buffer
+
+    # After a jump, the old neighbourhood goes first
+    assert buffer.put(100, "frame 100", playhead=100) == 11
+    assert buffer.get(100) == "frame 100"
+
+    # Replacing a buffered frame never evicts
+    assert buffer.put(12, "frame 12 again", playhead=0) is None
+    assert buffer.get(12) == "frame 12 again"
+    print("Eviction test passed")
+
+def test_prefetch_order():
+    assert prefetch_order(5, 100, ahead=4, behind=2) == [5, 6, 7, 4, 8, 9, 3]
+    # Playing backwards swaps the directions
+    assert prefetch_order(5, 100, ahead=2, behind=1, direction=-1) == [5, 4, 3, 6]
+    # Frames outside the sequence are left out
+    assert prefetch_order(0, 3, ahead=4, behind=2) == [0, 1, 2]
+    assert prefetch_order(2, 3, ahead=2, behind=0) == [2]
+    assert prefetch_order(3, 3, ahead=2, behind=2) == []
+    print("Prefetch order test passed")
+
+if __name__ == "__main__":
+    try:
+        test_eviction()
+        test_prefetch_order()
+        print("\nFrame ring buffer tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,148 @@
+import sys
+import os
+import json
+import pickle
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import HeatmapAggregator
+from model.pose_array_loader import PoseSequence
+from model.svg_renderer import JointHeatmap, joint_indices
+
+def _frames(count, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        people = []
+        for _ in range(2):
+            pose = np.column_stack([rng.uniform(0, 200, 18), rng.uniform(0, 100, 18), rng.uniform(0, 1, 18)])
+            hand = np.column_stack([rng.uniform(0, 200, 21), rng.uniform(0, 100, 21), rng.uniform(0, 1, 21)])
+            people.append({'pose_keypoints_2d': pose.ravel().tolist(), 'hand_left_keypoints_2d': hand.ravel().tolist()})
+        frames.append({'canvas_width': 200, 'canvas_height': 100, 'people': people})
+    return frames
+
+def test_binning():
+    heatmap = JointHeatmap(bins=(4, 2))
+    heatmap.add_pose_json([{'canvas_width': 200, 'canvas_height': 100, 'people': [{'pose_keypoints_2d': [
+        10, 10, 0.9,     # Nose: column 0, row 0
+        199, 99, 0.5,    # Neck: last cell
+        0.6, 0.6, 0.7,   # Right shoulder: normalised, column 2, row 1
+        50, 50, 0.0,     # Right elbow: not detected
+        250, 50, 0.9,    # Right wrist: outside the canvas
+        -5, 10, 0.9,     # Left shoulder: negative coordinates
+    ]}]}])
+
+    assert heatmap.canvas_width == 200 and heatmap.canvas_height == 100
+    assert heatmap.frames == 1
+    assert heatmap.density().sum() == 3
+    assert heatmap.density([0])[0, 0] == 1
+    assert heatmap.density([1])[1, 3] == 1
+    assert heatmap.density([2])[1, 2] == 1
+    assert heatmap.density(range(3, 18)).sum() == 0
+    print("Heatmap binning test passed")
+
+def test_sources_and_merging():
+    frames = _frames(30)
+    from_json = JointHeatmap(bins=16)
+    from_json.add_pose_json(frames)
+
+    # The same keypoints from an array give the same counts
+    from_array = JointHeatmap(bins=16)
+    from_array.add_sequence(PoseSequence.from_pose_json(frames), chunk_frames=7)
+    assert np.array_equal(from_json.density(), from_array.density())
+    assert from_array.frames == 30
+
+    # Partial heatmaps travel through pickle with their pending keypoints and merge into the total
+    first, second = JointHeatmap(bins=16), JointHeatmap(bins=16)
+    first.add_pose_json(frames[:10])
+    second.add_pose_json(frames[10:])
+    merged = pickle.loads(pickle.dumps(first)).merge(pickle.loads(pickle.dumps(second)))
+    assert np.array_equal(merged.counts, from_json.counts)
+    assert merged.frames == 30
+
+    try:
+        merged.merge(JointHeatmap(bins=8))
+        assert False, "Heatmaps with different bins should not merge"
+    except ValueError:
+        pass
+    print("Heatmap sources and merging test passed")
+
+def test_joint_selectors():
+    assert joint_indices("left_wrist") == [7]
+    assert joint_indices("pose") == list(range(18))
+    assert joint_indices("face") == list(range(18, 88))
+    assert joint_indices("hand_left:0") == [88]
+    assert joint_indices("hand_right:20") == [129]
+    assert len(joint_indices("all")) == 130
+    for selector in ("elbow", "hand_left:21", "pose:x"):
+        try:
+            joint_indices(selector)
+            assert False, f"Selector {selector} should be rejected"
+        except ValueError:
+            pass
+    print("Joint selector test passed")
+
+def test_output():
+    heatmap = JointHeatmap(bins=(8, 4))
+    heatmap.add_pose_json(_frames(20))
+
+    svg = heatmap.to_svg(joint_indices("left_wrist"))
+    assert svg.startswith('<svg width="200" height="100"')
+    assert svg.endswith("</svg>")
+    assert 'fill="#fcffa4"' in svg  # The densest cell gets the last colour
+    assert 0 < svg.count("<rect") <= 1 + 8 * 4
+
+    png = heatmap.to_png(joint_indices("hand_left"), cell_size=3)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (24, 12)
+    idat_length = struct.unpack(">I", png[33:37])[0]
+    assert len(zlib.decompress(png[41:41 + idat_length])) == height * (1 + width * 3)
+
+    empty = JointHeatmap(bins=4)
+    assert empty.to_svg().count("<rect") == 1
+    print("Heatmap output test passed")
+
+def test_aggregator():
+    with tempfile.TemporaryDirectory() as directory:
+        frames = _frames(12)
+        for i, frame in enumerate(frames[:8]):
+            with open(os.path.join(directory, f"frame_{i}.json"), 'w', encoding='utf-8') as f:
+                json.dump([frame], f)
+        with open(os.path.join(directory, "capture.jsonl"), 'w', encoding='utf-8') as f:
+            for frame in frames[8:]:
+                f.write(json.dumps(frame) + "\n")
+            f.write("{ broken\n")
+        with open(os.path.join(directory, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("[")
+
+        expected = JointHeatmap(bins=16)
+        expected.add_pose_json(frames)
+        for processes in (1, 2):
+            report = HeatmapAggregator(bins=16, processes=processes, chunk_files=3).aggregate([directory])
+            print(report.summary())
+            assert report.inputs == 10
+            assert report.heatmap.frames == 12
+            assert np.array_equal(report.heatmap.counts, expected.counts)
+            assert sorted(os.path.basename(name) for name, _ in report.errors) == ["broken.json", "capture.jsonl:5"]
+        print("Heatmap aggregator test passed")
+
+if __name__ == "__main__":
+    try:
+        test_binning()
+        test_sources_and_merging()
+        test_joint_selectors()
+        test_output()
+        test_aggregator()
+        print("\nHeatmap tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
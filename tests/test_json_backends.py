@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+from array import array
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.json_backends import available_json_backends, get_json_backend
+from model.json_parser import PoseJsonParser, ParserError
+from model.svg_renderer import render_pose
+
+POSE_JSON = json.dumps([{
+    'canvas_width': 500,
+    'canvas_height': 500,
+    'people': [{
+        'pose_keypoints_2d': [10.5, 20.5, 0.9, 30.5, 40.5, 0.8],
+        'face_keypoints_2d': [0.1, 0.2, 0.7],
+    }]
+}])
+
+def test_backends_agree():
+    assert get_json_backend().name == available_json_backends()[0].name
+    assert get_json_backend("stdlib").name == "stdlib"
+
+    reference = json.loads(POSE_JSON)
+    for backend in available_json_backends():
+        data, pretty_json = PoseJsonParser(backend).parse_pose_json(POSE_JSON)
+        assert data == reference
+        # The preview is produced from the decoded object and decodes back to it
+        assert json.loads(pretty_json) == reference
+        assert pretty_json == json.dumps(reference, indent=4)
+        try:
+            PoseJsonParser(backend).parse_pose_json("{ broken")
+            assert False, "Should have raised ParserError"
+        except ParserError:
+            pass
+        print(f"Backend {backend.name} test passed")
+
+def test_backends_accept_the_same_documents():
+    # orjson alone rejects these, the json module accepts them
+    special = '[{"canvas_width": 18446744073709551616, "people": [{"pose_keypoints_2d": [NaN, Infinity, 1.0]}]}]'
+    for backend in available_json_backends():
+        data = PoseJsonParser(backend).parse_pose_data(special)
+        assert data[0]['canvas_width'] == 2 ** 64
+        assert data[0]['people'][0]['pose_keypoints_2d'][1] == float('inf')
+    print("Backends accept the same documents test passed")
+
+def test_typed_keypoints():
+    data = PoseJsonParser(typed_keypoints=True).parse_pose_data(POSE_JSON)
+    person = data[0]['people'][0]
+    assert isinstance(person['pose_keypoints_2d'], array)
+    assert list(person['pose_keypoints_2d']) == [10.5, 20.5, 0.9, 30.5, 40.5, 0.8]
+    assert render_pose(data) == render_pose(json.loads(POSE_JSON))
+    print("Typed keypoint buffer test passed")
+
+if __name__ == "__main__":
+    try:
+        test_backends_agree()
+        test_backends_accept_the_same_documents()
+        test_typed_keypoints()
+        print("\nJSON backend tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,118 @@
+import sys
+import os
+import gzip
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.batch import JsonlConverter
+from model.jsonl_reader import JsonlPoseReader, map_chunks_bounded
+from model.svg_renderer import render_pose
+
+def _frame(i):
+    return {'canvas_width': 200, 'canvas_height': 100,
+            'people': [{'pose_keypoints_2d': [10 + i, 10, 1.0, 30, 40 + i, 0.9]}]}
+
+def _write_capture(path, frames=50):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for i in range(frames):
+            f.write(json.dumps(_frame(i)) + "\n")
+            if i == 3:
+                f.write("\n")            # Blank lines are skipped
+                f.write("{ truncated\n")  # A broken line is reported and skipped
+            if i == 7:
+                f.write("[1, 2]\n")      # Valid JSON, but no frame
+
+def test_reader():
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("capture.jsonl", "capture.jsonl.gz"):
+            path = os.path.join(directory, name)
+            _write_capture(path)
+
+            serial = list(JsonlPoseReader(path, chunk_lines=4))
+            parallel = list(JsonlPoseReader(path, chunk_lines=4, workers=2))
+            assert serial == parallel
+            assert len(serial) == 52
+
+            errors = [record for record in serial if record.error is not None]
+            assert [record.line_number for record in errors] == [6]
+            assert errors[0].pose_json_data is None
+
+            frames = [record for record in serial if record.error is None]
+            assert frames[0].pose_json_data == [_frame(0)]
+            assert frames[4].line_number == 7 and frames[4].pose_json_data == [_frame(4)]
+            assert [record.frame_index for record in serial] == list(range(52))
+
+            # A list is taken as the entry list itself; only the renderer can tell it is no frame
+            assert serial[9].line_number == 11 and serial[9].pose_json_data == [1, 2]
+        print("JSONL reader test passed")
+
+def test_invalid_utf8():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.jsonl")
+        with open(path, 'wb') as f:
+            f.write(json.dumps(_frame(0)).encode('utf-8') + b"\n")
+            f.write(b'{"people": "\xff\xfe"}\n')
+            f.write(json.dumps(_frame(1)).encode('utf-8') + b"\n")
+
+        # The broken line becomes an error record; the stream goes on
+        records = list(JsonlPoseReader(path))
+        assert [record.error is None for record in records] == [True, False, True]
+        assert records[1].line_number == 2 and "UTF-8" in records[1].error
+        assert records[2].pose_json_data == [_frame(1)]
+    print("Invalid UTF-8 test passed")
+
+def test_bounded_read_ahead():
+    pulled = []
+
+    def chunks():
+        for i in range(20):
+            pulled.append(i)
+            yield [i]
+
+    with ThreadPoolExecutor(2) as executor:
+        results = map_chunks_bounded(executor, lambda chunk: chunk[0], chunks(), 3)
+        for consumed, result in enumerate(results, start=1):
+            assert result == consumed - 1
+            # Only the window of 3 chunks is read ahead of the consumer
+            assert len(pulled) <= consumed + 3
+    assert len(pulled) == 20
+    print("Bounded read ahead test passed")
+
+def test_converter():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.jsonl")
+        _write_capture(path, frames=20)
+        output_pattern = os.path.join(directory, "svgs", "capture_{:04d}.svg")
+
+        for workers in (1, 2):
+            report = JsonlConverter(workers=workers, chunk_lines=3).convert(path, output_pattern)
+            print(report.summary())
+            assert report.frames == 22
+            assert [line_number for line_number, _ in report.errors] == [6, 11]
+
+            with open(output_pattern.format(0), 'r', encoding='utf-8') as f:
+                assert f.read() == render_pose([_frame(0)])
+            # Frame indices count the non-empty lines, broken ones included
+            with open(output_pattern.format(5), 'r', encoding='utf-8') as f:
+                assert f.read() == render_pose([_frame(4)])
+            assert not os.path.exists(output_pattern.format(4))
+            assert len(os.listdir(os.path.dirname(output_pattern))) == 20
+        print("JSONL converter test passed")
+
+if __name__ == "__main__":
+    try:
+        test_reader()
+        test_invalid_utf8()
+        test_bounded_read_ahead()
+        test_converter()
+        print("\nJSONL tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,103 @@
+import sys
+import os
+import copy
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import KeypointEditor, KeypointRef, RenderStyle, StyledFrame, render_pose
+from model.svg_renderer.keypoint_bones import POSE_KEYPOINT_BONES, HAND_KEYPOINT_BONES, build_keypoint_bones
+
+def _pose_data():
+    return [{'canvas_width': 400, 'canvas_height': 300, 'people': [
+        {'pose_keypoints_2d': [250, 50, 0.9, 250, 100, 0.9]},
+        {
+            'pose_keypoints_2d': [100, 50, 0.9, 100, 100, 0.9, 60, 100, 0.8, 60, 150, 0.7],
+            'face_keypoints_2d': [95, 40, 0.9, 105, 40, 0.9],
+            'hand_left_keypoints_2d': [200, 200, 0.9, 210, 210, 0.9, 220, 220, 0.9],
+        },
+    ]}]
+
+def test_reverse_index():
+    assert build_keypoint_bones([(0, 1), (1, 2), (0, 3)]) == {0: (0, 2), 1: (0, 1), 2: (1,), 3: (2,)}
+    assert POSE_KEYPOINT_BONES[1] == ((1, 2), (1, 5), (1, 8), (1, 11), (1, 0))
+    assert POSE_KEYPOINT_BONES[4] == ((3, 4),)
+    assert HAND_KEYPOINT_BONES[0] == (0, 4, 8, 12, 16)
+    assert HAND_KEYPOINT_BONES[20] == (19,)
+    print("Reverse index test passed")
+
+def test_move_keypoint():
+    pose_data = _pose_data()
+    frame = StyledFrame(pose_data)
+    frame.render(RenderStyle(bone_alpha=0.5))
+    editor = KeypointEditor(frame)
+
+    # The right shoulder of the second person
+    keypoint = editor.hit_test(63, 98, radius=5)
+    assert keypoint == KeypointRef(1, 0, 2)
+    assert editor.hit_test(300, 250, radius=5) is None
+
+    delta = editor.move_keypoint(keypoint, 40, 120)
+    # Only the two bones at the shoulder are drawn again
+    assert sorted(delta.changed) == ["person1_bone_1_2", "person1_bone_2_3"]
+    assert delta.removed == []
+    assert 'fill-opacity:0.5' in delta.changed["person1_bone_1_2"]
+    assert pose_data[0]['people'][1]['pose_keypoints_2d'][6:9] == [40, 120, 0.8]
+    assert editor.keypoint_position(keypoint) == (40, 120)
+    assert frame.render() == render_pose(pose_data, style=RenderStyle(bone_alpha=0.5))
+
+    # Moving the elbow onto the shoulder collapses the arm, which is no longer drawn
+    delta = editor.move_keypoint(KeypointRef(1, 0, 3), 40, 120)
+    assert delta.changed == {} and delta.removed == ["person1_bone_2_3"]
+    delta = editor.move_keypoint(KeypointRef(1, 0, 3), 40, 180)
+    assert list(delta.changed) == ["person1_bone_2_3"]
+
+    # Face points and hand keypoints, clamped to the canvas
+    editor.move_keypoint(KeypointRef(1, 1, 0), 90, 35)
+    delta = editor.move_keypoint(KeypointRef(1, 2, 1), 500, -20)
+    assert sorted(delta.changed) == ["person1_hand_left_0", "person1_hand_left_1"]
+    assert pose_data[0]['people'][1]['hand_left_keypoints_2d'][3:5] == [400, 0]
+    assert frame.render() == render_pose(pose_data, style=RenderStyle(bone_alpha=0.5))
+    print("Move keypoint test passed")
+
+def test_drag_documents():
+    pose_data = _pose_data()
+    frame = StyledFrame(pose_data)
+    editor = KeypointEditor(frame)
+    neck = KeypointRef(0, 0, 1)
+    full = frame.render()
+
+    detached = editor.render_detached(neck)
+    attached = editor.render_attached(neck)
+    assert 'person' not in attached and attached.count('<path') == 1
+    assert detached.count('<path') == full.count('<path') - 1
+    # The frame itself is left as it was
+    assert frame.render() == full
+    print("Drag documents test passed")
+
+def test_normalized_keypoints():
+    pose_data = [{'canvas_width': 200, 'canvas_height': 100, 'people': [
+        {'pose_keypoints_2d': [0.5, 0.2, 0.9, 0.5, 0.6, 0.9]},
+    ]}]
+    original = copy.deepcopy(pose_data)
+    editor = KeypointEditor(StyledFrame(pose_data))
+    keypoint = editor.hit_test(100, 60, radius=1)
+    assert keypoint == KeypointRef(0, 0, 1)
+    editor.move_keypoint(keypoint, 150, 80)
+    # Normalised coordinates are written back normalised
+    assert pose_data[0]['people'][0]['pose_keypoints_2d'][3:5] == [0.75, 0.8]
+    assert pose_data != original
+    print("Normalized keypoints test passed")
+
+if __name__ == "__main__":
+    try:
+        test_reverse_index()
+        test_move_keypoint()
+        test_drag_documents()
+        test_normalized_keypoints()
+        print("\nKeypoint editor tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
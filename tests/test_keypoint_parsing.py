@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from model.svg_renderer import SVGRenderer
+from model.svg_renderer.renderer import parse_keypoints
 from model.svg_renderer.keypoints import KeyPoint
 
 def test_keypoint_parsing():
@@ -29,9 +30,9 @@ def test_keypoint_parsing():
     assert svg.endswith('</svg>')
     print("SVG rendering test passed (no errors during parsing)")
 
-    # Test private __parse_keypoints directly using name mangling
+    # Test the keypoint parsing of the renderer directly
     person = pose_json_data[0]['people'][0]
-    parsed_pose = renderer._SVGRenderer__parse_keypoints(person['pose_keypoints_2d'])
+    parsed_pose = parse_keypoints(person['pose_keypoints_2d'])
     
     assert len(parsed_pose) == 2
     assert parsed_pose[0].x == 10.0
@@ -40,7 +41,7 @@ def test_keypoint_parsing():
     assert parsed_pose[1].x == 30.0
     assert parsed_pose[1].y == 40.0
     assert parsed_pose[1].score == 0.8
-    print("Private __parse_keypoints test passed")
+    print("parse_keypoints test passed")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,58 @@
+import sys
+import os
+import subprocess
+
+# Add project root to sys.path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+def run_fresh(code):
+    """
+    Runs code in a fresh interpreter, so nothing has been imported yet, and returns its output.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {PROJECT_ROOT!r})\n{code}"],
+                          env=env, capture_output=True, text=True, check=True).stdout.split()[-1]
+
+def test_model_singletons():
+    import model
+    import model.file_handler
+    from model import get_file_handler, get_json_parser
+    from model.file_handler import FileHandler
+    from model.json_parser import PoseJsonParser
+    assert isinstance(get_file_handler(), FileHandler)
+    assert isinstance(get_json_parser(), PoseJsonParser)
+    assert get_file_handler() is get_file_handler()
+    # The package attributes of the same names are the plain submodules
+    assert model.file_handler.FileHandler is FileHandler
+    print("Model singletons test passed")
+
+def test_imports_create_nothing():
+    assert run_fresh("import model, viewmodel, view; print('PyQt6' in sys.modules)") == "False"
+    assert run_fresh("from model import render_pose, get_file_handler; get_file_handler(); print('PyQt6' in sys.modules)") == "False"
+    print("Imports create nothing test passed")
+
+def test_gui_singletons():
+    code = """
+from viewmodel import get_main_viewmodel
+from view import get_main_window
+from viewmodel.main_viewmodel import MainViewModel
+from view.main_window import MainWindow
+main_window = get_main_window()
+print(isinstance(main_window, MainWindow) and main_window is get_main_window()
+      and main_window.viewmodel is get_main_viewmodel() and isinstance(get_main_viewmodel(), MainViewModel))
+"""
+    assert run_fresh(code) == "True"
+    print("GUI singletons test passed")
+
+if __name__ == "__main__":
+    try:
+        test_model_singletons()
+        test_imports_create_nothing()
+        test_gui_singletons()
+        print("\nLazy import tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,120 @@
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from model.svg_renderer import render_pose
+from model.svg_renderer.person_stats import compute_person_stats, select_people
+
+def _body(x, y, score, joints=18):
+    keypoints = []
+    for i in range(18):
+        if i < joints:
+            keypoints.extend([x + i * 10, y + i * 5, score])
+        else:
+            keypoints.extend([0.0, 0.0, 0.0])
+    return {'pose_keypoints_2d': keypoints}
+
+def test_person_stats():
+    people = [
+        {'pose_keypoints_2d': [10, 20, 0.8, 30, 60, 0.6, -5, 5, 1.0]},  # Negative x is not drawable
+        {'pose_keypoints_2d': [0.5, 0.5, 0.4], 'face_keypoints_2d': [0.0, 0.0, 0.0]},  # A joint without a bone draws nothing
+        {'pose_keypoints_2d': []},
+    ]
+    stats = compute_person_stats(people, 100, 200)
+
+    assert stats.valid_joints.tolist() == [2, 1, 0]
+    assert abs(stats.mean_score[0] - 0.7) < 1e-9
+    assert abs(stats.mean_score[1] - 0.4) < 1e-9
+    assert stats.mean_score[2] == 0.0
+    assert stats.bounds[0].tolist() == [10.0, 20.0, 20.0, 40.0]
+    assert np.isnan(stats.bounds[1]).all()
+    assert stats.bbox_area.tolist() == [800.0, 0.0, 0.0]
+    assert stats.drawable.tolist() == [True, True, False]
+    print("Person stats test passed")
+
+def test_body_joint_stats():
+    # Face and hand keypoints extend the bounds but are no body joints
+    people = [{
+        'pose_keypoints_2d': [10.0, 10.0, 0.9, 20.0, 10.0, 0.5, 1.0, 2.0],  # Incomplete last keypoint
+        'face_keypoints_2d': [15.0, 5.0, 0.1] * 70,
+        'hand_left_keypoints_2d': None,
+        'hand_right_keypoints_2d': [40.0, 30.0, 1.0] * 21,
+    }, {
+        'hand_left_keypoints_2d': [5.0, 5.0, 1.0] * 21,
+    }]
+    stats = compute_person_stats(people, 500, 500)
+    assert stats.valid_joints.tolist() == [2, 0]
+    assert abs(stats.mean_score[0] - 0.7) < 1e-9
+    assert stats.bounds[0].tolist() == [10.0, 5.0, 30.0, 25.0]
+
+    # A person with hands only is drawn, but has no body joints to pass min_valid_joints
+    assert select_people(stats) == [0, 1]
+    assert select_people(stats, min_valid_joints=1) == [0]
+    assert select_people(stats, top_k=1) == [0]
+    print("Body joint stats test passed")
+
+def test_mixed_coordinates():
+    # A bone is only scaled if both of its end points are normalised; a face point on its own
+    people = [{
+        'pose_keypoints_2d': [0.0, 0.0, 0.0, 0.5, 0.5, 0.9, 300.0, 200.0, 0.9],
+        'face_keypoints_2d': [0.25, 0.5, 0.9],
+    }]
+    stats = compute_person_stats(people, 1000, 1000)
+    assert stats.bounds[0].tolist() == [0.5, 0.5, 299.5, 499.5]
+
+    # The ROI around where the neck would be if scaled on its own holds nothing that is drawn
+    pose_data = [{'canvas_width': 1000, 'canvas_height': 1000, 'people': [dict(people[0], face_keypoints_2d=[])]}]
+    assert '<path' not in render_pose(pose_data, roi=(450, 450, 100, 100))
+    assert 'viewBox="-9.5 -9.5 319.5 219.5"' in render_pose(pose_data, tight_crop=True)
+    print("Mixed coordinates test passed")
+
+def test_select_people():
+    people = [
+        {'pose_keypoints_2d': [v for i in range(18) for v in (i, i, 0.9)]},
+        {'pose_keypoints_2d': [5, 5, 0.1, 6, 6, 0.1]},
+        {'pose_keypoints_2d': [5, 5, 0.9] * 10},
+    ]
+    stats = compute_person_stats(people, 500, 500)
+    assert select_people(stats) == [0, 1, 2]
+    assert select_people(stats, min_mean_score=0.5) == [0, 2]
+    assert select_people(stats, min_valid_joints=5) == [0, 2]
+    assert select_people(stats, top_k=1) == [0]
+    # Kept people stay in their original order
+    assert select_people(stats, top_k=2) == [0, 2]
+    print("Person selection test passed")
+
+def test_renderer_filtering():
+    pose_data = [{
+        'canvas_width': 500,
+        'canvas_height': 500,
+        'people': [_body(100, 100, 0.9), _body(300, 300, 0.05, joints=3), _body(50, 300, 0.9)]
+    }]
+    full = render_pose(pose_data)
+    filtered = render_pose(pose_data, min_mean_score=0.2)
+    top = render_pose(pose_data, top_k=1)
+
+    assert full.count('<path') == filtered.count('<path') + 2
+    # Neck of the low confidence person
+    assert 'M 310,305' in full and 'M 310,305' not in filtered
+    assert top.count('<path') * 2 == filtered.count('<path')
+    # Equal total scores keep the earlier person
+    assert 'M 110,105' in top and 'M 60,305' not in top
+    print("Renderer filtering test passed")
+
+if __name__ == "__main__":
+    try:
+        test_person_stats()
+        test_body_joint_stats()
+        test_mixed_coordinates()
+        test_select_people()
+        test_renderer_filtering()
+        print("\nPerson filtering tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.pose_array_loader import PoseArrayLoader
+from model.svg_renderer import render_pose
+
+def _make_keypoints():
+    # 2 frames, 2 people (the second one is padding), 18 body + 70 face joints
+    keypoints = np.zeros((2, 2, 88, 3), dtype=np.float64)
+    for frame in range(2):
+        for joint in range(18):
+            keypoints[frame, 0, joint] = [100.0 + joint * 5 + frame, 50.0 + joint * 10, 0.9]
+        keypoints[frame, 0, 18] = [0.25, 0.25, 1.0]
+    return keypoints
+
+def _as_json_frame(keypoints, frame):
+    person = keypoints[frame, 0]
+    return [{
+        'canvas_width': 640,
+        'canvas_height': 480,
+        'people': [{
+            'pose_keypoints_2d': person[:18].ravel().tolist(),
+            'face_keypoints_2d': person[18:].ravel().tolist(),
+        }]
+    }]
+
+def test_npz_input():
+    keypoints = _make_keypoints()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "poses.npz")
+        np.savez(path, keypoints=keypoints, canvas_width=640, canvas_height=480)
+
+        sequence = PoseArrayLoader().load(path)
+        assert len(sequence) == 2
+        assert len(sequence.frame(0)['people']) == 1
+
+        for frame in range(2):
+            svg = render_pose([sequence.frame(frame)])
+            assert svg == render_pose(_as_json_frame(keypoints, frame))
+    print("NPZ input test passed")
+
+def test_npy_input_is_memory_mapped():
+    keypoints = _make_keypoints()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "poses.npy")
+        np.save(path, keypoints)
+        with open(os.path.join(directory, "poses.meta.json"), 'w', encoding='utf-8') as f:
+            json.dump({'canvas_width': 640, 'canvas_height': 480, 'layout': [18, 70]}, f)
+
+        sequence = PoseArrayLoader().load(path)
+        assert isinstance(sequence.keypoints, np.memmap)
+        svg = render_pose([sequence.frame(1)])
+        assert svg == render_pose(_as_json_frame(keypoints, 1))
+        del sequence
+    print("NPY memory mapped input test passed")
+
+if __name__ == "__main__":
+    try:
+        test_npz_input()
+        test_npy_input_is_memory_mapped()
+        print("\nPose array input tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,54 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import PoseRenderer, RenderConfig, SVGRenderer, render_pose, render_poses_threaded
+
+def _frame(offset, canvas_size=500):
+    keypoints = [0.0, 0.0, 0.0] * 18
+    keypoints[3:9] = [100.0 + offset, 100.0, 1.0, 150.0 + offset, 130.0, 0.8]
+    return [{'canvas_width': canvas_size, 'canvas_height': canvas_size, 'people': [{'pose_keypoints_2d': keypoints}]}]
+
+def test_renderer_is_immutable():
+    renderer = PoseRenderer(RenderConfig(top_k=1))
+    assert renderer.config.top_k == 1
+    for name, value in (('config', RenderConfig()), ('width', 100)):
+        try:
+            setattr(renderer, name, value)
+            assert False, f"Setting {name} should fail"
+        except AttributeError:
+            pass
+
+    # The default configuration renders everybody on the full canvas
+    assert PoseRenderer().config == RenderConfig()
+    print("Immutability test passed")
+
+def test_one_renderer_many_frames():
+    renderer = PoseRenderer(RenderConfig(tight_crop=True))
+    frames = [_frame(i, canvas_size=300 + i) for i in range(20)]
+
+    # Frames with different canvases rendered by one instance match separate renderers
+    for frame in frames:
+        assert renderer.render(frame) == SVGRenderer(frame, tight_crop=True).render()
+
+    with ThreadPoolExecutor(4) as executor:
+        shared = list(executor.map(renderer.render, frames))
+    assert shared == [render_pose(frame, tight_crop=True) for frame in frames]
+
+    threaded = render_poses_threaded(frames, RenderConfig(tight_crop=True), workers=4)
+    assert [document.decode('utf-8') for document in threaded] == shared
+    print("Shared renderer test passed")
+
+if __name__ == "__main__":
+    try:
+        test_renderer_is_immutable()
+        test_one_renderer_many_frames()
+        print("\nRender config tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
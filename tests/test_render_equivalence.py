@@ -0,0 +1,104 @@
+import sys
+import os
+
+# Add project root and the tests directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from model.svg_renderer import PoseRenderer
+from render_equivalence import ENGINES, generate_cases, normalise_svg, register_engine, run_harness, structural_difference
+
+def test_generated_cases():
+    cases = generate_cases(50, seed=3)
+    names = [case.name for case in cases]
+    for name in ("no_people", "default_canvas", "all_zero_scores", "negative_coordinates", "normalised_bounds",
+                 "truncated_by_one", "missing_hands_and_face", "none_hands_and_face"):
+        assert name in names
+    # Reproducible from the seed
+    assert generate_cases(50, seed=3) == cases
+    assert generate_cases(50, seed=4) != cases
+
+    # The random cases mix normalised and pixel coordinates, zero scores and truncated arrays
+    values = [v for case in cases for person in case.pose_json_data[0]['people'] for v in (person.get('pose_keypoints_2d') or [])]
+    assert any(0 < v < 1 for v in values) and any(v > 1 for v in values) and any(v < 0 for v in values)
+    lengths = [len(person.get('pose_keypoints_2d') or []) for case in cases for person in case.pose_json_data[0]['people']]
+    assert any(length % 3 for length in lengths)
+    print("Generated cases test passed")
+
+def test_normalise_svg():
+    expected = normalise_svg('<svg width="10" height="10"><path d="M 1,2 C 3,4 5,6 7,8" style="fill:red"/></svg>')
+    # Attribute order, whitespace and tiny numeric differences do not matter
+    formatted = normalise_svg(b'<svg height="10.0" width="10">\n\t<path style="fill:red"  d="M 1.0000001,2 C 3,4   5,6 7,8"/>\n</svg>')
+    assert structural_difference(expected, formatted) is None
+
+    assert "expected 7 got 7.5" in structural_difference(expected, normalise_svg('<svg width="10" height="10"><path d="M 1,2 C 3,4 5,6 7.5,8" style="fill:red"/></svg>'))
+    assert "fill:blue" in structural_difference(expected, normalise_svg('<svg width="10" height="10"><path d="M 1,2 C 3,4 5,6 7,8" style="fill:blue"/></svg>'))
+    assert structural_difference(expected, expected[:1]) == "2 elements expected, got 1"
+    print("Normalise SVG test passed")
+
+def test_engines_match_reference():
+    report = run_harness(generate_cases(40, seed=7))
+    print(report.summary())
+    assert [result.engine for result in report.results] == list(ENGINES)
+    assert report.failures == []
+    print("Engines match reference test passed")
+
+def test_detects_differences():
+    def recoloured(pose_json_data, config):
+        return PoseRenderer(config).render(pose_json_data).replace("#FF0000", "#FE0000")
+
+    def shifted(pose_json_data, config):
+        # Merged into one group, so only the pixels can tell whether it still draws the same
+        svg_content = PoseRenderer(config).render(pose_json_data)
+        return svg_content.replace("</defs>", '</defs><g transform="translate(40,0)">', 1).replace("</svg>", "</g></svg>")
+
+    def failing(pose_json_data, config):
+        raise ValueError("Not implemented")
+
+    register_engine("test_recoloured", recoloured)
+    register_engine("test_shifted", shifted, compare_structure=False)
+    register_engine("test_failing", failing)
+    try:
+        report = run_harness(generate_cases(5, seed=1), engines=["test_recoloured", "test_shifted", "test_failing"])
+    finally:
+        for name in ("test_recoloured", "test_shifted", "test_failing"):
+            del ENGINES[name]
+
+    failures = {result.engine: result.failures for result in report.results}
+    assert failures["test_recoloured"]
+    assert all(reason.startswith("element") for _, _, reason in failures["test_recoloured"])
+    if report.pixels:
+        assert any("pixels differ" in reason for _, _, reason in failures["test_shifted"])
+    assert len(failures["test_failing"]) == report.results[2].renders
+    assert "raised ValueError, reference raised None" in failures["test_failing"][0][2]
+    print("Detects differences test passed")
+
+def test_reference_is_independent():
+    # A change to the renderer shows up in every engine, also in SVGRenderer that wraps it
+    draw_bezier_loop = PoseRenderer._PoseRenderer__draw_bezier_loop
+
+    def shifted_loop(self, x1, y1, *args, **kwargs):
+        return draw_bezier_loop(self, x1 + 5, y1, *args, **kwargs)
+
+    PoseRenderer._PoseRenderer__draw_bezier_loop = shifted_loop
+    try:
+        report = run_harness(generate_cases(5, seed=1), engines=["render", "svg_renderer"], pixels=False)
+    finally:
+        PoseRenderer._PoseRenderer__draw_bezier_loop = draw_bezier_loop
+    assert all(result.failures for result in report.results)
+    assert report.failures[0][3].startswith("element")
+    print("Reference is independent test passed")
+
+if __name__ == "__main__":
+    try:
+        test_generated_cases()
+        test_normalise_svg()
+        test_engines_match_reference()
+        test_reference_is_independent()
+        test_detects_differences()
+        print("\nRender equivalence tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
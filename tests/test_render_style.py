@@ -0,0 +1,109 @@
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import PoseRenderer, RenderConfig, RenderStyle, StyledFrame, render_pose
+
+def _pose_data():
+    return [{'canvas_width': 300, 'canvas_height': 200, 'people': [
+        {
+            'pose_keypoints_2d': [100, 50, 0.9, 100, 100, 0.8, 60, 100, 0.7],
+            'face_keypoints_2d': [95, 40, 0.9, 105, 40, 0.9],
+            'hand_left_keypoints_2d': [150, 120, 0.9, 160, 130, 0.9],
+        },
+        {'pose_keypoints_2d': [250, 50, 0.9, 250, 100, 0.8]},
+    ]}]
+
+def test_style_in_markup():
+    default = render_pose(_pose_data())
+    assert render_pose(_pose_data(), style=RenderStyle()) == default
+    assert 'fill-opacity:0.6;stroke:none"' in default
+    assert 'viewBox="0 0 20 20" refX="10"' in default
+
+    style = RenderStyle(bone_alpha=0.25, bone_handle_offset=4, pose_marker_size=12, pose_marker_radius=5,
+                        hand_marker_size=3, face_radius=1.5, face_color="#00ff00", hand_color="#ff00ff",
+                        hand_bone_width=0.5, background="#101010")
+    svg = render_pose(_pose_data(), style=style)
+    assert 'fill-opacity:0.25;stroke:none"' in svg
+    assert 'viewBox="0 0 12 12" refX="6" refY="6" markerWidth="12" markerHeight="12"' in svg
+    assert 'r="5" style="fill:#FF0000;fill-opacity:0.25' in svg
+    assert 'viewBox="0 0 3 3" refX="1.5"' in svg and 'fill:#ff00ff;fill-opacity:1.0' in svg
+    assert 'r="1.5" style="fill:#00ff00;stroke:none"' in svg
+    assert 'stroke-width="0.5"' in svg
+    assert 'fill="#101010"' in svg
+    # The handles of the vertical neck bone point 4 pixels to the side
+    assert 'd="M 100,100 C 104.0,100.0 104.0,50.0 100,50 C 96.0,50.0 96.0,100.0 100,100"' in svg
+    print("Style in markup test passed")
+
+def test_styled_frame():
+    frame = StyledFrame(_pose_data())
+    assert frame.render() == render_pose(_pose_data())
+
+    # Every combination of cached and redrawn parts gives the document of a fresh rendering
+    styles = [
+        RenderStyle(hand_color="#ff0000", background="white"),
+        RenderStyle(hand_color="#ff0000", bone_alpha=0.3),
+        RenderStyle(face_color="#123456", bone_alpha=0.3),
+        RenderStyle(hand_bone_width=4, pose_marker_radius=3),
+        RenderStyle(),
+    ]
+    for style in styles:
+        assert frame.render(style) == render_pose(_pose_data(), style=style)
+    assert frame.render_bytes(styles[0]) == render_pose(_pose_data(), style=styles[0]).encode('utf-8')
+    print("Styled frame test passed")
+
+def test_repaint_without_formatting():
+    frame = StyledFrame(_pose_data())
+    frame.render()
+
+    drawn_parts = []
+    draw_part = PoseRenderer.draw_part
+    def counting_draw_part(self, elements, part, element_ids=False):
+        drawn_parts.append(part)
+        return draw_part(self, elements, part, element_ids)
+
+    PoseRenderer.draw_part = counting_draw_part
+    try:
+        # The bone alpha and the face colour are replaced in the kept markup
+        style = RenderStyle(bone_alpha=0.35, face_color="#abcdef", hand_color="#ff0000")
+        svg = frame.render(style)
+        assert drawn_parts == []
+        radius_style = style._replace(face_radius=3)
+        radius_svg = frame.render(radius_style)
+        assert drawn_parts == [1, 1]
+    finally:
+        PoseRenderer.draw_part = draw_part
+    assert svg == render_pose(_pose_data(), style=style)
+    assert radius_svg == render_pose(_pose_data(), style=radius_style)
+    print("Repaint without formatting test passed")
+
+def test_styled_frame_crop():
+    config = RenderConfig(tight_crop=True)
+    frame = StyledFrame(_pose_data(), config)
+    assert frame.render() == render_pose(_pose_data(), tight_crop=True)
+
+    # Wider loops reach further, so the cropped region grows with them
+    wide = RenderStyle(bone_handle_offset=30)
+    assert wide.extent() == 30
+    svg = frame.render(wide)
+    assert svg == render_pose(_pose_data(), tight_crop=True, style=wide)
+    assert 'viewBox="30 10 ' in svg
+    # Without a style, the last one is used again
+    assert frame.render() == svg
+    assert frame.render(RenderStyle()) == render_pose(_pose_data(), tight_crop=True)
+    print("Styled frame crop test passed")
+
+if __name__ == "__main__":
+    try:
+        test_style_in_markup()
+        test_styled_frame()
+        test_repaint_without_formatting()
+        test_styled_frame_crop()
+        print("\nRender style tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
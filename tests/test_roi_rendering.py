@@ -0,0 +1,88 @@
+import sys
+import os
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.svg_renderer import render_pose
+import model.svg_renderer.renderer as renderer_module
+from model.svg_renderer.person_bounds import indices_in_region, padded_bounds, union_bounds
+
+def _person(x, y):
+    # Neck (1) and right shoulder (2) form one bone
+    keypoints = [0.0, 0.0, 0.0] * 18
+    keypoints[3:9] = [x, y, 1.0, x + 50, y + 20, 1.0]
+    return {'pose_keypoints_2d': keypoints}
+
+POSE_DATA = [{
+    'canvas_width': 1000,
+    'canvas_height': 1000,
+    'people': [_person(100, 100), _person(700, 700), _person(120, 600)]
+}]
+
+def test_person_bounds():
+    nan = float('nan')
+    bounds = np.array([(0, 0, 10, 10), (nan, nan, nan, nan), (200, 200, 50, 50), (5, 5, 300, 10)], dtype=float)
+    assert indices_in_region(bounds, (0, 0, 20, 20)) == [0, 3]
+    assert indices_in_region(bounds, (210, 205, 5, 5)) == [2]
+    assert indices_in_region(bounds, (250, 10, 5, 5)) == [3]
+    assert indices_in_region(bounds, (500, 500, 10, 10)) == []
+    assert union_bounds(np.array([(0, 0, 10, 10), (nan, nan, nan, nan), (20, 30, 5, 5)])) == (0, 0, 25, 35)
+    assert union_bounds(np.zeros((0, 4))) is None
+    assert padded_bounds(bounds, 10)[0].tolist() == [-10, -10, 30, 30]
+    print("Person bounds test passed")
+
+def test_only_drawn_people_are_parsed():
+    # The people outside the region are selected from their raw keypoint arrays and never parsed
+    parsed = []
+    original = renderer_module.parse_keypoints
+
+    def counting_parse_keypoints(keypoint_array):
+        parsed.append(keypoint_array)
+        return original(keypoint_array)
+
+    renderer_module.parse_keypoints = counting_parse_keypoints
+    try:
+        roi = render_pose(POSE_DATA, roi=(0, 0, 300, 300))
+    finally:
+        renderer_module.parse_keypoints = original
+    assert roi.count('<path') == 1
+    # Pose, face and both hands of the first person only
+    assert len(parsed) == 4
+    print("Only drawn people parsed test passed")
+
+def test_roi_rendering():
+    full = render_pose(POSE_DATA)
+    assert full.count('<path') == 3
+    assert '<svg width="1000" height="1000" xmlns' in full
+
+    roi = render_pose(POSE_DATA, roi=(0, 0, 300, 300))
+    assert roi.count('<path') == 1
+    assert '<svg width="300" height="300" viewBox="0 0 300 300"' in roi
+    assert 'M 100,100' in roi
+    print("ROI rendering test passed")
+
+def test_tight_crop():
+    cropped = render_pose(POSE_DATA, tight_crop=True)
+    assert cropped.count('<path') == 3
+    # Union of all bones, padded by the margin of 10
+    assert 'viewBox="90 90 670 640"' in cropped
+
+    empty = render_pose([{'canvas_width': 200, 'canvas_height': 100, 'people': []}], tight_crop=True)
+    assert 'viewBox="0 0 200 100"' in empty
+    print("Tight crop test passed")
+
+if __name__ == "__main__":
+    try:
+        test_person_bounds()
+        test_only_drawn_people_are_parsed()
+        test_roi_rendering()
+        test_tight_crop()
+        print("\nROI rendering tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,91 @@
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import model.batch.shared_sequence as shared_sequence
+from model.batch import SharedSequenceRenderer
+from model.pose_array_loader import PoseArrayLoader, PoseSequence
+from model.svg_renderer import render_pose_bytes
+
+def _make_sequence(frames):
+    # Two people walking to the right, body pose only
+    keypoints = np.zeros((frames, 2, 18, 3), dtype=np.float64)
+    for frame in range(frames):
+        for person in range(2):
+            for joint in range(18):
+                keypoints[frame, person, joint] = [50.0 + frame + person * 200 + joint * 5, 40.0 + joint * 12, 0.9]
+    return PoseSequence(keypoints, canvas_width=640, canvas_height=480)
+
+def test_shared_render():
+    sequence = _make_sequence(10)
+    with tempfile.TemporaryDirectory() as directory:
+        renderer = SharedSequenceRenderer(processes=2, chunk_size=3)
+        report = renderer.render(sequence, os.path.join(directory, "svg", "frame_{:03d}.svg"))
+
+        assert report.errors == []
+        assert len(report.output_paths) == 10
+        assert report.output_paths[7].endswith("frame_007.svg")
+        for index, path in enumerate(report.output_paths):
+            with open(path, 'rb') as f:
+                assert f.read() == render_pose_bytes([sequence.frame(index)])
+        assert "Rendered 10 of 10 frames" in report.summary()
+    print("Shared render test passed")
+
+def test_render_options_and_pattern():
+    sequence = _make_sequence(4)
+    with tempfile.TemporaryDirectory() as directory:
+        renderer = SharedSequenceRenderer(processes=2, render_options={'top_k': 1})
+        report = renderer.render(sequence, os.path.join(directory, "{}.svg"))
+        with open(report.output_paths[2], 'rb') as f:
+            assert f.read() == render_pose_bytes([sequence.frame(2)], top_k=1)
+
+        smoothing = {'window_length': 3, 'polyorder': 1}
+        report = SharedSequenceRenderer(processes=2, smoothing=smoothing).render(sequence, os.path.join(directory, "s{}.svg"))
+        with open(report.output_paths[2], 'rb') as f:
+            assert f.read() == render_pose_bytes([sequence.smoothed(**smoothing).frame(2)])
+
+        try:
+            renderer.render(sequence, os.path.join(directory, "same.svg"))
+            assert False, "A pattern without placeholder should be rejected"
+        except ValueError:
+            pass
+    print("Render options test passed")
+
+def test_memory_mapped_sequence():
+    # A float32 file is memory-mapped and copied into the shared block a few frames at a time
+    sequence = _make_sequence(7)
+    copy_chunk_frames = shared_sequence.COPY_CHUNK_FRAMES
+    shared_sequence.COPY_CHUNK_FRAMES = 3
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            array_path = os.path.join(directory, "poses.npy")
+            np.save(array_path, sequence.keypoints.astype(np.float32))
+            mapped = PoseArrayLoader().load(array_path)
+            assert isinstance(mapped.keypoints, np.memmap)
+
+            report = SharedSequenceRenderer(processes=2).render(mapped, os.path.join(directory, "frame_{}.svg"))
+            assert report.errors == []
+            for index, path in enumerate(report.output_paths):
+                with open(path, 'rb') as f:
+                    assert f.read() == render_pose_bytes([mapped.frame(index)])
+            del mapped
+    finally:
+        shared_sequence.COPY_CHUNK_FRAMES = copy_chunk_frames
+    print("Memory-mapped sequence test passed")
+
+if __name__ == "__main__":
+    try:
+        test_shared_render()
+        test_render_options_and_pattern()
+        test_memory_mapped_sequence()
+        print("\nShared sequence tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,101 @@
+import sys
+import os
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.smoothing import savgol_smooth
+from model.pose_array_loader import PoseSequence
+
+def _trajectory(frames, slope=2.0):
+    keypoints = np.zeros((frames, 1, 2, 3))
+    t = np.arange(frames, dtype=np.float64)
+    keypoints[:, 0, 0] = np.stack([100 + slope * t, 50 + t, np.full(frames, 0.9)], axis=1)
+    keypoints[:, 0, 1] = np.stack([200 + t, 80 - 0.5 * t, np.full(frames, 0.8)], axis=1)
+    return keypoints
+
+def test_linear_motion_is_preserved():
+    keypoints = _trajectory(20)
+    smoothed = savgol_smooth(keypoints, window_length=5, polyorder=2)
+    assert np.allclose(smoothed, keypoints)
+    print("Linear motion test passed")
+
+def test_jitter_is_reduced():
+    rng = np.random.default_rng(0)
+    clean = _trajectory(200)
+    noisy = clean.copy()
+    noisy[..., :2] += rng.normal(0, 3, noisy[..., :2].shape)
+    smoothed = savgol_smooth(noisy, window_length=9, polyorder=2)
+    assert np.abs(smoothed - clean)[..., :2].mean() < 0.6 * np.abs(noisy - clean)[..., :2].mean()
+    assert np.array_equal(smoothed[..., 2], noisy[..., 2])
+    print("Jitter reduction test passed")
+
+def test_missing_joints():
+    keypoints = _trajectory(15)
+    keypoints[7, 0, 0] = [0.0, 0.0, 0.0]    # Dropped detection
+    keypoints[3, 0, 1, 2] = 0.0              # Zero score with coordinates
+    smoothed = savgol_smooth(keypoints, window_length=5, polyorder=1)
+
+    # Missing joints are untouched and do not pull their neighbours towards (0, 0)
+    assert np.array_equal(smoothed[7, 0, 0], [0.0, 0.0, 0.0])
+    assert np.array_equal(smoothed[3, 0, 1], keypoints[3, 0, 1])
+    assert np.allclose(smoothed[6:9:2, 0, 0], keypoints[6:9:2, 0, 0])
+    assert np.allclose(smoothed[2:5:2, 0, 1], keypoints[2:5:2, 0, 1])
+
+    # Too few samples for a fit leaves the keypoint as it is
+    sparse = np.zeros((5, 1, 1, 3))
+    sparse[2, 0, 0] = [10.0, 20.0, 1.0]
+    assert np.array_equal(savgol_smooth(sparse, window_length=5, polyorder=2), sparse)
+    print("Missing joints test passed")
+
+def test_coordinates_keep_their_range():
+    # A normalised wrist jerks out and back; the fit must not overshoot the canvas
+    keypoints = np.zeros((9, 1, 2, 3))
+    keypoints[..., 2] = 1.0
+    keypoints[:, 0, 0, :2] = [0.99, 0.5]
+    keypoints[4, 0, 0, :2] = [0.2, 0.5]
+    keypoints[:, 0, 1, :2] = [3.0, 40.0]
+    keypoints[4, 0, 1, :2] = [300.0, 40.0]
+    smoothed = savgol_smooth(keypoints, window_length=5, polyorder=2)
+    assert (smoothed[:, 0, 0, :2] <= 1.0).all() and (smoothed[..., :2] >= 0).all()
+
+    # With the canvas, a trajectory that switches units is fitted in pixels
+    mixed = np.ones((7, 1, 1, 3))
+    mixed[:, 0, 0, :2] = [[0.25, 0.5], [100.0, 100.0]] * 3 + [[0.25, 0.5]]
+    smoothed = savgol_smooth(mixed, window_length=3, polyorder=1, canvas_size=(400, 200))
+    assert np.allclose(smoothed, mixed)
+    print("Coordinate range test passed")
+
+def test_sequence_from_pose_json():
+    pose_data = [
+        {'canvas_width': 640, 'canvas_height': 480, 'people': [
+            {'pose_keypoints_2d': [10.0, 20.0, 0.9] * 18},
+            {'pose_keypoints_2d': [30.0, 40.0, 0.5] * 18, 'hand_left_keypoints_2d': [1.0, 2.0, 0.7] * 21},
+        ]},
+        {'people': [{'pose_keypoints_2d': [12.0, 22.0, 0.9] * 18}]},
+    ]
+    sequence = PoseSequence.from_pose_json(pose_data)
+    assert sequence.keypoints.shape == (2, 2, 39, 3)
+    assert [name for name, start, stop in sequence.parts if stop > start] == ['pose_keypoints_2d', 'hand_left_keypoints_2d']
+
+    frame = sequence.smoothed(window_length=3, polyorder=1).frame(1)
+    assert frame['canvas_width'] == 640
+    assert len(frame['people']) == 1
+    assert frame['people'][0]['pose_keypoints_2d'].shape == (18, 3)
+    print("Sequence from pose JSON test passed")
+
+if __name__ == "__main__":
+    try:
+        test_linear_motion_is_preserved()
+        test_jitter_is_reduced()
+        test_missing_joints()
+        test_coordinates_keep_their_range()
+        test_sequence_from_pose_json()
+        print("\nSmoothing tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -4,7 +4,7 @@ import os
 # Add the project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from model.svg_renderer import render_pose
+from model.svg_renderer import render_pose, render_pose_bytes
 
 def test_svg_renderer():
     # Test 1: OpenPose list format (one entry)
@@ -49,6 +49,13 @@ def test_svg_renderer():
     assert '500' in svg_4 or '500.0' in svg_4
     print("Test 4 Passed")
 
+    # Test 5: UTF-8 bytes output matches the string output
+    print("\nTest 5: UTF-8 bytes output")
+    svg_5 = render_pose_bytes(pose_data_4)
+    assert isinstance(svg_5, bytearray)
+    assert svg_5 == svg_4.encode('utf-8')
+    print("Test 5 Passed")
+
 if __name__ == "__main__":
     try:
         test_svg_renderer()
@@ -0,0 +1,98 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.thumbnail_cache import ThumbnailCache, thumbnail_key
+
+def test_thumbnail_key():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pose.json")
+        with open(path, 'w') as f:
+            f.write("[]")
+        key = thumbnail_key(path, "160x120")
+        assert key == thumbnail_key(path, "160x120")
+        assert key != thumbnail_key(path, "80x60")
+
+        # A changed file gets a new key
+        with open(path, 'w') as f:
+            f.write("[{}]")
+        assert thumbnail_key(path, "160x120") != key
+        changed = thumbnail_key(path, "160x120")
+        os.utime(path, ns=(0, 0))
+        assert thumbnail_key(path, "160x120") != changed
+    print("Thumbnail key test passed")
+
+def test_get_put():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ThumbnailCache(tmp, max_bytes=1000)
+        assert cache.get("a") is None
+        cache.put("a", b"x" * 100)
+        assert cache.get("a") == b"x" * 100
+        assert "a" in cache and len(cache) == 1 and cache.total_bytes == 100
+
+        # Replacing an entry does not count it twice
+        cache.put("a", b"y" * 50)
+        assert cache.get("a") == b"y" * 50 and cache.total_bytes == 50
+        assert not [name for name in os.listdir(tmp) if name.endswith(".tmp")]
+
+        cache.clear()
+        assert len(cache) == 0 and cache.total_bytes == 0 and os.listdir(tmp) == []
+
+        # A failed write leaves neither an entry nor its temporary file behind
+        os.mkdir(os.path.join(tmp, "b.thumb"))
+        cache.put("b", b"x" * 100)
+        assert "b" not in cache and os.listdir(tmp) == ["b.thumb"]
+    print("Get/put test passed")
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ThumbnailCache(tmp, max_bytes=300)
+        for key in "abc":
+            cache.put(key, b"x" * 100)
+        # A hit makes "a" the most recently used, so "b" is evicted first
+        assert cache.get("a") is not None
+        cache.put("d", b"x" * 100)
+        assert "b" not in cache and cache.get("b") is None
+        assert all(key in cache for key in "acd")
+        assert cache.total_bytes == 300
+        assert len(os.listdir(tmp)) == 3
+    print("LRU eviction test passed")
+
+def test_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ThumbnailCache(tmp, max_bytes=300)
+        for key in "abc":
+            cache.put(key, b"x" * 100)
+            # Distinct modification times, as between real thumbnails
+            os.utime(os.path.join(tmp, key + ".thumb"), ns=(time.time_ns(), time.time_ns() + ord(key)))
+        os.utime(os.path.join(tmp, "a.thumb"), ns=(time.time_ns(), time.time_ns() + 1000))
+
+        # The recency order is restored from the files: "b" is the oldest
+        reopened = ThumbnailCache(tmp, max_bytes=300)
+        assert len(reopened) == 3 and reopened.total_bytes == 300
+        assert reopened.get("c") == b"x" * 100
+        reopened.put("d", b"x" * 100)
+        assert "b" not in reopened and "a" in reopened
+
+        # Entries removed by another instance are misses
+        os.remove(os.path.join(tmp, "a.thumb"))
+        assert reopened.get("a") is None and "a" not in reopened
+        assert reopened.total_bytes == 200
+    print("Persistence test passed")
+
+if __name__ == "__main__":
+    try:
+        test_thumbnail_key()
+        test_get_put()
+        test_lru_eviction()
+        test_persistence()
+        print("\nThumbnail cache tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,94 @@
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from model.file_handler import FileHandler
+from model.json_parser import PoseJsonParser
+from model.thumbnail_cache import ThumbnailCache
+from viewmodel.thumbnail_list_model import RenderThumbnailTask, ThumbnailListModel
+
+# Kept for the whole run; pixmaps need the application
+app = QApplication.instance() or QApplication(sys.argv)
+
+def _write_pose_files(directory, count):
+    for i in range(count):
+        with open(os.path.join(directory, f"frame_{i:02d}.json"), 'w', encoding='utf-8') as f:
+            json.dump([{'canvas_width': 100, 'canvas_height': 100,
+                        'people': [{'pose_keypoints_2d': [10, 10, 1.0, 50, 50, 1.0]}]}], f)
+
+def _process_events_until(condition, timeout=10):
+    started = time.time()
+    while not condition() and time.time() - started < timeout:
+        app.processEvents()
+        time.sleep(0.01)
+    assert condition(), "Thumbnails were not rendered"
+
+def test_scrolling_renders_every_row_once():
+    with tempfile.TemporaryDirectory() as pose_dir, tempfile.TemporaryDirectory() as cache_dir:
+        _write_pose_files(pose_dir, 20)
+        rendered_rows = []
+        release = threading.Event()
+        render = RenderThumbnailTask._RenderThumbnailTask__render
+
+        def blocking_render(task):
+            rendered_rows.append(task.row)
+            release.wait(10)
+            return render(task)
+
+        RenderThumbnailTask._RenderThumbnailTask__render = blocking_render
+        model = ThumbnailListModel(FileHandler(), PoseJsonParser(), ThumbnailCache(cache_dir))
+        try:
+            model.pool.setMaxThreadCount(1)
+            emitted_rows = []
+            model.render_signals.thumbnail_rendered.connect(lambda generation, row, image: emitted_rows.append(row))
+            model.set_directory(pose_dir)
+            model.set_visible_rows(0, 3)
+            _process_events_until(lambda: rendered_rows == [0])
+
+            # Row 0 is running and rows 1 to 3 are queued; scrolling on does not queue them again
+            model.set_visible_rows(0, 5)
+            release.set()
+            _process_events_until(lambda: len(emitted_rows) >= 6 and model.pool.activeThreadCount() == 0)
+            app.processEvents()
+            assert sorted(emitted_rows) == list(range(6))
+
+            # Scrolling away takes back the queued rows; the running one finishes
+            release.clear()
+            model.set_visible_rows(8, 10)
+            _process_events_until(lambda: rendered_rows[-1:] == [8])
+            model.set_visible_rows(15, 15)
+            release.set()
+            _process_events_until(lambda: 15 in emitted_rows and model.pool.activeThreadCount() == 0)
+            app.processEvents()
+            assert rendered_rows == [0, 1, 2, 3, 4, 5, 8, 15]
+            assert model.data(model.index(8), Qt.ItemDataRole.DecorationRole) is not None
+
+            # Rows that come back into view are rendered
+            model.set_visible_rows(8, 10)
+            _process_events_until(lambda: all(model.data(model.index(row), Qt.ItemDataRole.DecorationRole) is not None
+                                              for row in range(8, 11)))
+            assert sorted(emitted_rows) == [0, 1, 2, 3, 4, 5, 8, 9, 10, 15]
+        finally:
+            release.set()
+            RenderThumbnailTask._RenderThumbnailTask__render = render
+            model.shutdown()
+    print("Scrolling renders every row once test passed")
+
+if __name__ == "__main__":
+    try:
+        test_scrolling_renders_every_row_once()
+        print("\nThumbnail list model tests passed successfully!")
+    except Exception as e:
+        print(f"\nTests failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,5 +1,7 @@
 import sys
 import os
+import gzip
+import lzma
 import unittest
 
 # Add project root to sys.path
@@ -14,8 +16,9 @@ class TestFileHandler(unittest.TestCase):
         self.test_content = "Hello, Save!"
 
     def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        for path in (self.test_file, "test_save.json.xz", "test_save.svgz"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_save_and_load(self):
         print("Testing save and load...")
@@ -35,5 +38,47 @@ class TestFileHandler(unittest.TestCase):
         self.assertIn("File is too large", str(cm.exception))
         print("File too large test passed")
 
+    def test_compressed_load(self):
+        print("Testing compressed load...")
+        content = '[{"people": []}]' * 1000
+        with lzma.open("test_save.json.xz", 'wt', encoding='utf-8') as f:
+            f.write(content)
+        self.assertEqual(self.handler.load_text_file("test_save.json.xz"), content)
+        print("Compressed load test passed")
+
+    def test_compressed_file_too_large(self):
+        print("Testing compressed file too large...")
+        # Compresses to a few hundred bytes, the limit applies to the decompressed text
+        with lzma.open("test_save.json.xz", 'wt', encoding='utf-8') as f:
+            f.write("A" * (FileHandler.MAX_FILE_SIZE + 1))
+        with self.assertRaises(ModelError) as cm:
+            self.handler.load_text_file("test_save.json.xz")
+        self.assertIn("File is too large", str(cm.exception))
+        print("Compressed file too large test passed")
+
+    def test_compressed_limit_counts_bytes(self):
+        print("Testing compressed size limit in bytes...")
+        # Two bytes per character: under the limit in characters, over it in bytes
+        with lzma.open("test_save.json.xz", 'wt', encoding='utf-8') as f:
+            f.write("\u00e9" * (FileHandler.MAX_FILE_SIZE // 2 + 1))
+        with self.assertRaises(ModelError) as cm:
+            self.handler.load_text_file("test_save.json.xz")
+        self.assertIn("File is too large", str(cm.exception))
+
+        # Characters split across read chunks are decoded whole
+        content = "A" + "\u00e9" * 40000
+        with lzma.open("test_save.json.xz", 'wt', encoding='utf-8') as f:
+            f.write(content)
+        self.assertEqual(self.handler.load_text_file("test_save.json.xz"), content)
+        print("Compressed size limit in bytes test passed")
+
+    def test_save_svgz_fragments(self):
+        print("Testing svgz save from fragments...")
+        fragments = ["<svg>", "<g/>" * 100, "</svg>"]
+        self.handler.save_text_file("test_save.svgz", iter(fragments))
+        with gzip.open("test_save.svgz", 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "".join(fragments))
+        print("Svgz save test passed")
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,20 @@
-from viewmodel import main_viewmodel
-from .main_window import MainWindow
+import sys
 
-# Instantiate the MainWindow with dependencies
-# NOTE: QApplication must be created before importing this module
-main_window = MainWindow(main_viewmodel)
+# The window is created on first use, not when the package is imported
+_main_window = None
+
+
+def get_main_window():
+    """
+    Returns the MainWindow of the application, created on first use together with the
+    QApplication (if there is none yet) and the MainViewModel.
+    """
+    global _main_window
+    if _main_window is None:
+        from PyQt6.QtWidgets import QApplication
+        # Created before the viewmodel, whose timers and thread pools need it; the window keeps it
+        app = QApplication.instance() or QApplication(sys.argv)
+        from viewmodel import get_main_viewmodel
+        from .main_window import MainWindow
+        _main_window = MainWindow(get_main_viewmodel())
+    return _main_window
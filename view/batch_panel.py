@@ -0,0 +1,136 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QProgressBar, QFileDialog
+)
+from PyQt6.QtCore import Qt
+from viewmodel.processing_state import ProcessingState
+
+
+def format_duration(seconds):
+    """
+    Formats a duration as m:ss or h:mm:ss, e.g. for the time left of a batch.
+    """
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class BatchPanel(QDialog):
+    """
+    Converts many pose files to SVG through the batch queue of the viewmodel. Files and
+    folders are dropped onto the panel or added with the buttons, and can be added while
+    a batch is running. Errors are listed in the panel instead of popping up one by one.
+    Not modal, so the main window stays usable while a batch runs.
+    """
+
+    def __init__(self, viewmodel, parent=None):
+        super().__init__(parent)
+        self.viewmodel = viewmodel
+        self.queue = viewmodel.batch_queue
+        self.output_dir = None
+        self.setWindowTitle("Batch Conversion")
+        self.resize(700, 450)
+        self.setAcceptDrops(True)
+
+        layout = QVBoxLayout(self)
+        output_layout = QHBoxLayout()
+        self.output_button = QPushButton("Output Folder...")
+        self.output_label = QLabel("No output folder chosen")
+        output_layout.addWidget(self.output_button)
+        output_layout.addWidget(self.output_label, 1)
+        layout.addLayout(output_layout)
+
+        self.drop_label = QLabel("Drop JSON files or folders here")
+        self.drop_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.drop_label.setMinimumHeight(80)
+        self.drop_label.setStyleSheet("border: 2px dashed #888; color: #666; font-size: 16px;")
+        layout.addWidget(self.drop_label)
+
+        add_layout = QHBoxLayout()
+        self.add_files_button = QPushButton("Add Files...")
+        self.add_folder_button = QPushButton("Add Folder...")
+        self.cancel_button = QPushButton("Cancel")
+        add_layout.addWidget(self.add_files_button)
+        add_layout.addWidget(self.add_folder_button)
+        add_layout.addStretch()
+        add_layout.addWidget(self.cancel_button)
+        layout.addLayout(add_layout)
+
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel("Idle")
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+
+        layout.addWidget(QLabel("Errors:"))
+        self.error_list = QListWidget()
+        layout.addWidget(self.error_list, 1)
+
+        self.output_button.clicked.connect(self.choose_output_dir)
+        self.add_files_button.clicked.connect(self.on_add_files_clicked)
+        self.add_folder_button.clicked.connect(self.on_add_folder_clicked)
+        self.cancel_button.clicked.connect(self.queue.cancel)
+        self.queue.state_changed.connect(self.on_batch_state_changed)
+        self.queue.progress_changed.connect(self.on_progress_changed)
+        self.queue.item_failed.connect(self.on_item_failed)
+        self.on_batch_state_changed(self.queue.state)
+
+    def choose_output_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "Choose Output Folder", self.output_dir or "")
+        if directory:
+            self.output_dir = directory
+            self.output_label.setText(directory)
+        return self.output_dir
+
+    def add_inputs(self, input_paths):
+        if not input_paths:
+            return
+        if self.output_dir is None and self.choose_output_dir() is None:
+            return
+        if self.viewmodel.add_batch_inputs(input_paths, self.output_dir) == 0:
+            self.status_label.setText("No pose files found")
+
+    def on_add_files_clicked(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Add JSON Files",
+            "",
+            "JSON Files (*.json *.json.gz *.json.bz2 *.json.xz);;All Files (*)"
+        )
+        self.add_inputs(file_paths)
+
+    def on_add_folder_clicked(self):
+        directory = QFileDialog.getExistingDirectory(self, "Add Folder")
+        if directory:
+            self.add_inputs([directory])
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        self.add_inputs([url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()])
+        event.acceptProposedAction()
+
+    def on_batch_state_changed(self, state):
+        self.cancel_button.setEnabled(state == ProcessingState.BATCH_RUNNING)
+        if state == ProcessingState.BATCH_RUNNING and self.queue.progress().done == 0:
+            self.error_list.clear()
+        elif state == ProcessingState.BATCH_CANCELLING:
+            self.status_label.setText("Cancelling...")
+
+    def on_progress_changed(self, progress):
+        self.progress_bar.setMaximum(max(progress.total, 1))
+        self.progress_bar.setValue(progress.done)
+        status = f"{progress.done} / {progress.total} files"
+        if progress.failed:
+            status += f", {progress.failed} failed"
+        if progress.files_per_second > 0:
+            status += f" - {progress.files_per_second:.1f} files/s"
+        if self.queue.is_running() and progress.eta_seconds is not None:
+            status += f", {format_duration(progress.eta_seconds)} left"
+        self.status_label.setText(status)
+
+    def on_item_failed(self, result):
+        self.error_list.addItem(f"{result.input_path}: {result.error}")
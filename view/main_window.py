@@ -1,14 +1,19 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
     QPushButton, QPlainTextEdit, QScrollArea, QLabel, QSplitter, QSizePolicy, QFrame,
-    QFileDialog, QMessageBox, QApplication
+    QFileDialog, QMessageBox, QApplication, QSlider
 )
 import sys
-from PyQt6.QtCore import Qt, QTimer, QByteArray, QRectF
+from PyQt6.QtCore import Qt, QTimer, QSize, QEvent
 from PyQt6.QtGui import QPainter, QPixmap
 from PyQt6.QtSvg import QSvgRenderer
 from viewmodel.error import ViewModelError
 from viewmodel.processing_state import ProcessingState
+from viewmodel.svg_rasterizer import fit_rect
+# Dialogs are imported when they are opened the first time, to keep start-up short
+
+# How close to a keypoint a click has to be to drag it, in screen pixels
+KEYPOINT_HIT_RADIUS = 8
 
 class ViewError(Exception):
     """Generic exception for the view layer."""
@@ -21,7 +26,12 @@ class MainWindow(QMainWindow):
             self.app = QApplication(sys.argv)
         super().__init__()
         self.viewmodel = viewmodel
-        self.current_svg_content = None # Store SVG for re-rendering on resize
+        self.current_svg_content = None # Store SVG (QByteArray) for saving
+        self.svg_renderer = None # Parsed SVG, reused for re-rendering on resize
+        self.settings_dialog = None # Created when the settings are opened the first time
+        self.thumbnail_browser = None # Created when a folder is browsed the first time
+        self.batch_panel = None # Created when the batch queue is opened the first time
+        self.drag_base_pixmap = None # Preview without the dragged elements while a keypoint is dragged
         self.init_ui()
         
     def init_ui(self):
@@ -57,6 +67,8 @@ class MainWindow(QMainWindow):
         self.scroll_area.setWidgetResizable(True)
         self.image_label = QLabel("Graphic Preview Area")
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Keypoints are dragged with the mouse in the preview
+        self.image_label.installEventFilter(self)
         self.scroll_area.setWidget(self.image_label)
         
         # Add widgets directly to splitter
@@ -75,6 +87,22 @@ class MainWindow(QMainWindow):
         
         # Ensure splitter takes all available vertical space
         main_layout.addWidget(self.splitter, 1)
+
+        # --- Timeline for multi-frame files, hidden for single poses ---
+        self.timeline_container = QWidget()
+        timeline_layout = QHBoxLayout(self.timeline_container)
+        timeline_layout.setContentsMargins(0, 5, 0, 0)
+        self.play_button = QPushButton("▶")
+        self.play_button.setFixedWidth(50)
+        self.frame_slider = QSlider(Qt.Orientation.Horizontal)
+        self.frame_label = QLabel()
+        self.frame_label.setMinimumWidth(100)
+        self.frame_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        timeline_layout.addWidget(self.play_button)
+        timeline_layout.addWidget(self.frame_slider, 1)
+        timeline_layout.addWidget(self.frame_label)
+        self.timeline_container.setVisible(False)
+        main_layout.addWidget(self.timeline_container)
         
         # --- Bottom Bar with Buttons ---
         bottom_container = QWidget()
@@ -88,8 +116,11 @@ class MainWindow(QMainWindow):
         self.left_btn_layout.setContentsMargins(0, 5, 0, 5)
         self.load_json_button = QPushButton("Load JSON")
         self.load_json_button.setStyleSheet("font-size: 18px; padding: 5px 15px;")
+        self.browse_button = QPushButton("Browse Folder")
+        self.browse_button.setStyleSheet("font-size: 18px; padding: 5px 15px;")
         self.left_btn_layout.addStretch()
         self.left_btn_layout.addWidget(self.load_json_button)
+        self.left_btn_layout.addWidget(self.browse_button)
         self.left_btn_layout.addStretch()
         
         # Settings button (symbol only)
@@ -104,8 +135,11 @@ class MainWindow(QMainWindow):
         self.right_btn_layout.setContentsMargins(0, 5, 0, 5)
         self.save_svg_button = QPushButton("Save SVG")
         self.save_svg_button.setStyleSheet("font-size: 18px; padding: 5px 15px;")
+        self.batch_button = QPushButton("Batch...")
+        self.batch_button.setStyleSheet("font-size: 18px; padding: 5px 15px;")
         self.right_btn_layout.addStretch()
         self.right_btn_layout.addWidget(self.save_svg_button)
+        self.right_btn_layout.addWidget(self.batch_button)
         self.right_btn_layout.addStretch()
         
         bottom_layout.addWidget(self.left_btn_container)
@@ -116,7 +150,10 @@ class MainWindow(QMainWindow):
 
         # Set minimum sizes for panels based on buttons
         # We add a buffer to ensure the settings button (50px) has enough space centered on the handle
-        btn_min_width = self.load_json_button.sizeHint().width() + 20
+        btn_min_width = max(
+            self.load_json_button.sizeHint().width() + self.browse_button.sizeHint().width(),
+            self.save_svg_button.sizeHint().width() + self.batch_button.sizeHint().width()
+        ) + 20
         # The container width must be at least btn_min, but the panel in the splitter
         # should also account for the fact that the settings button overlaps it.
         panel_min = btn_min_width + 25 # settings_width // 2
@@ -126,6 +163,9 @@ class MainWindow(QMainWindow):
         
         self.load_json_button.clicked.connect(self.on_load_json_clicked)
         self.save_svg_button.clicked.connect(self.on_save_svg_clicked)
+        self.settings_button.clicked.connect(self.on_settings_clicked)
+        self.browse_button.clicked.connect(self.on_browse_clicked)
+        self.batch_button.clicked.connect(self.on_batch_clicked)
         
         self.splitter.splitterMoved.connect(self.update_bottom_alignment)
         self.splitter.splitterMoved.connect(lambda: QTimer.singleShot(10, self._render_svg))
@@ -135,6 +175,17 @@ class MainWindow(QMainWindow):
         self.viewmodel.on_load_error.connect(self.on_load_error)
         self.viewmodel.on_svg_ready.connect(self.on_svg_ready)
         self.viewmodel.on_state_changed.connect(self.on_processing_state_changed)
+        self.viewmodel.on_drag_started.connect(self.on_drag_started)
+        self.viewmodel.on_drag_moved.connect(self.on_drag_moved)
+
+        # Connect the sequence player; frames are rendered in the background and arrive as pixmaps
+        player = self.viewmodel.sequence_player
+        player.sequence_changed.connect(self.on_sequence_changed)
+        player.frame_changed.connect(self.on_frame_changed)
+        player.frame_shown.connect(self.on_frame_shown)
+        player.playing_changed.connect(self.on_playing_changed)
+        self.play_button.clicked.connect(player.toggle_playback)
+        self.frame_slider.valueChanged.connect(player.seek)
         
         # Initialize UI state
         self.on_processing_state_changed(ProcessingState.APP_START)
@@ -142,6 +193,10 @@ class MainWindow(QMainWindow):
         # Use QTimer to ensure alignment happens after the layout is calculated
         QTimer.singleShot(0, self.update_bottom_alignment)
 
+    def closeEvent(self, event):
+        self.viewmodel.shutdown()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         # Use QTimer to decouple resize from layout calculation to prevent feedback loops
@@ -174,11 +229,97 @@ class MainWindow(QMainWindow):
             self,
             "Open JSON File",
             "",
-            "JSON Files (*.json);;All Files (*)"
+            "JSON Files (*.json *.json.gz *.json.bz2 *.json.xz);;All Files (*)"
         )
         if file_path:
             self.viewmodel.load_json(file_path)
 
+    def eventFilter(self, watched, event):
+        if watched is self.image_label and self.svg_renderer is not None:
+            event_type = event.type()
+            if event_type == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+                position = self._canvas_position(event.position())
+                if position is not None:
+                    # Hits within a few screen pixels, whatever the zoom
+                    radius = KEYPOINT_HIT_RADIUS * self.svg_renderer.viewBoxF().width() / self._preview_rect().width()
+                    if self.viewmodel.begin_keypoint_drag(position[0], position[1], radius):
+                        return True
+            elif event_type == QEvent.Type.MouseMove and self.drag_base_pixmap is not None:
+                position = self._canvas_position(event.position())
+                if position is not None:
+                    self.viewmodel.drag_keypoint(*position)
+                return True
+            elif event_type == QEvent.Type.MouseButtonRelease and self.drag_base_pixmap is not None:
+                self.drag_base_pixmap = None
+                self.viewmodel.end_keypoint_drag()
+                return True
+        return super().eventFilter(watched, event)
+
+    def _preview_rect(self):
+        """
+        Returns the rectangle the SVG is drawn into on the preview pixmap.
+        """
+        pixmap = self.image_label.pixmap()
+        return fit_rect(self.svg_renderer.defaultSize(), pixmap.width(), pixmap.height())
+
+    def _canvas_position(self, label_position):
+        """
+        Maps a position on the preview label to canvas coordinates, None outside the pose.
+        """
+        pixmap = self.image_label.pixmap()
+        if pixmap is None or pixmap.isNull() or not self.svg_renderer.defaultSize().isValid():
+            return None
+        # The pixmap is centred on the label
+        x = label_position.x() - (self.image_label.width() - pixmap.width()) // 2
+        y = label_position.y() - (self.image_label.height() - pixmap.height()) // 2
+        target = self._preview_rect()
+        view_box = self.svg_renderer.viewBoxF()
+        return (view_box.x() + (x - target.x()) * view_box.width() / target.width(),
+                view_box.y() + (y - target.y()) * view_box.height() / target.height())
+
+    def on_drag_started(self, static_svg, dragged_svg):
+        # Everything that stays put is drawn once; every move only draws the dragged elements over it
+        pixmap = self.image_label.pixmap()
+        self.drag_base_pixmap = QPixmap(pixmap.size())
+        self.drag_base_pixmap.fill(Qt.GlobalColor.white)
+        painter = QPainter(self.drag_base_pixmap)
+        QSvgRenderer(static_svg).render(painter, self._preview_rect())
+        painter.end()
+        self.on_drag_moved(dragged_svg)
+
+    def on_drag_moved(self, dragged_svg):
+        if self.drag_base_pixmap is None:
+            return
+        pixmap = QPixmap(self.drag_base_pixmap)
+        painter = QPainter(pixmap)
+        QSvgRenderer(dragged_svg).render(painter, self._preview_rect())
+        painter.end()
+        self.image_label.setPixmap(pixmap)
+
+    def on_browse_clicked(self):
+        if self.thumbnail_browser is None:
+            from .thumbnail_browser import ThumbnailBrowser
+            self.thumbnail_browser = ThumbnailBrowser(self.viewmodel, self)
+        self.thumbnail_browser.show()
+        self.thumbnail_browser.raise_()
+        if self.thumbnail_browser.model.directory is None:
+            self.thumbnail_browser.on_choose_folder_clicked()
+
+    def on_batch_clicked(self):
+        if self.batch_panel is None:
+            from .batch_panel import BatchPanel
+            self.batch_panel = BatchPanel(self.viewmodel, self)
+        self.batch_panel.show()
+        self.batch_panel.raise_()
+
+    def on_settings_clicked(self):
+        # Not modal, so the preview can be watched while the style is changed
+        if self.settings_dialog is None:
+            from .settings_dialog import SettingsDialog
+            self.settings_dialog = SettingsDialog(self.viewmodel, self)
+        self.settings_dialog.show()
+        self.settings_dialog.raise_()
+
     def on_json_loaded(self, content):
         self.json_text_edit.setPlainText(content)
 
@@ -189,23 +330,62 @@ class MainWindow(QMainWindow):
     def on_save_svg_clicked(self):
         if not self.current_svg_content:
             return
+
+        # For sequences, save the frame under the playhead
+        svg_content = self.current_svg_content
+        if self.viewmodel.sequence_player.has_sequence():
+            svg_content = self.viewmodel.sequence_player.current_frame_svg()
             
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save SVG File",
             "pose.svg",
-            "SVG Files (*.svg);;All Files (*)"
+            "SVG Files (*.svg);;Compressed SVG Files (*.svgz);;All Files (*)"
         )
         if file_path:
-            self.viewmodel.save_svg(file_path, self.current_svg_content)
+            self.viewmodel.save_svg(file_path, svg_content)
 
     def on_svg_ready(self, svg_content):
         print("[View] SVG content received")
+        # The QByteArray is shared with the worker that rendered it, no copy is made
         self.current_svg_content = svg_content
+        self.svg_renderer = QSvgRenderer(svg_content)
         self._render_svg()
 
+    def on_sequence_changed(self, frame_count):
+        self.timeline_container.setVisible(frame_count > 1)
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setRange(0, max(0, frame_count - 1))
+        self.frame_slider.setValue(0)
+        self.frame_slider.blockSignals(False)
+        self.on_frame_changed(0)
+        # Hand the viewport size to the player so it starts prefetching
+        QTimer.singleShot(0, self._render_svg)
+
+    def on_frame_changed(self, index):
+        # Moving the slider programmatically must not seek again
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setValue(index)
+        self.frame_slider.blockSignals(False)
+        self.frame_label.setText(f"{index + 1} / {self.viewmodel.sequence_player.frame_count}")
+
+    def on_frame_shown(self, index, pixmap):
+        if self.viewmodel.sequence_player.has_sequence():
+            self.image_label.setPixmap(pixmap)
+
+    def on_playing_changed(self, playing):
+        self.play_button.setText("⏸" if playing else "▶")
+
     def _render_svg(self):
-        if not self.current_svg_content:
+        if self.svg_renderer is None:
+            return
+
+        if self.viewmodel.sequence_player.has_sequence():
+            # Sequence frames are rendered by the player's background pool at the viewport size
+            viewport_size = self.scroll_area.viewport().size()
+            self.viewmodel.sequence_player.set_viewport_size(
+                QSize(max(10, viewport_size.width() - 2), max(10, viewport_size.height() - 2))
+            )
             return
             
         print("[View] Rendering SVG to viewport size (preserving aspect ratio)...")
@@ -217,8 +397,7 @@ class MainWindow(QMainWindow):
         w = max(10, viewport_size.width() - 2)
         h = max(10, viewport_size.height() - 2)
             
-        # Create a renderer from the SVG string
-        renderer = QSvgRenderer(QByteArray(self.current_svg_content.encode('utf-8')))
+        renderer = self.svg_renderer
         
         pixmap = QPixmap(w, h)
         pixmap.fill(Qt.GlobalColor.white)
@@ -228,22 +407,7 @@ class MainWindow(QMainWindow):
         # Calculate aspect ratio preserving rectangle
         svg_size = renderer.defaultSize()
         if svg_size.isValid():
-            # Calculate the scale factor
-            target_rect = QRectF(0, 0, w, h)
-            aspect_ratio = svg_size.width() / svg_size.height()
-            
-            if w / h > aspect_ratio:
-                # Viewport is wider than SVG - scale by height
-                new_w = h * aspect_ratio
-                target_rect.setX((w - new_w) / 2)
-                target_rect.setWidth(new_w)
-            else:
-                # Viewport is taller than SVG - scale by width
-                new_h = w / aspect_ratio
-                target_rect.setY((h - new_h) / 2)
-                target_rect.setHeight(new_h)
-            
-            renderer.render(painter, target_rect)
+            renderer.render(painter, fit_rect(svg_size, w, h))
         else:
             # Fallback if svg size is invalid
             renderer.render(painter)
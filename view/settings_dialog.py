@@ -0,0 +1,81 @@
+from PyQt6.QtWidgets import (
+    QDialog, QFormLayout, QVBoxLayout, QDoubleSpinBox, QPushButton, QColorDialog, QDialogButtonBox
+)
+from PyQt6.QtGui import QColor
+
+# (field, label, minimum, maximum, step) of the numeric style fields
+NUMBER_FIELDS = [
+    ("bone_alpha", "Bone opacity", 0.0, 1.0, 0.05),
+    ("bone_handle_offset", "Bone width", 0.0, 100.0, 1.0),
+    ("pose_marker_size", "Pose marker size", 0.0, 100.0, 1.0),
+    ("pose_marker_radius", "Pose marker radius", 0.0, 50.0, 0.5),
+    ("hand_marker_size", "Hand marker size", 0.0, 50.0, 0.5),
+    ("hand_marker_radius", "Hand marker radius", 0.0, 25.0, 0.5),
+    ("hand_bone_width", "Hand line width", 0.0, 20.0, 0.5),
+    ("face_radius", "Face point radius", 0.0, 20.0, 0.5),
+]
+
+# (field, label) of the colour style fields
+COLOR_FIELDS = [
+    ("face_color", "Face points"),
+    ("hand_color", "Hand markers"),
+    ("background", "Background"),
+]
+
+
+class SettingsDialog(QDialog):
+    """
+    Edits the render style of the viewmodel. Every change is applied right away, so the
+    preview follows while the dialog is open.
+    """
+
+    def __init__(self, viewmodel, parent=None):
+        super().__init__(parent)
+        self.viewmodel = viewmodel
+        self.setWindowTitle("Render Settings")
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        self.spin_boxes = {}
+        for field, label, minimum, maximum, step in NUMBER_FIELDS:
+            spin_box = QDoubleSpinBox()
+            spin_box.setRange(minimum, maximum)
+            spin_box.setSingleStep(step)
+            spin_box.setDecimals(2)
+            spin_box.valueChanged.connect(lambda value, field=field: self.viewmodel.update_render_style(**{field: value}))
+            form.addRow(label, spin_box)
+            self.spin_boxes[field] = spin_box
+
+        self.color_buttons = {}
+        for field, label in COLOR_FIELDS:
+            button = QPushButton()
+            button.clicked.connect(lambda checked=False, field=field: self.choose_color(field))
+            form.addRow(label, button)
+            self.color_buttons[field] = button
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.RestoreDefaults | QDialogButtonBox.StandardButton.Close)
+        buttons.button(QDialogButtonBox.StandardButton.RestoreDefaults).clicked.connect(self.viewmodel.reset_render_style)
+        buttons.rejected.connect(self.close)
+        layout.addWidget(buttons)
+
+        self.viewmodel.on_render_style_changed.connect(self.show_style)
+        self.show_style(self.viewmodel.render_style)
+
+    def choose_color(self, field):
+        color = QColorDialog.getColor(QColor(getattr(self.viewmodel.render_style, field)), self, "Choose Colour")
+        if color.isValid():
+            self.viewmodel.update_render_style(**{field: color.name()})
+
+    def show_style(self, style):
+        for field, spin_box in self.spin_boxes.items():
+            # Showing the style must not change it again
+            spin_box.blockSignals(True)
+            spin_box.setValue(getattr(style, field))
+            spin_box.blockSignals(False)
+
+        for field, button in self.color_buttons.items():
+            color = getattr(style, field)
+            button.setText(QColor(color).name())
+            button.setStyleSheet(f"background-color: {color}; color: {'black' if QColor(color).lightness() > 127 else 'white'};")
@@ -0,0 +1,79 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListView, QFileDialog, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QSize, QTimer
+from viewmodel.thumbnail_list_model import THUMBNAIL_SIZE
+
+
+class ThumbnailBrowser(QDialog):
+    """
+    A grid of thumbnails of the pose files in a folder. Clicking a thumbnail opens the
+    file in the main preview. Not modal, so it can stay open next to the main window.
+    """
+
+    def __init__(self, viewmodel, parent=None):
+        super().__init__(parent)
+        self.viewmodel = viewmodel
+        self.model = viewmodel.thumbnails
+        self.setWindowTitle("Browse Folder")
+        self.resize(900, 650)
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        self.folder_button = QPushButton("Choose Folder...")
+        self.folder_label = QLabel("No folder chosen")
+        top_layout.addWidget(self.folder_button)
+        top_layout.addWidget(self.folder_label, 1)
+        layout.addLayout(top_layout)
+
+        self.list_view = QListView()
+        self.list_view.setViewMode(QListView.ViewMode.IconMode)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_view.setMovement(QListView.Movement.Static)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.list_view.setIconSize(THUMBNAIL_SIZE)
+        self.list_view.setGridSize(QSize(THUMBNAIL_SIZE.width() + 20, THUMBNAIL_SIZE.height() + 40))
+        # Every cell has the same size, so the layout needs no size hint per file
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.model)
+        layout.addWidget(self.list_view, 1)
+
+        self.folder_button.clicked.connect(self.on_choose_folder_clicked)
+        self.list_view.clicked.connect(lambda index: self.viewmodel.open_thumbnail(index.row()))
+        self.list_view.verticalScrollBar().valueChanged.connect(self.schedule_visible_rows_update)
+        self.model.modelReset.connect(self.schedule_visible_rows_update)
+
+        # Scrolling fires many events; the visible rows are reported once it settles for a moment
+        self.visible_rows_timer = QTimer(self)
+        self.visible_rows_timer.setSingleShot(True)
+        self.visible_rows_timer.setInterval(30)
+        self.visible_rows_timer.timeout.connect(self.update_visible_rows)
+
+    def browse(self, directory):
+        count = self.viewmodel.browse_directory(directory)
+        self.folder_label.setText(f"{directory} ({count} files)")
+
+    def on_choose_folder_clicked(self):
+        directory = QFileDialog.getExistingDirectory(self, "Choose Folder", self.model.directory or "")
+        if directory:
+            self.browse(directory)
+
+    def schedule_visible_rows_update(self):
+        self.visible_rows_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_visible_rows_update()
+
+    def update_visible_rows(self):
+        rows = self.model.rowCount()
+        if not rows:
+            return
+        # Cells are laid out left to right on the grid; the first cell's rectangle moves with the scroll position
+        viewport = self.list_view.viewport().rect()
+        grid = self.list_view.gridSize()
+        top = self.list_view.visualRect(self.model.index(0)).top()
+        columns = max(1, viewport.width() // grid.width())
+        first_grid_row = max(0, -top // grid.height())
+        last_grid_row = (viewport.height() - top) // grid.height()
+        self.model.set_visible_rows(first_grid_row * columns, (last_grid_row + 1) * columns - 1)
@@ -1,5 +1,16 @@
-from model import file_handler, json_parser
-from .main_viewmodel import MainViewModel
+# Nothing is imported or created here, so Qt-free modules such as processing_state can be
+# used without PyQt6, and importing the package does not start anything
+_main_viewmodel = None
 
-# Instantiate the ViewModel with its dependencies when the module is loaded
-main_viewmodel = MainViewModel(file_handler, json_parser)
+
+def get_main_viewmodel():
+    """
+    Returns the MainViewModel of the application, created with the default model
+    handlers on first use.
+    """
+    global _main_viewmodel
+    if _main_viewmodel is None:
+        from model import get_file_handler, get_json_parser
+        from .main_viewmodel import MainViewModel
+        _main_viewmodel = MainViewModel(get_file_handler(), get_json_parser())
+    return _main_viewmodel
@@ -0,0 +1,209 @@
+import os
+from collections import deque
+from typing import NamedTuple, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QElapsedTimer, pyqtSignal
+from model.batch.pipeline import BatchItemResult, build_jobs
+from model.svg_renderer import RenderStyle, render_pose_bytes
+from .processing_state import ProcessingState
+
+
+class BatchProgress(NamedTuple):
+    """
+    Progress of the batch queue. Counts cover every file queued since the queue was last idle.
+    """
+    done: int                        # Converted and failed files
+    failed: int
+    total: int
+    files_per_second: float
+    eta_seconds: Optional[float]     # None until the throughput is known
+
+
+class _BatchSignals(QObject):
+    """Signals of the conversion tasks. The object lives in the GUI thread, so the slots run there."""
+    job_finished = pyqtSignal(int, object)  # generation, BatchItemResult, None for a dropped task
+
+
+class ConvertFileTask(QRunnable):
+    """
+    Converts one pose file to an SVG file in the thread pool.
+    Tasks of a cancelled batch are dropped when they start, but still report back.
+    """
+
+    def __init__(self, queue, generation, job, render_style):
+        super().__init__()
+        self.queue = queue
+        self.generation = generation
+        self.job = job
+        self.render_style = render_style
+
+    def run(self):
+        queue = self.queue
+        if not queue.is_current(self.generation):
+            queue.batch_signals.job_finished.emit(self.generation, None)
+            return
+
+        error = None
+        try:
+            pose_data = queue.json_parser.parse_pose_data(queue.file_handler.load_text_file(self.job.input_path))
+            # Inputs with the same name from different folders go to subfolders, see build_jobs()
+            os.makedirs(os.path.dirname(self.job.output_path) or ".", exist_ok=True)
+            queue.file_handler.save_bytes_file(self.job.output_path, render_pose_bytes(pose_data, style=self.render_style))
+        except Exception as e:
+            error = str(e)
+        queue.batch_signals.job_finished.emit(self.generation, BatchItemResult(self.job.input_path, self.job.output_path, error))
+
+
+class BatchQueue(QObject):
+    """
+    Converts many pose files to SVG in the background, e.g. files dropped onto the batch panel.
+
+    Files can be added while a batch is running. They are converted by a bounded thread pool,
+    and only a few tasks per worker are queued in the pool at a time, so a cancelled batch
+    stops quickly. A failing file does not stop the batch: its error is collected in errors
+    and reported through item_failed instead of a message box.
+
+    Progress, throughput and the estimated time left are reported a few times per second
+    rather than per file, so a fast batch does not flood the GUI thread with updates.
+    """
+    state_changed = pyqtSignal(ProcessingState)  # BATCH_RUNNING, BATCH_CANCELLING or BATCH_FINISHED
+    progress_changed = pyqtSignal(object)        # BatchProgress
+    item_failed = pyqtSignal(object)             # BatchItemResult with the error
+
+    def __init__(self, file_handler, json_parser, workers=None, progress_interval=250):
+        """
+        Args:
+            workers: Maximum number of files converted at the same time, defaults to the
+                number of cores minus one for the GUI thread.
+            progress_interval: Milliseconds between progress updates while running.
+        """
+        super().__init__()
+        self.file_handler = file_handler
+        self.json_parser = json_parser
+        self.render_style = RenderStyle()
+
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(workers or max(1, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.max_in_flight = self.pool.maxThreadCount() * 2
+        self.batch_signals = _BatchSignals()
+        self.batch_signals.job_finished.connect(self.__on_job_finished)
+
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(progress_interval)
+        self.progress_timer.timeout.connect(self.__emit_progress)
+        self.clock = QElapsedTimer()
+
+        self.state = ProcessingState.BATCH_FINISHED
+        self.errors = []
+        self.__generation = 0
+        self.__jobs = deque()
+        self.__in_flight = 0
+        self.__done = 0
+        self.__failed = 0
+        self.__total = 0
+
+    def add_inputs(self, input_paths, output_dir):
+        """
+        Queues the given files and the pose files in the given directories (not recursive).
+        Every SVG is written to output_dir under the name of its input, see build_jobs().
+
+        Returns:
+            int: The number of files queued.
+
+        Raises:
+            ValueError: If two of the inputs would be converted to the same SVG file.
+        """
+        jobs = build_jobs(input_paths, output_dir)
+        if not jobs:
+            return 0
+        if self.state == ProcessingState.BATCH_FINISHED:
+            # A new batch: counts and errors start over
+            self.errors = []
+            self.__done = self.__failed = self.__total = 0
+            self.clock.start()
+            self.__set_state(ProcessingState.BATCH_RUNNING)
+            self.progress_timer.start()
+
+        print(f"[BatchQueue] Queued {len(jobs)} files")
+        self.__jobs.extend(jobs)
+        self.__total += len(jobs)
+        self.__schedule()
+        self.__emit_progress()
+        return len(jobs)
+
+    def set_render_style(self, style):
+        """
+        Sets the style of the SVGs. Files that are already being converted keep the old one.
+        """
+        self.render_style = style
+
+    def is_running(self):
+        return self.state != ProcessingState.BATCH_FINISHED
+
+    def is_current(self, generation):
+        """
+        Called from the pool: whether a task still belongs to the running batch.
+        """
+        return generation == self.__generation
+
+    def progress(self):
+        elapsed = self.clock.elapsed() / 1000 if self.clock.isValid() else 0.0
+        files_per_second = self.__done / elapsed if elapsed > 0 else 0.0
+        eta_seconds = None
+        if files_per_second > 0:
+            eta_seconds = (self.__total - self.__done) / files_per_second
+        return BatchProgress(self.__done, self.__failed, self.__total, files_per_second, eta_seconds)
+
+    def cancel(self):
+        """
+        Drops the files that have not been started. Files being converted are finished.
+        """
+        if not self.is_running():
+            return
+        print(f"[BatchQueue] Cancelled, {len(self.__jobs)} files dropped")
+        self.__generation += 1
+        self.__total -= len(self.__jobs)
+        self.__jobs.clear()
+        self.__set_state(ProcessingState.BATCH_CANCELLING)
+        self.__finish_if_idle()
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
+
+    def __schedule(self):
+        while self.__jobs and self.__in_flight < self.max_in_flight:
+            self.__in_flight += 1
+            self.pool.start(ConvertFileTask(self, self.__generation, self.__jobs.popleft(), self.render_style))
+
+    def __on_job_finished(self, generation, result):
+        self.__in_flight -= 1
+        if result is None:
+            # Dropped by cancel() before it started
+            self.__total -= 1
+        else:
+            # Files that were being converted when the batch was cancelled still count
+            self.__done += 1
+            if result.error is not None:
+                print(f"[BatchQueue] Failed to convert {result.input_path}: {result.error}")
+                self.__failed += 1
+                self.errors.append(result)
+                self.item_failed.emit(result)
+        if generation == self.__generation:
+            self.__schedule()
+        self.__finish_if_idle()
+
+    def __finish_if_idle(self):
+        if self.__jobs or self.__in_flight > 0 or not self.is_running():
+            return
+        self.progress_timer.stop()
+        print(f"[BatchQueue] Finished: {self.__done} files, {self.__failed} failed")
+        self.__set_state(ProcessingState.BATCH_FINISHED)
+        self.__emit_progress()
+
+    def __emit_progress(self):
+        self.progress_changed.emit(self.progress())
+
+    def __set_state(self, state):
+        self.state = state
+        self.state_changed.emit(state)
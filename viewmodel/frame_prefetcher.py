@@ -0,0 +1,163 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from model.svg_renderer import RenderStyle, render_pose_bytes
+from .frame_ring_buffer import FrameRingBuffer, prefetch_order
+from .svg_rasterizer import rasterize_svg
+
+class _RenderSignals(QObject):
+    """Signals of the render tasks. The object lives in the GUI thread, so the slots run there."""
+    frame_rendered = pyqtSignal(int, int, QImage)  # generation, frame index, image
+    frame_skipped = pyqtSignal(int, int)           # generation, frame index
+
+
+class RenderFrameTask(QRunnable):
+    """
+    Loads, renders and rasterises one frame in the thread pool.
+    Tasks whose frame is no longer wanted when they start are skipped.
+    """
+
+    def __init__(self, prefetcher, frame_source, frame_index, size, render_style, generation):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.frame_source = frame_source
+        self.frame_index = frame_index
+        self.size = size
+        self.render_style = render_style
+        self.generation = generation
+
+    def run(self):
+        signals = self.prefetcher.render_signals
+        if not self.prefetcher.is_wanted(self.generation, self.frame_index):
+            signals.frame_skipped.emit(self.generation, self.frame_index)
+            return
+
+        try:
+            svg_content = render_pose_bytes(self.frame_source.frame(self.frame_index), style=self.render_style)
+            image = rasterize_svg(svg_content, self.size.width(), self.size.height())
+        except Exception as e:
+            print(f"[Prefetcher] Failed to render frame {self.frame_index}: {e}")
+            signals.frame_skipped.emit(self.generation, self.frame_index)
+            return
+        signals.frame_rendered.emit(self.generation, self.frame_index, image)
+
+
+class FramePrefetcher(QObject):
+    """
+    Renders the frames around the playhead ahead of time in a thread pool.
+
+    Frames are rendered to QImage in the pool and converted to QPixmap in the GUI thread,
+    where they are kept in a FrameRingBuffer. Only a few tasks are queued at a time, so a
+    moving playhead changes the priorities quickly. Tasks and results for frames that are
+    no longer around the playhead are dropped.
+    """
+    frame_ready = pyqtSignal(int)
+
+    def __init__(self, capacity=48, ahead=24, behind=8):
+        super().__init__()
+        self.ahead = ahead
+        self.behind = behind
+        self.buffer = FrameRingBuffer(capacity)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.max_in_flight = self.pool.maxThreadCount() * 2
+
+        self.render_signals = _RenderSignals()
+        self.render_signals.frame_rendered.connect(self.__on_frame_rendered)
+        self.render_signals.frame_skipped.connect(self.__on_frame_skipped)
+
+        self.frame_source = None
+        self.frame_count = 0
+        self.size = QSize()
+        self.render_style = RenderStyle()
+        self.playhead = 0
+        self.direction = 1
+        self.__generation = 0
+        self.__wanted = set()
+        self.__pending = set()
+
+    def set_source(self, frame_source):
+        """
+        Switches to another sequence and drops everything rendered for the previous one.
+        """
+        self.frame_source = frame_source
+        self.frame_count = len(frame_source) if frame_source is not None else 0
+        self.playhead = 0
+        self.__invalidate()
+
+    def set_size(self, size):
+        """
+        Sets the size of the rendered frames. A new size invalidates all buffered frames.
+        """
+        if size == self.size:
+            return
+        self.size = QSize(size)
+        self.__invalidate()
+
+    def set_render_style(self, style):
+        """
+        Sets the style of the rendered frames. A new style invalidates all buffered frames.
+        """
+        if style == self.render_style:
+            return
+        self.render_style = style
+        self.__invalidate()
+
+    def set_playhead(self, index, direction=1):
+        self.playhead = index
+        self.direction = direction
+        self.__schedule()
+
+    def pixmap(self, index):
+        return self.buffer.get(index)
+
+    def is_wanted(self, generation, index):
+        """
+        Called from the pool: whether a task is still worth running.
+        """
+        return generation == self.__generation and index in self.__wanted
+
+    def shutdown(self):
+        self.set_source(None)
+        self.pool.waitForDone()
+
+    def __invalidate(self):
+        self.__generation += 1
+        self.pool.clear()
+        self.buffer.clear()
+        self.__pending.clear()
+        self.__schedule()
+
+    def __schedule(self):
+        if self.frame_source is None or self.size.isEmpty():
+            self.__wanted = set()
+            return
+
+        order = prefetch_order(self.playhead, self.frame_count, self.ahead, self.behind, self.direction)
+        # A new set object, so tasks in the pool never see it half updated
+        self.__wanted = set(order)
+
+        for index in order:
+            if len(self.__pending) >= self.max_in_flight:
+                break
+            if index in self.buffer or index in self.__pending:
+                continue
+            self.__pending.add(index)
+            self.pool.start(RenderFrameTask(self, self.frame_source, index, self.size, self.render_style, self.__generation))
+
+    def __on_frame_rendered(self, generation, index, image):
+        if generation != self.__generation:
+            return
+        self.__pending.discard(index)
+
+        # Drop frames the playhead has already moved away from
+        if index in self.__wanted:
+            self.buffer.put(index, QPixmap.fromImage(image), self.playhead)
+            if index in self.buffer:
+                self.frame_ready.emit(index)
+        self.__schedule()
+
+    def __on_frame_skipped(self, generation, index):
+        if generation != self.__generation:
+            return
+        self.__pending.discard(index)
+        self.__schedule()
@@ -0,0 +1,68 @@
+class FrameRingBuffer:
+    """
+    Bounded store of rendered frames around a playhead.
+
+    When the buffer is full, the frame farthest from the playhead is evicted. During playback
+    the buffered window therefore slides along with the playhead like a ring buffer, and after
+    a jump the frames of the old neighbourhood are the first to go.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.__frames = {}
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def __contains__(self, index):
+        return index in self.__frames
+
+    def get(self, index):
+        return self.__frames.get(index)
+
+    def put(self, index, frame, playhead):
+        """
+        Stores a frame and evicts the frame farthest from the playhead if the buffer is full.
+        A new frame that is itself the farthest one is not stored.
+
+        Returns:
+            int or None: The index of the frame that was evicted or not stored.
+        """
+        if index in self.__frames or len(self.__frames) < self.capacity:
+            self.__frames[index] = frame
+            return None
+
+        farthest = max(self.__frames, key=lambda i: abs(i - playhead))
+        if abs(farthest - playhead) <= abs(index - playhead):
+            return index
+
+        del self.__frames[farthest]
+        self.__frames[index] = frame
+        return farthest
+
+    def clear(self):
+        self.__frames.clear()
+
+    def indices(self):
+        return sorted(self.__frames)
+
+
+def prefetch_order(playhead, frame_count, ahead, behind, direction=1):
+    """
+    Returns the frames that should be buffered around the playhead, most urgent first.
+
+    The playhead comes first. Frames in the playback direction and frames behind it follow by
+    distance, where a step backwards counts as much as ahead / behind steps forward. Most of the
+    budget goes to playback, and the frames just behind stay ready for scrubbing back.
+    """
+    if not 0 <= playhead < frame_count:
+        return []
+
+    weight = ahead / behind if behind else 0
+    candidates = [(step, playhead + direction * step) for step in range(1, ahead + 1)]
+    candidates += [(step * weight, playhead - direction * step) for step in range(1, behind + 1)]
+    candidates.sort(key=lambda candidate: candidate[0])
+
+    return [playhead] + [index for _, index in candidates if 0 <= index < frame_count]
@@ -1,40 +1,56 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal, QByteArray
 import time
 from model.file_handler import ModelError
 from model.json_parser import ParserError
-from model.svg_renderer import render_pose
+from model.frame_index import IndexedPoseFile, PoseFrameList
+from model.svg_renderer import RenderConfig, StyledFrame
 
 class LoadOpenPointDataWorker(QObject):
     """Worker class to run loading task in background thread."""
     finished = pyqtSignal()
     error = pyqtSignal(str)
     json_loaded = pyqtSignal(str)
-    on_svg_ready = pyqtSignal(str)
+    on_svg_ready = pyqtSignal(QByteArray)
     rendering_started = pyqtSignal()
+    sequence_loaded = pyqtSignal(object)
+    styled_frame_ready = pyqtSignal(object)
 
-    def __init__(self, file_path, file_handler, json_parser):
+    def __init__(self, file_path, file_handler, json_parser, render_style):
         super().__init__()
         self.file_path = file_path
         self.file_handler = file_handler
         self.json_parser = json_parser
+        self.render_style = render_style
 
     def run(self):
         try:
-            print(f"[Worker] Starting file load for: {self.file_path}")
-            content = self.file_handler.load_text_file(self.file_path)
+            if self.file_handler.is_indexable_large_file(self.file_path):
+                frames, pose_data, pretty_json = self.__open_indexed_file()
+            else:
+                print(f"[Worker] Starting file load for: {self.file_path}")
+                content = self.file_handler.load_text_file(self.file_path)
 
-            print("[Worker] Starting JSON parsing...")
-            pose_data, pretty_json = self.json_parser.parse_pose_json(content)
+                print("[Worker] Starting JSON parsing...")
+                pose_data, pretty_json = self.json_parser.parse_pose_json(content)
+                frames = PoseFrameList(pose_data) if isinstance(pose_data, list) and len(pose_data) > 1 else None
             
             print("[Worker] File loaded successfully. Emitting rendering_started signal...")
             self.rendering_started.emit()
 
             print("[Worker] Starting SVG rendering...")
-            svg_content = render_pose(pose_data)
+            # The geometry is kept, so style changes redraw the preview without parsing again
+            styled_frame = StyledFrame(pose_data, RenderConfig(style=self.render_style))
+            # Encode each fragment once straight into the buffer that the preview and
+            # the save worker share; QByteArray is passed between threads without copying
+            svg_content = QByteArray()
+            for fragment in styled_frame.iter_render():
+                svg_content.append(fragment.encode('utf-8'))
             
             print("[Worker] Processing complete, emitting signals")
             self.json_loaded.emit(pretty_json)
+            self.styled_frame_ready.emit(styled_frame)
             self.on_svg_ready.emit(svg_content)
+            self.sequence_loaded.emit(frames)
             self.finished.emit()
         except ParserError as e:
             self.error.emit(f"Pose file format error: {str(e)}")
@@ -44,3 +60,18 @@ class LoadOpenPointDataWorker(QObject):
             self.error.emit(str(e))
         except Exception as e:
             self.error.emit(f"Unexpected error in ViewModel: {str(e)}")
+
+    def __open_indexed_file(self):
+        """
+        Opens a file that is too large to load at once frame by frame.
+        Only the first frame is parsed here and shown in the JSON preview.
+        """
+        print(f"[Worker] Indexing large file: {self.file_path}")
+        frames = IndexedPoseFile(self.file_path, self.json_parser)
+        if not len(frames):
+            frames.close()
+            raise ModelError("No pose data found")
+
+        pose_data = frames.frame(0)
+        pretty_json = self.json_parser.backend.dumps_pretty(pose_data)
+        return frames, pose_data, pretty_json
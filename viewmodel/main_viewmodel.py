@@ -1,6 +1,8 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QByteArray
+from model.svg_renderer import RenderStyle
 from .load_open_point_data_worker import LoadOpenPointDataWorker
 from .save_svg_worker import SaveSvgWorker
+from .sequence_player import SequencePlayer
 from .processing_state import ProcessingState
 
 from .error import ViewModelError
@@ -9,8 +11,11 @@ class MainViewModel(QObject):
     # Signals for View Layer
     on_json_loaded = pyqtSignal(str)
     on_load_error = pyqtSignal(str)
-    on_svg_ready = pyqtSignal(str)
+    on_svg_ready = pyqtSignal(QByteArray)
     on_state_changed = pyqtSignal(ProcessingState)
+    on_render_style_changed = pyqtSignal(object)
+    on_drag_started = pyqtSignal(QByteArray, QByteArray)  # Everything that stays put, the dragged elements
+    on_drag_moved = pyqtSignal(QByteArray)                # The dragged elements at their new position
 
     def __init__(self, file_handler, json_parser):
         super().__init__()
@@ -21,6 +26,16 @@ class MainViewModel(QObject):
         self.current_save_worker_thread = None
         self.current_save_worker = None
         self.has_valid_data = False
+        self.render_style = RenderStyle()
+        # Geometry of the loaded document, redrawn when the style changes
+        self.styled_frame = None
+        self.keypoint_editor = None
+        self.__dragged_keypoint = None
+        # Playback of multi-frame files; the view connects to its signals directly
+        self.sequence_player = SequencePlayer()
+        # Created when the thumbnail browser or the batch panel is opened, see the properties
+        self.__thumbnails = None
+        self.__batch_queue = None
         self.on_state_changed.emit(ProcessingState.APP_START)
         
     def load_json(self, file_path):
@@ -30,7 +45,7 @@ class MainViewModel(QObject):
 
         self.current_json_loader_thread = QThread()
         self.current_json_loader_worker = LoadOpenPointDataWorker(
-            file_path, self.file_handler, self.json_parser
+            file_path, self.file_handler, self.json_parser, self.render_style
         )
         
         self.current_json_loader_worker.moveToThread(self.current_json_loader_thread)
@@ -39,6 +54,145 @@ class MainViewModel(QObject):
         
         self.current_json_loader_thread.start()
 
+    @property
+    def thumbnails(self):
+        """
+        The ThumbnailListModel of a folder of pose files, see browse_directory.
+        """
+        if self.__thumbnails is None:
+            from .thumbnail_list_model import ThumbnailListModel
+            self.__thumbnails = ThumbnailListModel(self.file_handler, self.json_parser)
+            self.__thumbnails.set_render_style(self.render_style)
+        return self.__thumbnails
+
+    @property
+    def batch_queue(self):
+        """
+        The BatchQueue that converts many files in the background; the batch panel
+        connects to its signals directly.
+        """
+        if self.__batch_queue is None:
+            from .batch_queue import BatchQueue
+            self.__batch_queue = BatchQueue(self.file_handler, self.json_parser)
+            self.__batch_queue.set_render_style(self.render_style)
+        return self.__batch_queue
+
+    def browse_directory(self, directory):
+        """
+        Lists the pose files of a directory in the thumbnail model.
+
+        Returns:
+            int: The number of files found.
+        """
+        try:
+            return self.thumbnails.set_directory(directory)
+        except OSError as e:
+            self.on_load_error.emit(f"Cannot read folder: {e}")
+            return 0
+        except ValueError as e:
+            self.on_load_error.emit(f"Cannot convert these files: {e}")
+            return 0
+
+    def open_thumbnail(self, row):
+        """
+        Loads the file of a thumbnail into the preview.
+        """
+        self.load_json(self.thumbnails.path(row))
+
+    def add_batch_inputs(self, input_paths, output_dir):
+        """
+        Queues pose files and folders for conversion to SVG files in output_dir, in the
+        current render style. Errors of single files are collected by the batch queue.
+
+        Returns:
+            int: The number of files queued.
+        """
+        try:
+            return self.batch_queue.add_inputs(input_paths, output_dir)
+        except OSError as e:
+            self.on_load_error.emit(f"Cannot read folder: {e}")
+            return 0
+        except ValueError as e:
+            self.on_load_error.emit(f"Cannot convert these files: {e}")
+            return 0
+
+    def shutdown(self):
+        self.sequence_player.shutdown()
+        if self.__thumbnails is not None:
+            self.__thumbnails.shutdown()
+        if self.__batch_queue is not None:
+            self.__batch_queue.shutdown()
+
+    def update_render_style(self, **changes):
+        """
+        Changes fields of the render style, e.g. update_render_style(face_color="#ff0000").
+        The loaded document is redrawn from its cached geometry right away; sequence frames
+        are rendered again in the background.
+        """
+        self.set_render_style(self.render_style._replace(**changes))
+
+    def reset_render_style(self):
+        self.set_render_style(RenderStyle())
+
+    def set_render_style(self, style):
+        if style == self.render_style:
+            return
+        self.render_style = style
+        self.sequence_player.set_render_style(style)
+        if self.__thumbnails is not None:
+            self.__thumbnails.set_render_style(style)
+        if self.__batch_queue is not None:
+            self.__batch_queue.set_render_style(style)
+        self.on_render_style_changed.emit(style)
+        if self.styled_frame is not None:
+            self.on_svg_ready.emit(QByteArray(self.styled_frame.render_bytes(style)))
+
+    def begin_keypoint_drag(self, x, y, radius):
+        """
+        Starts dragging the keypoint of the loaded document nearest to (x, y), if it is
+        within radius. Coordinates are canvas pixels. Sequences are not edited.
+
+        Returns:
+            bool: Whether a keypoint was hit.
+        """
+        if self.styled_frame is None or self.sequence_player.has_sequence():
+            return False
+        if self.keypoint_editor is None or self.keypoint_editor.frame is not self.styled_frame:
+            # Imported on the first drag, it loads NumPy
+            from model.svg_renderer import KeypointEditor
+            self.keypoint_editor = KeypointEditor(self.styled_frame)
+
+        keypoint = self.keypoint_editor.hit_test(x, y, radius)
+        if keypoint is None:
+            return False
+        print(f"[ViewModel] Dragging keypoint {keypoint}")
+        self.__dragged_keypoint = keypoint
+        self.on_drag_started.emit(
+            QByteArray(self.keypoint_editor.render_detached(keypoint).encode('utf-8')),
+            QByteArray(self.keypoint_editor.render_attached(keypoint).encode('utf-8')),
+        )
+        return True
+
+    def drag_keypoint(self, x, y):
+        """
+        Moves the dragged keypoint. Only the elements attached to it are drawn again.
+        """
+        if self.__dragged_keypoint is None:
+            return
+        self.keypoint_editor.move_keypoint(self.__dragged_keypoint, x, y)
+        self.on_drag_moved.emit(QByteArray(self.keypoint_editor.render_attached(self.__dragged_keypoint).encode('utf-8')))
+
+    def end_keypoint_drag(self):
+        """
+        Finishes the drag: the edited pose data is shown in the JSON view and the
+        document is rendered in full for the preview and for saving.
+        """
+        if self.__dragged_keypoint is None:
+            return
+        self.__dragged_keypoint = None
+        self.on_svg_ready.emit(QByteArray(self.styled_frame.render_bytes()))
+        self.on_json_loaded.emit(self.json_parser.backend.dumps_pretty(self.styled_frame.pose_json_data))
+
     def save_svg(self, file_path, svg_content):
         print(f"[ViewModel] Transitioning to SAVING_SVG for: {file_path}")
         self.on_state_changed.emit(ProcessingState.SAVING_SVG)
@@ -89,6 +243,20 @@ class MainViewModel(QObject):
         print("[ViewModel] JSON loaded successfully")
         self.on_json_loaded.emit(pretty_json)
 
+    def __handle_styled_frame_ready(self, styled_frame):
+        self.styled_frame = styled_frame
+
+    def __handle_svg_ready(self, svg_content):
+        # The style may have changed while the worker was rendering
+        if self.styled_frame is not None and self.styled_frame.config.style != self.render_style:
+            svg_content = QByteArray(self.styled_frame.render_bytes(self.render_style))
+        self.on_svg_ready.emit(svg_content)
+
+    def __handle_sequence_loaded(self, frames):
+        if frames is not None:
+            print(f"[ViewModel] Sequence with {len(frames)} frames loaded")
+        self.sequence_player.set_sequence(frames)
+
     def __handle_rendering_started(self):
         print("[ViewModel] Transitioning to RENDERING")
         self.on_state_changed.emit(ProcessingState.RENDERING)
@@ -131,7 +299,9 @@ class MainViewModel(QObject):
         self.current_json_loader_thread.started.connect(self.current_json_loader_worker.run)
         self.current_json_loader_worker.rendering_started.connect(self.__handle_rendering_started)
         self.current_json_loader_worker.json_loaded.connect(self.__handle_json_loaded)
-        self.current_json_loader_worker.on_svg_ready.connect(self.on_svg_ready.emit)
+        self.current_json_loader_worker.styled_frame_ready.connect(self.__handle_styled_frame_ready)
+        self.current_json_loader_worker.on_svg_ready.connect(self.__handle_svg_ready)
+        self.current_json_loader_worker.sequence_loaded.connect(self.__handle_sequence_loaded)
         self.current_json_loader_worker.finished.connect(self.__handle_json_loader_worker_finished)
         self.current_json_loader_worker.error.connect(self.__handle_worker_error)
         
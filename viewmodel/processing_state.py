@@ -6,3 +6,7 @@ class ProcessingState(Enum):
     RENDERING = auto()
     FINISHED = auto()
     SAVING_SVG = auto()
+    # States of the batch queue, see BatchQueue
+    BATCH_RUNNING = auto()
+    BATCH_CANCELLING = auto()
+    BATCH_FINISHED = auto()
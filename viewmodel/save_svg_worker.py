@@ -15,7 +15,11 @@ class SaveSvgWorker(QObject):
     def run(self):
         try:
             print(f"[Worker] Saving SVG to: {self.file_path}")
-            self.file_handler.save_text_file(self.file_path, self.svg_content)
+            if isinstance(self.svg_content, str):
+                self.file_handler.save_text_file(self.file_path, self.svg_content)
+            else:
+                # Encoded content (QByteArray) is written without another copy
+                self.file_handler.save_bytes_file(self.file_path, self.svg_content)
             print("[Worker] SVG saved successfully. Emitting finished signal...")
             self.finished.emit()
         except ModelError as e:
@@ -0,0 +1,158 @@
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, Qt, QByteArray, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from model.svg_renderer import RenderStyle, render_pose_bytes
+from .frame_prefetcher import FramePrefetcher
+
+DEFAULT_FPS = 30.0
+
+class SequencePlayer(QObject):
+    """
+    Playhead, playback clock and frame display for multi-frame pose files.
+
+    Playback follows the wall clock: on every tick the frame that is due is shown if the
+    prefetcher has it ready. Frames that are not ready in time are dropped instead of
+    slowing playback down, and the number of dropped frames is counted.
+    """
+    sequence_changed = pyqtSignal(int)        # Number of frames, 0 if there is no sequence
+    frame_changed = pyqtSignal(int)           # New playhead position
+    frame_shown = pyqtSignal(int, QPixmap)    # Frame index and its rendered pixmap
+    playing_changed = pyqtSignal(bool)
+
+    def __init__(self, fps=DEFAULT_FPS, prefetcher=None):
+        super().__init__()
+        self.fps = fps
+        self.prefetcher = prefetcher or FramePrefetcher()
+        self.prefetcher.frame_ready.connect(self.__on_frame_ready)
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        # Ticking twice per frame keeps the shown frame within half a frame of the clock
+        self.timer.setInterval(max(1, int(500 / fps)))
+        self.timer.timeout.connect(self.__tick)
+        self.clock = QElapsedTimer()
+
+        self.frame_source = None
+        self.frame_count = 0
+        self.render_style = RenderStyle()
+        self.playhead = 0
+        self.shown_index = -1
+        self.dropped_frames = 0
+        self.__start_frame = 0
+
+    def has_sequence(self):
+        return self.frame_count > 1
+
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def set_sequence(self, frame_source):
+        """
+        Takes over a frame source (e.g. PoseFrameList or IndexedPoseFile); None clears the player.
+        """
+        self.pause()
+        if self.frame_source is not None:
+            self.frame_source.close()
+        self.frame_source = frame_source
+        self.frame_count = len(frame_source) if frame_source is not None else 0
+        self.playhead = 0
+        self.shown_index = -1
+        self.dropped_frames = 0
+        self.prefetcher.set_source(frame_source)
+        self.sequence_changed.emit(self.frame_count)
+        if self.frame_count:
+            self.seek(0)
+
+    def set_viewport_size(self, size):
+        if size != self.prefetcher.size:
+            # The frame on screen has the old size; show the playhead again once re-rendered
+            self.shown_index = -1
+        self.prefetcher.set_size(size)
+
+    def set_render_style(self, style):
+        self.render_style = style
+        # Keep the frame on screen until it has been rendered in the new style
+        self.shown_index = -1
+        self.prefetcher.set_render_style(style)
+
+    def seek(self, index, direction=None):
+        if not self.frame_count:
+            return
+        index = max(0, min(index, self.frame_count - 1))
+        if direction is None:
+            direction = -1 if index < self.playhead else 1
+        self.playhead = index
+        self.prefetcher.set_playhead(index, direction)
+        self.frame_changed.emit(index)
+
+        pixmap = self.prefetcher.pixmap(index)
+        if pixmap is not None:
+            self.__show(index, pixmap)
+
+        if self.is_playing():
+            # Restart the clock from the new position
+            self.__start_playback_clock()
+
+    def play(self):
+        if not self.has_sequence() or self.is_playing():
+            return
+        if self.playhead >= self.frame_count - 1:
+            self.seek(0)
+        self.dropped_frames = 0
+        self.__start_playback_clock()
+        self.timer.start()
+        self.playing_changed.emit(True)
+
+    def pause(self):
+        if not self.is_playing():
+            return
+        self.timer.stop()
+        print(f"[Player] Paused at frame {self.playhead}, {self.dropped_frames} frames dropped")
+        self.playing_changed.emit(False)
+
+    def toggle_playback(self):
+        if self.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    def current_frame_svg(self):
+        """
+        Renders the frame under the playhead as SVG, e.g. for saving.
+        """
+        if self.frame_source is None:
+            return None
+        return QByteArray(render_pose_bytes(self.frame_source.frame(self.playhead), style=self.render_style))
+
+    def shutdown(self):
+        self.pause()
+        self.prefetcher.shutdown()
+
+    def __start_playback_clock(self):
+        self.__start_frame = self.playhead
+        self.clock.start()
+
+    def __tick(self):
+        due = self.__start_frame + int(self.clock.elapsed() * self.fps / 1000)
+        if due >= self.frame_count:
+            due = self.frame_count - 1
+            self.timer.stop()
+            self.playing_changed.emit(False)
+
+        if due != self.playhead:
+            self.playhead = due
+            self.prefetcher.set_playhead(due, 1)
+            self.frame_changed.emit(due)
+
+        pixmap = self.prefetcher.pixmap(due)
+        if pixmap is not None and due != self.shown_index:
+            if due > self.shown_index + 1 and self.shown_index >= self.__start_frame:
+                self.dropped_frames += due - self.shown_index - 1
+            self.__show(due, pixmap)
+
+    def __on_frame_ready(self, index):
+        if index == self.playhead and index != self.shown_index:
+            self.__show(index, self.prefetcher.pixmap(index))
+
+    def __show(self, index, pixmap):
+        self.shown_index = index
+        self.frame_shown.emit(index, pixmap)
@@ -0,0 +1,43 @@
+from PyQt6.QtCore import Qt, QRectF, QByteArray
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtSvg import QSvgRenderer
+
+
+def fit_rect(svg_size, width, height):
+    """
+    Returns the largest rectangle with the aspect ratio of svg_size that fits into
+    width x height, centred.
+    """
+    target_rect = QRectF(0, 0, width, height)
+    aspect_ratio = svg_size.width() / svg_size.height()
+
+    if width / height > aspect_ratio:
+        # Viewport is wider than SVG - scale by height
+        new_w = height * aspect_ratio
+        target_rect.setX((width - new_w) / 2)
+        target_rect.setWidth(new_w)
+    else:
+        # Viewport is taller than SVG - scale by width
+        new_h = width / aspect_ratio
+        target_rect.setY((height - new_h) / 2)
+        target_rect.setHeight(new_h)
+    return target_rect
+
+
+def rasterize_svg(svg_content, width, height):
+    """
+    Renders SVG content onto a white QImage of the given size, preserving the aspect ratio.
+    Unlike QPixmap, QImage may be painted outside the GUI thread, so this can run in a pool.
+    """
+    renderer = QSvgRenderer(QByteArray(bytes(svg_content)))
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.white)
+
+    painter = QPainter(image)
+    svg_size = renderer.defaultSize()
+    if svg_size.isValid():
+        renderer.render(painter, fit_rect(svg_size, width, height))
+    else:
+        renderer.render(painter)
+    painter.end()
+    return image
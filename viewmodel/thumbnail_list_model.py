@@ -0,0 +1,236 @@
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import (
+    QObject, QRunnable, QThreadPool, QAbstractListModel, QModelIndex, QBuffer, QIODevice, QSize, Qt, pyqtSignal
+)
+from PyQt6.QtGui import QImage, QPixmap
+from model.batch.pipeline import JSON_INPUT_SUFFIXES, expand_inputs
+from model.frame_index import IndexedPoseFile
+from model.svg_renderer import RenderStyle, render_pose_bytes
+from model.thumbnail_cache import ThumbnailCache, thumbnail_key
+from .svg_rasterizer import rasterize_svg
+
+THUMBNAIL_SIZE = QSize(160, 120)
+PathRole = Qt.ItemDataRole.UserRole
+
+
+class _ThumbnailSignals(QObject):
+    """Signals of the thumbnail tasks. The object lives in the GUI thread, so the slots run there."""
+    thumbnail_rendered = pyqtSignal(int, int, QImage)  # generation, row, image
+    thumbnail_failed = pyqtSignal(int, int, str)       # generation, row, error message
+    thumbnail_skipped = pyqtSignal(int, int)           # generation, row
+
+
+class RenderThumbnailTask(QRunnable):
+    """
+    Loads the thumbnail of one file from the disk cache, or renders and caches it.
+    Tasks whose row is no longer visible when they start are skipped.
+    """
+
+    def __init__(self, model, generation, row, file_path, variant):
+        super().__init__()
+        # Owned by the list model until it is done, so a queued task can be taken back
+        self.setAutoDelete(False)
+        self.model = model
+        self.generation = generation
+        self.row = row
+        self.file_path = file_path
+        self.variant = variant
+
+    def run(self):
+        model = self.model
+        if not model.is_wanted(self.generation, self.row):
+            model.render_signals.thumbnail_skipped.emit(self.generation, self.row)
+            return
+
+        try:
+            key = thumbnail_key(self.file_path, self.variant)
+            png = model.cache.get(key)
+            if png is None:
+                png = self.__render()
+                model.cache.put(key, png)
+            image = QImage.fromData(png, "PNG")
+        except Exception as e:
+            print(f"[Thumbnails] Failed to render {self.file_path}: {e}")
+            model.render_signals.thumbnail_failed.emit(self.generation, self.row, str(e))
+            return
+        model.render_signals.thumbnail_rendered.emit(self.generation, self.row, image)
+
+    def __render(self):
+        model = self.model
+        if model.file_handler.is_indexable_large_file(self.file_path):
+            # Only the first frame of a large sequence is read
+            frames = IndexedPoseFile(self.file_path, model.json_parser)
+            try:
+                pose_data = frames.frame(0)
+            finally:
+                frames.close()
+        else:
+            pose_data = model.json_parser.parse_pose_data(model.file_handler.load_text_file(self.file_path))
+
+        svg_content = render_pose_bytes(pose_data, style=model.render_style)
+        image = rasterize_svg(svg_content, THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height())
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        return bytes(buffer.data())
+
+
+class ThumbnailListModel(QAbstractListModel):
+    """
+    The pose files of a directory with a thumbnail of each, for a QListView in icon mode.
+
+    Thumbnails are only rendered for the rows the view reports as visible, in a thread pool.
+    The view reports them again on scrolling, and queued tasks for cells that were scrolled
+    past are dropped. (Views may ask data for every row while laying out, so data() itself
+    never requests a thumbnail.) Rendered thumbnails go to a
+    ThumbnailCache on disk, keyed by path, modification time and size, so a folder that was
+    browsed before only has to load small PNG files. The latest thumbnails are also kept in
+    memory as pixmaps.
+    """
+
+    def __init__(self, file_handler, json_parser, cache=None, memory_capacity=1024):
+        super().__init__()
+        self.file_handler = file_handler
+        self.json_parser = json_parser
+        self.cache = cache
+        self.render_style = RenderStyle()
+        self.memory_capacity = memory_capacity
+        self.directory = None
+        self.paths = []
+
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.render_signals = _ThumbnailSignals()
+        self.render_signals.thumbnail_rendered.connect(self.__on_thumbnail_rendered)
+        self.render_signals.thumbnail_failed.connect(self.__on_thumbnail_failed)
+        self.render_signals.thumbnail_skipped.connect(self.__on_thumbnail_skipped)
+
+        self.__generation = 0
+        self.__pixmaps = OrderedDict()  # row -> QPixmap, least recently used first
+        self.__errors = {}              # row -> error message
+        self.__pending = {}             # row -> task, queued or running
+        self.__wanted = set()
+        self.__visible_rows = None
+
+    def set_directory(self, directory):
+        """
+        Lists the pose files of a directory (not recursive, sorted by name).
+
+        Returns:
+            int: The number of files.
+        """
+        if self.cache is None:
+            self.cache = ThumbnailCache()
+        self.beginResetModel()
+        self.directory = directory
+        self.paths = expand_inputs([directory], JSON_INPUT_SUFFIXES)
+        self.__invalidate()
+        self.__visible_rows = None
+        self.endResetModel()
+        print(f"[Thumbnails] {len(self.paths)} pose files in {directory}")
+        return len(self.paths)
+
+    def set_render_style(self, style):
+        """
+        Renders the thumbnails in another style; they are cached separately per style.
+        """
+        if style == self.render_style:
+            return
+        self.render_style = style
+        self.__invalidate()
+        if self.paths:
+            self.dataChanged.emit(self.index(0), self.index(len(self.paths) - 1), [Qt.ItemDataRole.DecorationRole])
+        if self.__visible_rows is not None:
+            self.set_visible_rows(*self.__visible_rows)
+
+    def path(self, row):
+        return self.paths[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(self.paths[row])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.__errors.get(row, self.paths[row])
+        if role == PathRole:
+            return self.paths[row]
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self.__pixmaps.get(row)
+            if pixmap is not None:
+                self.__pixmaps.move_to_end(row)
+            return pixmap
+        return None
+
+    def set_visible_rows(self, first, last):
+        """
+        Called by the view when it scrolls: renders the thumbnails of these rows, those of
+        other rows are no longer rendered.
+        """
+        first, last = max(0, first), min(last, len(self.paths) - 1)
+        self.__visible_rows = (first, last)
+        self.__wanted = set(range(first, last + 1))
+        # Queued tasks of rows that went out of view are dropped; running ones finish
+        for row, task in list(self.__pending.items()):
+            if row not in self.__wanted and self.pool.tryTake(task):
+                del self.__pending[row]
+        for row in range(first, last + 1):
+            self.__request(row)
+
+    def is_wanted(self, generation, row):
+        """
+        Called from the pool: whether a task is still worth running.
+        """
+        return generation == self.__generation and row in self.__wanted
+
+    def shutdown(self):
+        self.__generation += 1
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    def __request(self, row):
+        if row in self.__pixmaps or row in self.__errors or row in self.__pending:
+            return
+        variant = f"{THUMBNAIL_SIZE.width()}x{THUMBNAIL_SIZE.height()}:{self.render_style!r}"
+        task = RenderThumbnailTask(self, self.__generation, row, self.paths[row], variant)
+        self.__pending[row] = task
+        self.pool.start(task)
+
+    def __invalidate(self):
+        self.__generation += 1
+        self.pool.clear()
+        self.__pixmaps.clear()
+        self.__errors.clear()
+        self.__pending.clear()
+        self.__wanted = set()
+
+    def __on_thumbnail_rendered(self, generation, row, image):
+        if generation != self.__generation:
+            return
+        self.__pending.pop(row, None)
+        self.__pixmaps[row] = QPixmap.fromImage(image)
+        while len(self.__pixmaps) > self.memory_capacity:
+            self.__pixmaps.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def __on_thumbnail_skipped(self, generation, row):
+        if generation == self.__generation:
+            self.__pending.pop(row, None)
+            # Scrolled back into view after the task had started
+            if row in self.__wanted:
+                self.__request(row)
+
+    def __on_thumbnail_failed(self, generation, row, error_msg):
+        if generation != self.__generation:
+            return
+        self.__pending.pop(row, None)
+        self.__errors[row] = error_msg
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole, Qt.ItemDataRole.ToolTipRole])